@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,12 +13,59 @@ class AISettings(BaseSettings):
     OPENROUTER_MODEL: str = "google/gemma-2-9b-it:free"
     DEBUG: bool = False
 
+    # Logging (see logging_config.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    LOG_LEVELS: str = ""  # per-logger overrides, e.g. "services.aqua_service=DEBUG"
+    LOG_DEBUG_SAMPLE_RATE: float = 0.01  # fraction of DEBUG records kept
+    LOG_PAYLOADS: bool = False  # log prompts and model responses (at DEBUG)
+    LOG_FILE: Optional[str] = None  # e.g. aquarium_ai.log, written by the background listener
+
+    # OpenRouter connection pool and concurrency limits
+    OPENROUTER_MAX_CONCURRENCY: int = 16  # in-flight upstream calls per worker
+    OPENROUTER_QUEUE_TIMEOUT: float = 30.0  # seconds a call may wait for a slot
+    OPENROUTER_MAX_CONNECTIONS: int = 32
+    OPENROUTER_MAX_KEEPALIVE_CONNECTIONS: int = 16
+    OPENROUTER_KEEPALIVE_EXPIRY: float = 60.0
+    OPENROUTER_TIMEOUT: float = 60.0
+    OPENROUTER_CONNECT_TIMEOUT: float = 5.0
+    OPENROUTER_MAX_RETRIES: int = 1
+
+    # Model routing: comma-separated models tried in order (defaults to OPENROUTER_MODEL)
+    OPENROUTER_MODELS: str = ""
+    ROUTER_LATENCY_WINDOW: int = 50  # recent calls kept per model for the percentiles
+    ROUTER_BREAKER_FAILURE_THRESHOLD: int = 3  # consecutive failures that open the circuit
+    ROUTER_BREAKER_RESET_SECONDS: float = 30.0  # time before a half-open probe is allowed
+    ROUTER_HEDGING_ENABLED: bool = False
+    ROUTER_HEDGE_DELAY: float = 3.0  # seconds to first token before hedging, until p95 is known
+    ROUTER_HEDGE_MIN_SAMPLES: int = 10
+
+    # Evaluation cache (keyed on the canonical layout)
+    EVAL_CACHE_ENABLED: bool = True
+    EVAL_CACHE_MAX_ENTRIES: int = 2048
+    EVAL_CACHE_TTL_SECONDS: float = 86400.0
+    EVAL_CACHE_STALE_WHILE_REVALIDATE_SECONDS: float = 86400.0
+    EVAL_CACHE_STALE_IF_ERROR_SECONDS: float = 604800.0
+    EVAL_CACHE_DISK_PATH: Optional[str] = None  # e.g. /data/evaluations.sqlite3
+    EVAL_CACHE_DISK_MAX_ENTRIES: int = 100000
+    EVAL_CACHE_KEY_INCLUDE_COMMENTS: bool = False
+
+    # Batch evaluation
+    BATCH_CONCURRENCY: int = 8  # default parallel evaluations per batch
+    BATCH_MAX_CONCURRENCY: int = 16
+    BATCH_MAX_ITEMS: int = 5000
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding='utf-8',
         extra='ignore'
     )
 
+    @property
+    def openrouter_models(self) -> List[str]:
+        models = [model.strip() for model in self.OPENROUTER_MODELS.split(",") if model.strip()]
+        return models or [self.OPENROUTER_MODEL]
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         logger.info(f"Initializing AI Settings with OpenRouter model: {self.OPENROUTER_MODEL}")
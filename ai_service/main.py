@@ -3,15 +3,18 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routes import ai_routes
 from config import settings
+from logging_config import setup_logging, shutdown_logging
+from services.evaluation_cache import evaluation_cache
+from services.openrouter_client import close_client
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('aquarium_ai.log')
-    ]
+setup_logging(
+    level=settings.LOG_LEVEL,
+    fmt=settings.LOG_FORMAT,
+    logger_levels=settings.LOG_LEVELS,
+    debug_sample_rate=settings.LOG_DEBUG_SAMPLE_RATE,
+    log_payloads=settings.LOG_PAYLOADS,
+    log_file=settings.LOG_FILE,
 )
 
 # Configure logger
@@ -34,11 +37,14 @@ app.include_router(ai_routes.router)
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting Aquarium AI Service")
-    logger.info(f"Using OpenRouter model: {settings.OPENROUTER_MODEL}")
+    logger.info(f"Using OpenRouter models: {', '.join(settings.openrouter_models)}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Aquarium AI Service")
+    await close_client()
+    await evaluation_cache.flush()
+    shutdown_logging()
 
 
 @app.get("/")
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from enum import Enum
 from typing import List, Optional
 
 class FishEntry(BaseModel):
@@ -8,14 +9,25 @@ class FishEntry(BaseModel):
 class AquariumLayout(BaseModel):
     owner_email: EmailStr
     tank_name: str
-    tank_length: int
-    tank_width: int
-    tank_height: int
+    tank_length: float
+    tank_width: float
+    tank_height: float
     water_type: str
     fish_data: List[FishEntry]
     comments: Optional[str] = None
     unit: Optional[str] = "cm"  # "cm" or "inch"
 
+class EvaluationMode(str, Enum):
+    LLM = "llm"  # full model evaluation
+    FAST = "fast"  # rule-based stocking engine only, no network call
+    HYBRID = "hybrid"  # engine facts explained by the model with a short prompt
+
 class AIResponse(BaseModel):
     status: str
-    response: str
\ No newline at end of file
+    response: str
+    model: Optional[str] = None  # model that produced a fresh evaluation
+
+class BatchEvaluationRequest(BaseModel):
+    layouts: List[AquariumLayout] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(None, ge=1)  # defaults to BATCH_CONCURRENCY
+    mode: EvaluationMode = EvaluationMode.LLM
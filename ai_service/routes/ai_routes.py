@@ -1,20 +1,80 @@
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, HTTPException
-from models.ai_model import AquariumLayout, AIResponse
-from services.aqua_service import evaluate_aquarium_layout, AquariumServiceError, OpenRouterError, ValidationError
+import time
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from models.ai_model import AquariumLayout, AIResponse, BatchEvaluationRequest, EvaluationMode
+from services.aqua_service import (
+    evaluate_aquarium_layout,
+    evaluation_flights,
+    stream_aquarium_evaluation,
+    validate_layout,
+    AquariumServiceError,
+    OpenRouterError,
+    ValidationError,
+)
+from services.batch_service import evaluate_batch
+from services.model_router import model_router
+from services.openrouter_client import governor
+from config import settings
+from logging_config import log_payload
+from services.evaluation_cache import evaluation_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MODE_QUERY = Query(
+    EvaluationMode.LLM,
+    description="llm: full model evaluation; fast: rule-based engine only; hybrid: engine facts explained by the model",
+)
+
+DEADLINE_HEADER = Header(
+    None,
+    alias="X-Request-Deadline",
+    description="Unix time after which the caller no longer wants the answer",
+)
+DEADLINE_DETAIL = "The request deadline passed before the evaluation was ready"
+
+
+def remaining_time(deadline: Optional[str]) -> Optional[float]:
+    """
+    Seconds left before the caller's deadline.
+
+    Returns None when no deadline was sent, or it is not a number.
+
+    Raises:
+        HTTPException: 504 if the deadline has already passed
+    """
+    if deadline is None:
+        return None
+    try:
+        remaining = float(deadline) - time.time()
+    except ValueError:
+        logger.warning(f"Ignoring invalid X-Request-Deadline: {deadline!r}")
+        return None
+    if remaining <= 0:
+        logger.warning("Request deadline passed before the evaluation started")
+        raise HTTPException(status_code=504, detail=DEADLINE_DETAIL)
+    return remaining
+
+
 @router.post("/evaluate", response_model=AIResponse)
-async def evaluate_aquarium(layout: AquariumLayout):
+async def evaluate_aquarium(
+    layout: AquariumLayout,
+    mode: EvaluationMode = MODE_QUERY,
+    deadline: Optional[str] = DEADLINE_HEADER,
+):
     """
     Evaluate an aquarium layout and provide AI advice.
     
     Args:
         layout: AquariumLayout model containing all aquarium details
+        mode: Evaluation mode (``?mode=fast`` answers without calling OpenRouter)
+        deadline: X-Request-Deadline; bounds the queue wait and the model call
         
     Returns:
         AIResponse containing the structured AI evaluation with sections:
@@ -27,17 +87,25 @@ async def evaluate_aquarium(layout: AquariumLayout):
         - additional_info: List of additional information points
         
     Raises:
-        HTTPException: If there's an error processing the request
+        HTTPException: If there's an error processing the request, or 504
+                       once the caller's deadline has passed
     """
+    remaining = remaining_time(deadline)
     try:
         logger.info("Received aquarium layout evaluation request")
-        logger.debug(f"Request data: {layout.dict()}")
+        log_payload(logger, "Request data", layout.model_dump())
         
-        result = await evaluate_aquarium_layout(layout)
+        # Cancelling only stops this request waiting; a coalesced call
+        # carries on while other callers still want it
+        result = await asyncio.wait_for(evaluate_aquarium_layout(layout, mode), timeout=remaining)
         logger.info("Successfully generated aquarium advice")
         
         return result
         
+    except asyncio.TimeoutError:
+        logger.error("Request deadline passed during the evaluation")
+        raise HTTPException(status_code=504, detail=DEADLINE_DETAIL)
+        
     except ValidationError as e:
         logger.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -53,3 +121,112 @@ async def evaluate_aquarium(layout: AquariumLayout):
     except Exception as e:
         logger.error(f"Unexpected error in evaluate_layout: {str(e)}")
         raise HTTPException(status_code=500, detail="An unexpected error occurred")
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/evaluate/stream")
+async def evaluate_aquarium_stream(
+    layout: AquariumLayout,
+    mode: EvaluationMode = MODE_QUERY,
+    deadline: Optional[str] = DEADLINE_HEADER,
+):
+    """
+    Evaluate an aquarium layout and stream the result as Server-Sent Events.
+    
+    Events:
+        section: one per completed section, with index, header, content and
+                 source ("model", "fallback", "cache" or "engine")
+        done:    sent last, with the number of fallback sections
+        error:   sent instead of done if OpenRouter failed before any section,
+                 or if X-Request-Deadline passed before the first section
+        
+    Raises:
+        HTTPException: 400 if the layout is invalid, 504 if the deadline has
+                       already passed (both before streaming starts)
+    """
+    try:
+        validate_layout(layout)
+    except ValidationError as e:
+        logger.error(f"Validation error: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    remaining = remaining_time(deadline)
+
+    async def events():
+        sources = []
+        sections = stream_aquarium_evaluation(layout, mode)
+        try:
+            # The deadline covers the queue wait and the model's first tokens;
+            # once sections flow, the caller is reading them as they arrive
+            try:
+                section = await asyncio.wait_for(anext(sections, None), timeout=remaining)
+            except asyncio.TimeoutError:
+                logger.error("Request deadline passed before the first section")
+                yield _sse("error", {"detail": DEADLINE_DETAIL})
+                return
+            while section is not None:
+                sources.append(section["source"])
+                yield _sse("section", {"index": len(sources) - 1, **section})
+                section = await anext(sections, None)
+        except AquariumServiceError as e:
+            logger.error(f"Streaming evaluation failed: {str(e)}")
+            yield _sse("error", {"detail": str(e)})
+            return
+        except Exception as e:
+            logger.error(f"Unexpected error in evaluate_aquarium_stream: {str(e)}")
+            yield _sse("error", {"detail": "An unexpected error occurred"})
+            return
+        yield _sse("done", {"status": "success", "fallback_sections": sources.count("fallback")})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Tell nginx not to buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/evaluate/batch")
+async def evaluate_aquarium_batch(request: BatchEvaluationRequest):
+    """
+    Evaluate many layouts and stream the results as NDJSON.
+    
+    Identical layouts (by canonical form) are evaluated once. Each input gets
+    one line, in completion order:
+        {"index": 3, "status": "success", "response": "...", "elapsed_ms": 812.4}
+        {"index": 7, "status": "error", "error": "Fish data cannot be empty"}
+        
+    Raises:
+        HTTPException: 413 if the batch exceeds BATCH_MAX_ITEMS
+    """
+    if len(request.layouts) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: at most {settings.BATCH_MAX_ITEMS} layouts per request"
+        )
+
+    async def lines():
+        async for item in evaluate_batch(request.layouts, request.concurrency, request.mode):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/stats")
+def get_service_stats():
+    """
+    Report upstream concurrency and cache effectiveness for this worker.
+
+    Returns:
+        dict with the OpenRouter limit, in-flight calls and queue depth,
+        per-model latency, error and circuit state, the evaluation cache
+        counters and request coalescing counters
+    """
+    return {
+        "openrouter": governor.stats(),
+        "models": model_router.stats(),
+        "cache": evaluation_cache.stats(),
+        "coalescing": evaluation_flights.stats(),
+    }
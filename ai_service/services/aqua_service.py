@@ -1,18 +1,21 @@
-import openai
+import asyncio
 import logging
-from .prompt_builder import build_prompt
-from config import settings
-from models.ai_model import AquariumLayout as AquariumLayoutRequest, AIResponse
+import time
+from typing import AsyncIterator, Dict, Tuple
+from .prompt_builder import build_prompt, build_hybrid_prompt
+from .stocking_engine import analyze_layout, render_report
+from .openrouter_client import governor
+from .model_router import model_router
+from .canonical import layout_cache_key
+from .evaluation_cache import CacheState, evaluation_cache
+from .single_flight import SingleFlight
+from .section_stream import SECTION_HEADERS, SectionStreamParser, split_sections, validate_section
+from logging_config import log_payload
+from models.ai_model import AquariumLayout as AquariumLayoutRequest, AIResponse, EvaluationMode
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Configure OpenRouter client using OpenAI-compatible interface
-client = openai.OpenAI(
-    api_key=settings.OPENROUTER_API_KEY,
-    base_url=settings.OPENROUTER_API_BASE.rstrip('/').replace('/chat/completions', '')
-)
-
 SYSTEM_PROMPT = """
 You are an expert aquarium consultant. Your task is to analyze aquarium setups and provide structured evaluations.
 
@@ -51,6 +54,12 @@ Focus on providing practical, professional advice about:
 Your response must start with 🔵 Tank Volume Assessment and end with ⭐ Overall Rating.
 """
 
+# Identical evaluations in flight at the same time share one upstream call
+evaluation_flights = SingleFlight()
+
+# Background revalidation tasks (kept referenced until they finish)
+_background_tasks = set()
+
 class AquariumServiceError(Exception):
     """Base exception for aquarium service errors"""
     pass
@@ -73,33 +82,154 @@ def validate_response_format(response: str) -> bool:
     Returns:
         bool: True if the response follows the format, False otherwise
     """
-    required_sections = [
-        "🔵 Tank Volume Assessment",
-        "🟡 Bioload Assessment",
-        "🟣 Fish Compatibility & Behavior",
-        "🟢 Schooling Requirements",
-        "✅ Recommendations",
-        "⭐ Overall Rating"
-    ]
-    
     # Check if response starts with first section and contains all required sections
     response = response.strip()
-    if not response.startswith(required_sections[0]):
+    if not response.startswith(SECTION_HEADERS[0]):
         return False
         
     # Check for presence of all required sections
-    for section in required_sections:
+    for section in SECTION_HEADERS:
         if section not in response:
             return False
             
     return True
 
-async def evaluate_aquarium_layout(layout: AquariumLayoutRequest) -> AIResponse:
+def validate_layout(layout: AquariumLayoutRequest) -> None:
+    """
+    Validate the parts of a layout the evaluation depends on.
+    
+    Raises:
+        ValidationError: If input data is invalid
+    """
+    if not layout.tank_length or not layout.tank_width or not layout.tank_height:
+        raise ValidationError("Tank dimensions must be provided")
+    if not layout.water_type or layout.water_type not in ["freshwater", "saltwater"]:
+        raise ValidationError("Water type must be either 'freshwater' or 'saltwater'")
+    if not layout.fish_data:
+        raise ValidationError("Fish data cannot be empty")
+
+def build_fallback_response(layout: AquariumLayoutRequest) -> str:
+    """
+    Build the deterministic evaluation used when the model output is unusable.
+
+    The text comes from the rule-based stocking engine, so it reflects the
+    actual bioload, schooling and compatibility of the layout.
+    """
+    return render_report(analyze_layout(layout), layout)
+
+def _completion_request(layout: AquariumLayoutRequest, mode: EvaluationMode = EvaluationMode.LLM) -> dict:
+    """Chat completion parameters shared by the blocking and streaming calls."""
+    if mode == EvaluationMode.HYBRID:
+        # The engine already did the arithmetic; the model only explains it
+        prompt = build_hybrid_prompt(layout, analyze_layout(layout).facts())
+    else:
+        prompt = build_prompt(layout)
+    log_payload(logger, "Generated prompt", prompt)
+    logger.debug("User prompt length: %d characters", len(prompt))
+
+    # The model is chosen per call by the model router
+    return dict(
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT.strip()},
+            {"role": "user", "content": prompt.strip()}
+        ],
+        max_tokens=500 if mode == EvaluationMode.HYBRID else 800,
+        temperature=0.7,  # Reduced temperature for more consistent formatting
+        top_p=0.9,
+        stop=None
+    )
+
+async def generate_evaluation(
+    layout: AquariumLayoutRequest, mode: EvaluationMode = EvaluationMode.LLM
+) -> Tuple[str, bool, str]:
+    """
+    Ask OpenRouter for an evaluation of an already validated layout.
+    
+    Args:
+        layout: AquariumLayoutRequest model containing all aquarium details
+        mode: LLM for the full prompt, HYBRID to send the engine's facts
+        
+    Returns:
+        Tuple of the evaluation text, whether the fallback text was used and
+        the model that answered
+        
+    Raises:
+        OpenRouterError: If there's an error with the OpenRouter API
+    """
+    try:
+        # Wait for a free upstream slot, then await the call without blocking the event loop
+        async with governor:
+            ai_response_content, model = await model_router.complete(_completion_request(layout, mode))
+        logger.info(f"Successfully received response from OpenRouter model {model}")
+    except asyncio.TimeoutError:
+        logger.error(f"OpenRouter queue is full ({governor.waiting} waiting)")
+        raise OpenRouterError("AI service is busy. Please try again shortly.")
+    except Exception as e:
+        logger.error(f"OpenRouter API error: {str(e)}")
+        raise OpenRouterError(f"Error communicating with OpenRouter API: {str(e)}")
+
+    # Validate response content
+    logger.info("OpenRouter response length: %d characters", len(ai_response_content))
+    log_payload(logger, "Full AI response", ai_response_content)
+    
+    # Check for suspiciously short responses or invalid format
+    if len(ai_response_content.strip()) < 50 or not validate_response_format(ai_response_content):
+        logger.warning("Received invalid response format (%d characters)", len(ai_response_content))
+        log_payload(logger, "Invalid AI response", ai_response_content)
+        return build_fallback_response(layout), True, model
+
+    return ai_response_content, False, model
+
+async def _generate_and_store(key: str, layout: AquariumLayoutRequest, mode: EvaluationMode) -> AIResponse:
+    """Generate an evaluation and remember it unless the fallback text was used."""
+    started = time.monotonic()
+    content, used_fallback, model = await generate_evaluation(layout, mode)
+    if not used_fallback:
+        evaluation_cache.set(key, content, cost_seconds=time.monotonic() - started)
+    return AIResponse(status="success", response=content, model=model)
+
+async def _evaluate_once(key: str, layout: AquariumLayoutRequest, mode: EvaluationMode) -> AIResponse:
+    """Generate an evaluation, joining an identical call that is already running."""
+    return await evaluation_flights.do(key, lambda: _generate_and_store(key, layout, mode))
+
+def _schedule_refresh(key: str, layout: AquariumLayoutRequest, mode: EvaluationMode) -> None:
+    """Revalidate a stale cache entry in the background (at most once per key)."""
+    if evaluation_flights.in_flight(key):
+        return
+
+    async def refresh():
+        try:
+            await _evaluate_once(key, layout, mode)
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed: {str(e)}")
+
+    task = asyncio.create_task(refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+def _cache_key(layout: AquariumLayoutRequest, mode: EvaluationMode) -> str:
+    """LLM and hybrid answers differ, so they are cached separately."""
+    if mode == EvaluationMode.HYBRID:
+        return layout_cache_key(layout, namespace="evaluate-hybrid")
+    return layout_cache_key(layout)
+
+async def evaluate_aquarium_layout(
+    layout: AquariumLayoutRequest, mode: EvaluationMode = EvaluationMode.LLM
+) -> AIResponse:
     """
     Evaluate an aquarium layout and provide AI advice.
     
+    In FAST mode the rule-based stocking engine answers on its own, with no
+    cache lookup or network call.
+    
+    Identical setups (see services.canonical) are answered from the
+    evaluation cache; stale entries are served while being refreshed, and
+    when OpenRouter fails a recently expired entry is served instead.
+    Concurrent requests for the same setup share a single upstream call.
+    
     Args:
         layout: AquariumLayoutRequest model containing all aquarium details
+        mode: LLM (default), FAST or HYBRID
         
     Returns:
         AIResponse containing the AI's evaluation
@@ -110,98 +240,135 @@ async def evaluate_aquarium_layout(layout: AquariumLayoutRequest) -> AIResponse:
         AquariumServiceError: For other service-related errors
     """
     try:
-        logger.info(f"Evaluating aquarium layout for owner: {layout.owner_email}")
-        
-        # Validate input
-        if not layout.tank_length or not layout.tank_width or not layout.tank_height:
-            raise ValidationError("Tank dimensions must be provided")
-        if not layout.water_type or layout.water_type not in ["freshwater", "saltwater"]:
-            raise ValidationError("Water type must be either 'freshwater' or 'saltwater'")
-        if not layout.fish_data:
-            raise ValidationError("Fish data cannot be empty")
-
-        # Pre-calculate tank volume for potential fallback use
-        unit = getattr(layout, 'unit', 'cm')
-        if unit == 'inch':
-            volume_gallons = round((layout.tank_length * layout.tank_width * layout.tank_height) / 231, 1)
-            volume_liters = round(volume_gallons * 3.785, 1)
-            volume_str = f"{volume_gallons} gallon tank ({volume_liters} liters)"
-        else:
-            volume_cubic_cm = layout.tank_length * layout.tank_width * layout.tank_height
-            volume_liters = round(volume_cubic_cm / 1000, 1)
-            volume_gallons = round(volume_liters / 3.785, 1)
-            volume_str = f"{volume_liters} liter tank ({volume_gallons} gallons)"
-        total_fish = sum(fish.quantity for fish in layout.fish_data)
+        logger.info("Evaluating aquarium layout (mode %s)", mode.value)
+        validate_layout(layout)
 
-        prompt = build_prompt(layout)
-        logger.info(f"Generated prompt: {prompt}")
-        logger.info(f"System prompt: {SYSTEM_PROMPT[:200]}...")
-        logger.info(f"User prompt length: {len(prompt)} characters")
+        if mode == EvaluationMode.FAST:
+            return AIResponse(status="success", response=build_fallback_response(layout))
+
+        key = _cache_key(layout, mode)
+        lookup = await evaluation_cache.get(key)
+        if lookup.state == CacheState.FRESH:
+            return AIResponse(status="success", response=lookup.value)
+        if lookup.state == CacheState.STALE:
+            _schedule_refresh(key, layout, mode)
+            return AIResponse(status="success", response=lookup.value)
 
         try:
-            response = client.chat.completions.create(
-                model=settings.OPENROUTER_MODEL,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT.strip()},
-                    {"role": "user", "content": prompt.strip()}
-                ],
-                max_tokens=800,
-                temperature=0.7,  # Reduced temperature for more consistent formatting
-                top_p=0.9,
-                stop=None
-            )
-            logger.info("Successfully received response from OpenRouter")
-            
-            # Validate response content
-            ai_response_content = response.choices[0].message.content
-            logger.info(f"OpenRouter response length: {len(ai_response_content)} characters")
-            
-            # Log the full response for debugging
-            logger.info("Full AI Response:")
-            logger.info("-" * 80)
-            logger.info(ai_response_content)
-            logger.info("-" * 80)
+            return await _evaluate_once(key, layout, mode)
+        except OpenRouterError:
+            if lookup.state == CacheState.EXPIRED:
+                logger.warning("OpenRouter unavailable, serving expired cached evaluation")
+                evaluation_cache.record_served_on_error()
+                return AIResponse(status="success", response=lookup.value)
+            raise
             
-            # Check for suspiciously short responses or invalid format
-            if len(ai_response_content.strip()) < 50 or not validate_response_format(ai_response_content):
-                logger.warning(f"Received invalid response format: '{ai_response_content}'")
-                # Use fallback response
-                ai_response_content = f"""🔵 Tank Volume Assessment
-Your {volume_str} provides excellent space for your current fish population.
+    except ValidationError as e:
+        logger.error(f"Validation error: {str(e)}")
+        raise
+    except OpenRouterError:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in evaluate_aquarium_layout: {str(e)}")
+        raise AquariumServiceError(f"An unexpected error occurred: {str(e)}")
 
-🟡 Bioload Assessment
-With {total_fish} fish in a {volume_str}, your bioload is well within acceptable limits. Regular water changes and proper filtration will maintain water quality.
+async def stream_aquarium_evaluation(
+    layout: AquariumLayoutRequest, mode: EvaluationMode = EvaluationMode.LLM
+) -> AsyncIterator[Dict[str, str]]:
+    """
+    Stream an evaluation one section at a time.
+    
+    Sections are yielded as soon as the model finishes them. A section that
+    fails validation is replaced by its deterministic fallback, and sections
+    the model never produced are filled in from the fallback at the end.
+    Cached evaluations are replayed without calling OpenRouter, and FAST mode
+    yields the stocking engine's sections directly.
+    
+    Args:
+        layout: AquariumLayoutRequest model, already checked by validate_layout
+        mode: LLM (default), FAST or HYBRID
+        
+    Yields:
+        dict with ``header``, ``content`` and ``source`` ("model", "fallback",
+        "cache" or "engine")
+        
+    Raises:
+        OpenRouterError: If OpenRouter fails before any section was produced
+    """
+    if mode == EvaluationMode.FAST:
+        for header, body in split_sections(build_fallback_response(layout)).items():
+            yield {"header": header, "content": body, "source": "engine"}
+        return
 
-🟣 Fish Compatibility & Behavior
-Current Setup: {', '.join(f'{fish.quantity} {fish.name}' for fish in layout.fish_data)}
-This appears to be a {layout.water_type} community tank. The fish selection shows good compatibility, but monitor for any territorial behavior.
+    key = _cache_key(layout, mode)
+    lookup = await evaluation_cache.get(key)
+    if lookup.state in (CacheState.FRESH, CacheState.STALE):
+        if lookup.state == CacheState.STALE:
+            _schedule_refresh(key, layout, mode)
+        for header, body in split_sections(lookup.value).items():
+            yield {"header": header, "content": body, "source": "cache"}
+        return
 
-🟢 Schooling Requirements
-Most of the selected fish are not schooling species and can be kept individually or in pairs. Ensure adequate space for territorial fish to establish their own areas.
+    fallback = split_sections(build_fallback_response(layout))
+    parser = SectionStreamParser()
+    emitted = {}
+    model_text = []
+    started = time.monotonic()
 
-✅ Recommendations
-- Maintain regular water changes (10-15% weekly)
-- Monitor fish behavior for any signs of aggression
-- Consider adding more hiding places for shy species
-- Keep up with regular water parameter testing
+    def section(header: str, body: str) -> Dict[str, str]:
+        if validate_section(header, body):
+            emitted[header] = "model"
+            return {"header": header, "content": body, "source": "model"}
+        logger.warning(f"Section '{header}' failed validation, using fallback")
+        emitted[header] = "fallback"
+        return {"header": header, "content": fallback[header], "source": "fallback"}
 
-⭐ Overall Rating
-7/10 - Good foundation for a community aquarium with room for growth."""
-            
-            logger.debug(f"Final response: {ai_response_content[:200]}...")
-            
-            return AIResponse(
-                status="success",
-                response=ai_response_content
-            )
-            
+    # The upstream call runs in its own task and queues sections instead of
+    # yielding them, so its governor slot is freed as soon as OpenRouter is
+    # done, however slowly the client reads the SSE stream.
+    sections: asyncio.Queue = asyncio.Queue()
+    finished = object()
+
+    async def read_upstream():
+        try:
+            async with governor:
+                upstream = await model_router.open_stream(_completion_request(layout, mode))
+                async for delta in upstream.deltas():
+                    model_text.append(delta)
+                    for completed in parser.feed(delta):
+                        sections.put_nowait(completed)
+            for completed in parser.finish():
+                sections.put_nowait(completed)
         except Exception as e:
-            logger.error(f"OpenRouter API error: {str(e)}")
-            raise OpenRouterError(f"Error communicating with OpenRouter API: {str(e)}")
-            
-    except ValidationError as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise
+            sections.put_nowait(e)
+        finally:
+            sections.put_nowait(finished)
+
+    reader = asyncio.create_task(read_upstream())
+    try:
+        while (item := await sections.get()) is not finished:
+            if isinstance(item, Exception):
+                raise item
+            header, body = item
+            if header not in emitted:
+                yield section(header, body)
+    except asyncio.TimeoutError:
+        logger.error(f"OpenRouter queue is full ({governor.waiting} waiting)")
+        if not emitted:
+            raise OpenRouterError("AI service is busy. Please try again shortly.")
     except Exception as e:
-        logger.error(f"Unexpected error in evaluate_aquarium_layout: {str(e)}")
-        raise AquariumServiceError(f"An unexpected error occurred: {str(e)}")
\ No newline at end of file
+        logger.error(f"OpenRouter streaming error: {str(e)}")
+        if not emitted:
+            raise OpenRouterError(f"Error communicating with OpenRouter API: {str(e)}")
+    finally:
+        # Only still running when the client went away mid-stream
+        reader.cancel()
+
+    for header in SECTION_HEADERS:
+        if header not in emitted:
+            emitted[header] = "fallback"
+            yield {"header": header, "content": fallback[header], "source": "fallback"}
+
+    full_text = "".join(model_text)
+    if all(source == "model" for source in emitted.values()) and validate_response_format(full_text):
+        evaluation_cache.set(key, full_text, cost_seconds=time.monotonic() - started)
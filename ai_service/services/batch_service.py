@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Dict, List
+from .aqua_service import evaluate_aquarium_layout, validate_layout, AquariumServiceError, ValidationError
+from .canonical import layout_cache_key
+from config import settings
+from models.ai_model import AquariumLayout as AquariumLayoutRequest, EvaluationMode
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def batch_concurrency(requested: int = None) -> int:
+    """Concurrency for one batch, capped by BATCH_MAX_CONCURRENCY."""
+    return max(1, min(requested or settings.BATCH_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY))
+
+
+async def evaluate_batch(
+    layouts: List[AquariumLayoutRequest],
+    concurrency: int = None,
+    mode: EvaluationMode = EvaluationMode.LLM,
+) -> AsyncIterator[Dict]:
+    """
+    Evaluate many layouts with bounded parallelism.
+
+    Layouts are deduplicated by their canonical form, so each distinct setup
+    is evaluated once and its result is reported for every input position
+    that shares it. Results are yielded in completion order, one per input.
+
+    Args:
+        layouts: Layouts to evaluate
+        concurrency: Number of evaluations running at once
+        mode: Evaluation mode applied to every layout
+
+    Yields:
+        dict with ``index``, ``status`` ("success" or "error") and either
+        ``response`` or ``error``; duplicates carry ``duplicate_of``
+    """
+    limit = batch_concurrency(concurrency)
+    semaphore = asyncio.Semaphore(limit)
+    groups: Dict[str, List[int]] = {}
+
+    for index, layout in enumerate(layouts):
+        try:
+            validate_layout(layout)
+        except ValidationError as e:
+            yield {"index": index, "status": "error", "error": str(e)}
+            continue
+        groups.setdefault(layout_cache_key(layout), []).append(index)
+
+    logger.info(f"Batch of {len(layouts)} layouts: {len(groups)} distinct, concurrency {limit}")
+
+    async def run(indices: List[int]):
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                result = await evaluate_aquarium_layout(layouts[indices[0]], mode)
+                outcome = {"status": "success", "response": result.response}
+            except AquariumServiceError as e:
+                outcome = {"status": "error", "error": str(e)}
+            outcome["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+            return indices, outcome
+
+    tasks = [asyncio.create_task(run(indices)) for indices in groups.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            indices, outcome = await next_done
+            first = indices[0]
+            yield {"index": first, **outcome}
+            for duplicate in indices[1:]:
+                yield {"index": duplicate, "duplicate_of": first, **outcome}
+    finally:
+        # The client went away (or the consumer stopped early): stop the rest
+        for task in tasks:
+            task.cancel()
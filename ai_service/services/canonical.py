@@ -0,0 +1,56 @@
+import hashlib
+import json
+from config import settings
+from models.ai_model import AquariumLayout as AquariumLayoutRequest
+
+CM_PER_INCH = 2.54
+
+# Bump when the canonical form changes so old cache entries stop matching
+CANONICAL_VERSION = 1
+
+
+def canonical_layout(layout: AquariumLayoutRequest) -> dict:
+    """
+    Reduce a layout to the fields that determine its evaluation.
+
+    Fish names are trimmed and case-folded, duplicate species are merged and
+    sorted, and dimensions are converted to centimetres and rounded to 0.1,
+    so 24 inches and the 60.96 cm the backend sends for it share a key.
+    owner_email and tank_name never take part; comments only do when
+    EVAL_CACHE_KEY_INCLUDE_COMMENTS is enabled.
+
+    Args:
+        layout: AquariumLayoutRequest model containing all aquarium details
+
+    Returns:
+        dict: JSON-serialisable canonical form
+    """
+    factor = CM_PER_INCH if (layout.unit or "cm").lower() == "inch" else 1.0
+    dimensions = [
+        round(value * factor, 1)
+        for value in (layout.tank_length, layout.tank_width, layout.tank_height)
+    ]
+
+    fish = {}
+    for entry in layout.fish_data:
+        name = " ".join(entry.name.split()).casefold()
+        fish[name] = fish.get(name, 0) + entry.quantity
+
+    canonical = {
+        "v": CANONICAL_VERSION,
+        "water_type": layout.water_type.strip().lower(),
+        "dimensions_cm": dimensions,
+        "fish": sorted([name, quantity] for name, quantity in fish.items() if quantity > 0),
+    }
+    if settings.EVAL_CACHE_KEY_INCLUDE_COMMENTS and layout.comments:
+        canonical["comments"] = " ".join(layout.comments.split())
+    return canonical
+
+
+def layout_cache_key(layout: AquariumLayoutRequest, namespace: str = "evaluate") -> str:
+    """
+    Stable hash of the canonical layout, prefixed with a namespace.
+    """
+    payload = json.dumps(canonical_layout(layout), sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
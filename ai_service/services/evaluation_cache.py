@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+from config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class CacheState(str, Enum):
+    FRESH = "fresh"  # within the TTL, serve as is
+    STALE = "stale"  # past the TTL but inside the revalidation window
+    EXPIRED = "expired"  # only usable if the upstream call fails
+    MISS = "miss"
+
+
+@dataclass
+class CacheEntry:
+    value: str
+    stored_at: float
+    cost_seconds: float = 0.0  # how long the upstream call took to produce it
+
+
+@dataclass
+class CacheLookup:
+    state: CacheState
+    value: Optional[str] = None
+
+
+class DiskCacheTier:
+    """
+    SQLite-backed second tier.
+
+    The file survives restarts and, thanks to WAL mode, can be shared by every
+    worker on the host. Its calls block (up to the 5 s busy timeout when
+    another worker holds the write lock), so EvaluationCache runs them in a
+    worker thread, never on the event loop.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, cost_seconds REAL NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_evaluations_stored_at ON evaluations (stored_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, cost_seconds FROM evaluations WHERE key = ?", (key,)
+            ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    def set(self, key: str, entry: CacheEntry, retain_seconds: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO evaluations (key, value, stored_at, cost_seconds) VALUES (?, ?, ?, ?)",
+                (key, entry.value, entry.stored_at, entry.cost_seconds),
+            )
+            self._writes += 1
+            # Prune now and then rather than on every write
+            if self._writes % 100 == 0:
+                self._prune(entry.stored_at - retain_seconds)
+            self._conn.commit()
+
+    def _prune(self, cutoff: float) -> None:
+        self._conn.execute("DELETE FROM evaluations WHERE stored_at < ?", (cutoff,))
+        self._conn.execute(
+            "DELETE FROM evaluations WHERE key NOT IN "
+            "(SELECT key FROM evaluations ORDER BY stored_at DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM evaluations")
+            self._conn.commit()
+
+
+class EvaluationCache:
+    """
+    Size-bounded LRU cache of evaluation texts with TTL and stale windows.
+
+    An entry is fresh for ``ttl`` seconds, then stale (served while a refresh
+    runs) for ``stale_while_revalidate`` seconds, and finally kept for
+    ``stale_if_error`` seconds in case OpenRouter is down.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        stale_while_revalidate: float = 0.0,
+        stale_if_error: float = 0.0,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 100_000,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._disk = DiskCacheTier(disk_path, disk_max_entries) if (enabled and disk_path) else None
+        self._disk_writes: set = set()  # background writes still running
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.served_on_error = 0
+        self.stores = 0
+        self.evictions = 0
+        self.seconds_saved = 0.0
+
+    @property
+    def retain_seconds(self) -> float:
+        return self.ttl + max(self.stale_while_revalidate, self.stale_if_error)
+
+    async def get(self, key: str) -> CacheLookup:
+        if not self.enabled:
+            return CacheLookup(CacheState.MISS)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self._disk is not None:
+            entry = await asyncio.to_thread(self._disk.get, key)
+            if entry is not None:
+                self.disk_hits += 1
+                self._remember(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            return CacheLookup(CacheState.MISS)
+
+        age = self._clock() - entry.stored_at
+        if age < self.ttl:
+            self.hits += 1
+            self.seconds_saved += entry.cost_seconds
+            return CacheLookup(CacheState.FRESH, entry.value)
+        if age < self.ttl + self.stale_while_revalidate:
+            self.stale_hits += 1
+            self.seconds_saved += entry.cost_seconds
+            return CacheLookup(CacheState.STALE, entry.value)
+
+        self.misses += 1
+        if age < self.ttl + self.stale_if_error:
+            return CacheLookup(CacheState.EXPIRED, entry.value)
+        self._entries.pop(key, None)
+        return CacheLookup(CacheState.MISS)
+
+    def set(self, key: str, value: str, cost_seconds: float = 0.0) -> None:
+        """Store in memory now; the disk copy is written in the background"""
+        if not self.enabled:
+            return
+        entry = CacheEntry(value=value, stored_at=self._clock(), cost_seconds=cost_seconds)
+        self._remember(key, entry)
+        self.stores += 1
+        if self._disk is None:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to protect (scripts, start-up)
+            self._write_to_disk(key, entry)
+            return
+        task = asyncio.create_task(asyncio.to_thread(self._write_to_disk, key, entry))
+        self._disk_writes.add(task)
+        task.add_done_callback(self._disk_writes.discard)
+
+    def _write_to_disk(self, key: str, entry: CacheEntry) -> None:
+        try:
+            self._disk.set(key, entry, self.retain_seconds)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write evaluation to disk cache: {str(e)}")
+
+    async def flush(self) -> None:
+        """Wait for the background disk writes started so far"""
+        if self._disk_writes:
+            await asyncio.gather(*self._disk_writes)
+
+    def record_served_on_error(self) -> None:
+        self.served_on_error += 1
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (both tiers) and reset the counters."""
+        self._entries.clear()
+        self._reset_counters()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "served_on_error": self.served_on_error,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "upstream_calls_saved": self.hits + self.stale_hits + self.served_on_error,
+            "llm_seconds_saved": round(self.seconds_saved, 3),
+        }
+
+
+evaluation_cache = EvaluationCache(
+    max_entries=settings.EVAL_CACHE_MAX_ENTRIES,
+    ttl=settings.EVAL_CACHE_TTL_SECONDS,
+    stale_while_revalidate=settings.EVAL_CACHE_STALE_WHILE_REVALIDATE_SECONDS,
+    stale_if_error=settings.EVAL_CACHE_STALE_IF_ERROR_SECONDS,
+    disk_path=settings.EVAL_CACHE_DISK_PATH,
+    disk_max_entries=settings.EVAL_CACHE_DISK_MAX_ENTRIES,
+    enabled=settings.EVAL_CACHE_ENABLED,
+)
@@ -0,0 +1,365 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from enum import Enum
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from .openrouter_client import client as default_client
+from config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"  # healthy, traffic flows
+    OPEN = "open"  # failing, no traffic until the reset period has passed
+    HALF_OPEN = "half_open"  # one probe request decides whether to close again
+
+
+class NoHealthyModelError(Exception):
+    """Every configured model has an open circuit"""
+    pass
+
+
+def percentile(values, q: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values`` (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _delta(chunk) -> Optional[str]:
+    return chunk.choices[0].delta.content if chunk.choices else None
+
+
+async def _close(stream) -> None:
+    close = getattr(stream, "close", None) or getattr(stream, "aclose", None)
+    if close is not None:
+        try:
+            await close()
+        except Exception as e:
+            logger.debug(f"Error closing upstream stream: {str(e)}")
+
+
+class ModelHealth:
+    """Latency window, error counters and circuit breaker for one model."""
+
+    def __init__(
+        self,
+        name: str,
+        window: int,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float],
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self.state = BreakerState.CLOSED
+        self.opened_at = 0.0
+        self._probing = False
+        self.latencies = deque(maxlen=window)  # whole response
+        self.first_token_latencies = deque(maxlen=window)  # streaming only
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+
+    def allows_request(self) -> bool:
+        if self.state == BreakerState.OPEN and self._clock() - self.opened_at >= self.reset_seconds:
+            self.state = BreakerState.HALF_OPEN
+            self._probing = False
+        if self.state == BreakerState.HALF_OPEN:
+            return not self._probing
+        return self.state == BreakerState.CLOSED
+
+    def begin(self) -> bool:
+        """Claim a request slot; in half-open state only one probe is let through."""
+        if not self.allows_request():
+            return False
+        if self.state == BreakerState.HALF_OPEN:
+            self._probing = True
+        return True
+
+    def release(self) -> None:
+        """The request was abandoned (e.g. lost a hedge) without a verdict."""
+        self._probing = False
+
+    def record_success(self, latency: float = None, first_token: float = None) -> None:
+        if latency is not None:
+            self.latencies.append(latency)
+            self.successes += 1
+        if first_token is not None:
+            self.first_token_latencies.append(first_token)
+        self.consecutive_failures = 0
+        if self.state != BreakerState.CLOSED:
+            logger.info(f"Model {self.name} recovered, closing circuit")
+        self.state = BreakerState.CLOSED
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        self._probing = False
+        if self.state == BreakerState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != BreakerState.OPEN:
+                logger.warning(f"Opening circuit for model {self.name} after {self.consecutive_failures} failures")
+            self.state = BreakerState.OPEN
+            self.opened_at = self._clock()
+
+    def stats(self) -> dict:
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        calls = self.successes + self.failures
+        return {
+            "state": self.state.value,
+            "successes": self.successes,
+            "failures": self.failures,
+            "error_rate": round(self.failures / calls, 4) if calls else 0.0,
+            "p50_ms": ms(percentile(self.latencies, 0.5)),
+            "p95_ms": ms(percentile(self.latencies, 0.95)),
+            "first_token_p95_ms": ms(percentile(self.first_token_latencies, 0.95)),
+        }
+
+
+class ModelStream:
+    """A streaming completion whose first token has already arrived."""
+
+    def __init__(self, health: ModelHealth, stream, iterator, first: str, started: float, clock):
+        self.health = health
+        self.model = health.name
+        self._stream = stream
+        self._iterator = iterator
+        self._first = first
+        self._started = started
+        self._clock = clock
+
+    async def deltas(self) -> AsyncIterator[str]:
+        """Yield the content deltas; the outcome is recorded on the model."""
+        try:
+            if self._first:
+                yield self._first
+            async for chunk in self._iterator:
+                delta = _delta(chunk)
+                if delta:
+                    yield delta
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.health.record_failure()
+            raise
+        else:
+            self.health.record_success(latency=self._clock() - self._started)
+        finally:
+            await _close(self._stream)
+
+
+class ModelRouter:
+    """
+    Send completions to an ordered list of models.
+
+    Each model has a circuit breaker: after ``failure_threshold`` consecutive
+    failures it is skipped for ``reset_seconds``, then a single probe decides
+    whether it is healthy again. A failed call fails over to the next model.
+
+    With hedging enabled, calls are streamed; if the current model has not
+    produced its first token within its p95 first-token latency (or
+    ``hedge_delay`` until enough samples exist), the next model is asked as
+    well and whichever answers first is used.
+    """
+
+    def __init__(
+        self,
+        models: List[str],
+        client=default_client,
+        failure_threshold: int = 3,
+        reset_seconds: float = 30.0,
+        window: int = 50,
+        hedging: bool = False,
+        hedge_delay: float = 3.0,
+        hedge_min_samples: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not models:
+            raise ValueError("At least one model must be configured")
+        self.client = client
+        self.hedging = hedging
+        self.default_hedge_delay = hedge_delay
+        self.hedge_min_samples = hedge_min_samples
+        self._clock = clock
+        self._settings = (window, failure_threshold, reset_seconds)
+        self.models = [ModelHealth(name, window, failure_threshold, reset_seconds, clock) for name in models]
+        self.hedges_started = 0
+        self.hedges_won = 0
+
+    def reset(self) -> None:
+        """Forget all health data (used by tests)."""
+        window, failure_threshold, reset_seconds = self._settings
+        self.models = [
+            ModelHealth(health.name, window, failure_threshold, reset_seconds, self._clock) for health in self.models
+        ]
+        self.hedges_started = 0
+        self.hedges_won = 0
+
+    def candidates(self) -> List[ModelHealth]:
+        """Models currently accepting traffic, in configured order."""
+        return [health for health in self.models if health.allows_request()]
+
+    def hedge_delay(self, health: ModelHealth) -> float:
+        if len(health.first_token_latencies) >= self.hedge_min_samples:
+            return percentile(health.first_token_latencies, 0.95)
+        return self.default_hedge_delay
+
+    async def complete(self, request: dict) -> Tuple[str, str]:
+        """
+        Run a chat completion, failing over between models.
+
+        Args:
+            request: Completion parameters without ``model``
+
+        Returns:
+            Tuple of the response text and the model that produced it
+
+        Raises:
+            NoHealthyModelError: If every circuit is open
+            Exception: The last upstream error if every model failed
+        """
+        if self.hedging:
+            opened = await self.open_stream(request)
+            parts = [delta async for delta in opened.deltas()]
+            return "".join(parts), opened.model
+
+        last_error = None
+        for health in self.candidates():
+            if not health.begin():
+                continue
+            started = self._clock()
+            try:
+                response = await self.client.chat.completions.create(model=health.name, **request)
+            except asyncio.CancelledError:
+                health.release()
+                raise
+            except Exception as e:
+                health.record_failure()
+                logger.warning(f"Model {health.name} failed: {str(e)}")
+                last_error = e
+                continue
+            health.record_success(latency=self._clock() - started)
+            return response.choices[0].message.content or "", health.name
+
+        raise last_error or NoHealthyModelError("No healthy model is available")
+
+    async def _open(self, health: ModelHealth, request: dict) -> ModelStream:
+        """Start a streaming call and wait for its first token."""
+        started = self._clock()
+        stream = await self.client.chat.completions.create(model=health.name, stream=True, **request)
+        iterator = stream.__aiter__()
+        first = ""
+        try:
+            async for chunk in iterator:
+                first = _delta(chunk) or ""
+                if first:
+                    break
+        except BaseException:
+            await _close(stream)
+            raise
+        return ModelStream(health, stream, iterator, first, started, self._clock)
+
+    async def open_stream(self, request: dict) -> ModelStream:
+        """
+        Open a streaming completion on the first model to produce a token.
+
+        Args:
+            request: Completion parameters without ``model`` or ``stream``
+
+        Returns:
+            ModelStream positioned after the first token
+
+        Raises:
+            NoHealthyModelError: If every circuit is open
+            Exception: The last upstream error if every model failed
+        """
+        candidates = self.candidates()
+        pending: Dict[asyncio.Task, ModelHealth] = {}
+        position = 0
+        hedged = False
+        last_error = None
+
+        def launch() -> bool:
+            nonlocal position
+            while position < len(candidates):
+                health = candidates[position]
+                position += 1
+                if health.begin():
+                    pending[asyncio.create_task(self._open(health, request))] = health
+                    return True
+            return False
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if self.hedging and len(pending) == 1 and position < len(candidates):
+                    timeout = self.hedge_delay(next(iter(pending.values())))
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    if launch():
+                        hedged = True
+                        self.hedges_started += 1
+                        logger.info(f"No first token after {timeout:.2f}s, hedging with {candidates[position - 1].name}")
+                    continue
+
+                winner = None
+                for task in done:
+                    health = pending.pop(task)
+                    try:
+                        opened = task.result()
+                    except Exception as e:
+                        health.record_failure()
+                        logger.warning(f"Model {health.name} failed: {str(e)}")
+                        last_error = e
+                        continue
+                    health.record_success(first_token=self._clock() - opened._started)
+                    if winner is None:
+                        winner = opened
+                    else:
+                        await _close(opened._stream)
+                if winner is not None:
+                    if hedged and winner.health is not candidates[0]:
+                        self.hedges_won += 1
+                    return winner
+                if not pending:
+                    launch()
+        finally:
+            # Cancel the slower request of a hedged pair
+            for task, health in pending.items():
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    await _close(task.result()._stream)
+                task.cancel()
+                health.release()
+
+        raise last_error or NoHealthyModelError("No healthy model is available")
+
+    def stats(self) -> dict:
+        return {
+            "hedging": self.hedging,
+            "hedges_started": self.hedges_started,
+            "hedges_won": self.hedges_won,
+            "models": {health.name: health.stats() for health in self.models},
+        }
+
+
+model_router = ModelRouter(
+    settings.openrouter_models,
+    failure_threshold=settings.ROUTER_BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=settings.ROUTER_BREAKER_RESET_SECONDS,
+    window=settings.ROUTER_LATENCY_WINDOW,
+    hedging=settings.ROUTER_HEDGING_ENABLED,
+    hedge_delay=settings.ROUTER_HEDGE_DELAY,
+    hedge_min_samples=settings.ROUTER_HEDGE_MIN_SAMPLES,
+)
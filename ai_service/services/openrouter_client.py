@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import httpx
+import openai
+from config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyGovernor:
+    """
+    Limit the number of in-flight upstream calls.
+
+    Callers beyond the limit queue on a semaphore; the governor keeps track of
+    how many calls are running and how many are waiting so the queue depth can
+    be reported by the service.
+    """
+
+    def __init__(self, limit: int, queue_timeout: float = None):
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def __aenter__(self):
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            if self.queue_timeout:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            else:
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        self.completed += 1
+        self._semaphore.release()
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "peak_queue_depth": self.peak_waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client shared by every OpenRouter call."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.OPENROUTER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENROUTER_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENROUTER_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.OPENROUTER_TIMEOUT,
+            connect=settings.OPENROUTER_CONNECT_TIMEOUT,
+        ),
+    )
+
+
+# Configure OpenRouter client using OpenAI-compatible interface
+client = openai.AsyncOpenAI(
+    api_key=settings.OPENROUTER_API_KEY,
+    base_url=settings.OPENROUTER_API_BASE.rstrip('/').replace('/chat/completions', ''),
+    http_client=_build_http_client(),
+    max_retries=settings.OPENROUTER_MAX_RETRIES,
+)
+
+governor = ConcurrencyGovernor(
+    settings.OPENROUTER_MAX_CONCURRENCY,
+    queue_timeout=settings.OPENROUTER_QUEUE_TIMEOUT,
+)
+
+
+async def close_client():
+    """Close the pooled connections (called on application shutdown)."""
+    logger.info("Closing OpenRouter HTTP client")
+    await client.close()
@@ -1,53 +1,67 @@
+from typing import List, Tuple
 from models.ai_model import AquariumLayout as AquariumLayoutRequest
 
+def format_dimension(value: float) -> str:
+    """A dimension as entered: 60 rather than 60.0, 60.96 as is"""
+    return f"{value:g}"
+
+def calculate_tank_volume(layout: AquariumLayoutRequest) -> Tuple[float, float]:
+    """
+    Calculate the tank volume from its dimensions.
+
+    Args:
+        layout: AquariumLayoutRequest model containing all aquarium details
+
+    Returns:
+        Tuple of (liters, gallons), both rounded to one decimal
+    """
+    # Get unit (default to cm if not specified)
+    unit = getattr(layout, 'unit', 'cm')
+
+    if unit == 'inch':
+        # 231 cubic inches = 1 gallon
+        volume_cubic_inches = layout.tank_length * layout.tank_width * layout.tank_height
+        volume_gallons = round(volume_cubic_inches / 231, 1)
+        volume_liters = round(volume_gallons * 3.785, 1)
+    else:
+        # 1000 cubic centimetres = 1 liter
+        volume_cubic_cm = layout.tank_length * layout.tank_width * layout.tank_height
+        volume_liters = round(volume_cubic_cm / 1000, 1)
+        volume_gallons = round(volume_liters / 3.785, 1)
+    return volume_liters, volume_gallons
+
 def build_prompt(layout: AquariumLayoutRequest) -> str:
     """
     Build a prompt for the AI model based on the aquarium layout.
-    
+
     Args:
         layout: AquariumLayoutRequest model containing all aquarium details
-        
+
     Returns:
         str: Formatted prompt string
     """
     # Format fish data with quantities
     fish_list = ", ".join(f"{fish.quantity} {fish.name}" for fish in layout.fish_data)
     total_fish = sum(fish.quantity for fish in layout.fish_data)
-    
+
     # Get unit (default to cm if not specified)
     unit = getattr(layout, 'unit', 'cm')
-    
+    volume_liters, volume_gallons = calculate_tank_volume(layout)
+    estimated_capacity = int(volume_gallons * 0.8)
+
     if unit == 'inch':
-        # Pre-calculate tank metrics for inches
-        volume_cubic_inches = layout.tank_length * layout.tank_width * layout.tank_height
-        volume_gallons = round(volume_cubic_inches / 231, 1)
-        volume_liters = round(volume_gallons * 3.785, 1)
-        estimated_capacity = int(volume_gallons * 0.8)
-        
         # Display dimensions in inches
-        display_length = layout.tank_length
-        display_width = layout.tank_width
-        display_height = layout.tank_height
         unit_display = '"'
         volume_str = f"{volume_gallons} gallons ({volume_liters} liters)"
     else:
-        # Pre-calculate tank metrics for centimeters
-        volume_cubic_cm = layout.tank_length * layout.tank_width * layout.tank_height
-        volume_liters = round(volume_cubic_cm / 1000, 1)
-        volume_gallons = round(volume_liters / 3.785, 1)
-        estimated_capacity = int(volume_gallons * 0.8)
-        
         # Display dimensions in centimeters
-        display_length = layout.tank_length
-        display_width = layout.tank_width
-        display_height = layout.tank_height
         unit_display = 'cm'
         volume_str = f"{volume_liters} liters ({volume_gallons} gallons)"
-    
+
     return f"""Analyze this aquarium setup:
 
 Tank: {layout.tank_name}
-Size: {display_length}{unit_display} x {display_width}{unit_display} x {display_height}{unit_display}
+Size: {format_dimension(layout.tank_length)}{unit_display} x {format_dimension(layout.tank_width)}{unit_display} x {format_dimension(layout.tank_height)}{unit_display}
 Volume: {volume_str}
 Water: {layout.water_type}
 Estimated capacity: {estimated_capacity} inches of fish
@@ -71,4 +85,29 @@ For each section:
 
 {f"Notes: {layout.comments}" if layout.comments else ""}
 
-Provide a professional assessment with detailed, practical advice for each section."""
\ No newline at end of file
+Provide a professional assessment with detailed, practical advice for each section."""
+
+def build_hybrid_prompt(layout: AquariumLayoutRequest, facts: List[str]) -> str:
+    """
+    Build a short prompt around facts already computed by the stocking engine.
+
+    The model only has to explain and advise, not redo the arithmetic, so the
+    prompt (and the answer) can be much shorter than build_prompt's.
+
+    Args:
+        layout: AquariumLayoutRequest model containing all aquarium details
+        facts: One line per computed fact (volume, bioload, conflicts, ...)
+
+    Returns:
+        str: Formatted prompt string
+    """
+    fish_list = ", ".join(f"{fish.quantity} {fish.name}" for fish in layout.fish_data)
+    fact_lines = "\n".join(f"- {fact}" for fact in facts)
+
+    return f"""{layout.water_type} tank with: {fish_list}
+
+Verified facts (use these numbers as given, do not recompute):
+{fact_lines}
+
+Write the six required sections, 2-3 sentences each, explaining these facts and what to do about them.
+{f"Notes: {layout.comments}" if layout.comments else ""}"""
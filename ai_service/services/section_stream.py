@@ -0,0 +1,71 @@
+from typing import Dict, List, Optional, Tuple
+
+# The six section headers every evaluation must contain, in order
+SECTION_HEADERS = [
+    "🔵 Tank Volume Assessment",
+    "🟡 Bioload Assessment",
+    "🟣 Fish Compatibility & Behavior",
+    "🟢 Schooling Requirements",
+    "✅ Recommendations",
+    "⭐ Overall Rating"
+]
+
+# Shortest section body that is considered a real answer
+MIN_SECTION_LENGTH = 20
+
+
+class SectionStreamParser:
+    """
+    Split streamed model output into sections as soon as they complete.
+
+    A section is complete when the next header arrives (or the stream ends).
+    Text before the first header is ignored, and a header split across two
+    chunks is simply kept in the buffer until the rest of it arrives.
+    """
+
+    def __init__(self, headers: List[str] = None):
+        self.headers = headers or SECTION_HEADERS
+        self._current: Optional[str] = None
+        self._pending = ""
+
+    def _next_header(self) -> Tuple[int, Optional[str]]:
+        position, found = -1, None
+        for header in self.headers:
+            index = self._pending.find(header)
+            if index != -1 and (position == -1 or index < position):
+                position, found = index, header
+        return position, found
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """Add streamed text; return the sections completed by it."""
+        self._pending += text
+        completed = []
+        while True:
+            position, header = self._next_header()
+            if header is None:
+                break
+            if self._current is not None:
+                completed.append((self._current, self._pending[:position].strip()))
+            self._current = header
+            self._pending = self._pending[position + len(header):]
+        return completed
+
+    def finish(self) -> List[Tuple[str, str]]:
+        """Flush the last section once the stream has ended."""
+        if self._current is None:
+            return []
+        completed = [(self._current, self._pending.strip())]
+        self._current, self._pending = None, ""
+        return completed
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Split a complete evaluation into a header -> body mapping."""
+    parser = SectionStreamParser()
+    sections = parser.feed(text) + parser.finish()
+    return dict(sections)
+
+
+def validate_section(header: str, body: str) -> bool:
+    """A section is usable if it is one of the known headers and has real content."""
+    return header in SECTION_HEADERS and len(body.strip()) >= MIN_SECTION_LENGTH
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key onto one in-flight task.
+
+    Every caller awaits the same task through ``asyncio.shield``, so a caller
+    that is cancelled only stops waiting. The shared task is cancelled once
+    no callers are left waiting for it, and forgotten at the same time, so a
+    caller arriving next starts a fresh call instead of joining the cancelled
+    one.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task, key=key, call=call: self._forget(key, call))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                logger.debug(f"All waiters left, cancelling shared call {key}")
+                self._remove(key, call)
+                call.task.cancel()
+
+    def _remove(self, key: str, call: _Call) -> None:
+        # Only this call's own entry: a newer call may already hold the key
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _forget(self, key: str, call: _Call) -> None:
+        self._remove(key, call)
+        # Retrieve the exception so an unobserved failure is not logged as a warning
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
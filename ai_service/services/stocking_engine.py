@@ -0,0 +1,315 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from .prompt_builder import calculate_tank_volume
+from models.ai_model import AquariumLayout as AquariumLayoutRequest
+
+# Adult body length a tank can carry per liter: the "1 cm per liter" rule for
+# tropical freshwater, "1 inch per 4-5 gallons" (about 0.15 cm/L) for marine
+CAPACITY_CM_PER_LITER = {"freshwater": 1.0, "saltwater": 0.15}
+
+# Species we know nothing about are assumed to be small community fish
+DEFAULT_ADULT_CM = 5.0
+
+
+@dataclass(frozen=True)
+class SpeciesProfile:
+    adult_cm: float
+    min_group: int
+    temperament: str  # "peaceful", "semi-aggressive" or "aggressive"
+    water_type: str
+    min_liters: int
+    bioload: float = 1.0  # waste output relative to a fish of the same length
+    family: Optional[str] = None  # species of one family tend to fight each other
+    fin_nipper: bool = False
+    long_finned: bool = False
+    coldwater: bool = False
+    predator: bool = False
+    one_per_tank: bool = False
+
+
+SPECIES: Dict[str, SpeciesProfile] = {
+    # Freshwater
+    "neon tetra": SpeciesProfile(3.5, 6, "peaceful", "freshwater", 40),
+    "cardinal tetra": SpeciesProfile(4, 6, "peaceful", "freshwater", 60),
+    "black skirt tetra": SpeciesProfile(6, 6, "semi-aggressive", "freshwater", 60, fin_nipper=True),
+    "serpae tetra": SpeciesProfile(4.5, 6, "semi-aggressive", "freshwater", 80, fin_nipper=True),
+    "guppy": SpeciesProfile(5, 3, "peaceful", "freshwater", 40, long_finned=True),
+    "molly": SpeciesProfile(10, 3, "peaceful", "freshwater", 100),
+    "platy": SpeciesProfile(6, 3, "peaceful", "freshwater", 40),
+    "swordtail": SpeciesProfile(12, 3, "peaceful", "freshwater", 100),
+    "betta fish": SpeciesProfile(6, 1, "semi-aggressive", "freshwater", 20, family="betta", long_finned=True, one_per_tank=True),
+    "crown tail betta": SpeciesProfile(6, 1, "semi-aggressive", "freshwater", 20, family="betta", long_finned=True, one_per_tank=True),
+    "angelfish": SpeciesProfile(15, 1, "semi-aggressive", "freshwater", 150, long_finned=True, predator=True),
+    "discus": SpeciesProfile(18, 5, "peaceful", "freshwater", 250, bioload=1.5),
+    "german blue ram": SpeciesProfile(7, 2, "peaceful", "freshwater", 80),
+    "corydoras catfish": SpeciesProfile(6, 6, "peaceful", "freshwater", 60),
+    "bristlenose pleco": SpeciesProfile(13, 1, "peaceful", "freshwater", 100, bioload=1.5),
+    "glass catfish": SpeciesProfile(8, 6, "peaceful", "freshwater", 100),
+    "cherry barb": SpeciesProfile(5, 6, "peaceful", "freshwater", 60),
+    "tiger barb": SpeciesProfile(7, 6, "semi-aggressive", "freshwater", 80, fin_nipper=True),
+    "zebra danio": SpeciesProfile(5, 6, "peaceful", "freshwater", 40),
+    "pearl danio": SpeciesProfile(6, 6, "peaceful", "freshwater", 60),
+    "goldfish": SpeciesProfile(25, 1, "peaceful", "freshwater", 150, bioload=2.0, coldwater=True),
+    "fancy goldfish": SpeciesProfile(18, 1, "peaceful", "freshwater", 120, bioload=2.0, coldwater=True, long_finned=True),
+    # Saltwater
+    "ocellaris clownfish": SpeciesProfile(8, 1, "semi-aggressive", "saltwater", 75, family="clownfish"),
+    "percula clownfish": SpeciesProfile(8, 1, "semi-aggressive", "saltwater", 75, family="clownfish"),
+    "maroon clownfish": SpeciesProfile(15, 1, "aggressive", "saltwater", 150, family="clownfish"),
+    "blue tang": SpeciesProfile(30, 1, "semi-aggressive", "saltwater", 500, family="tang"),
+    "yellow tang": SpeciesProfile(20, 1, "semi-aggressive", "saltwater", 300, family="tang"),
+    "powder blue tang": SpeciesProfile(23, 1, "semi-aggressive", "saltwater", 500, family="tang"),
+    "blue damsel": SpeciesProfile(7, 1, "aggressive", "saltwater", 75),
+    "yellowtail damsel": SpeciesProfile(7, 1, "semi-aggressive", "saltwater", 75),
+    "cleaner wrasse": SpeciesProfile(10, 1, "peaceful", "saltwater", 200),
+    "fairy wrasse": SpeciesProfile(10, 1, "peaceful", "saltwater", 200),
+    "six line wrasse": SpeciesProfile(8, 1, "aggressive", "saltwater", 100),
+    "firefish goby": SpeciesProfile(8, 1, "peaceful", "saltwater", 75),
+    "mandarin goby": SpeciesProfile(7, 1, "peaceful", "saltwater", 200),
+    "yellow watchman goby": SpeciesProfile(10, 1, "peaceful", "saltwater", 75),
+    "flame angelfish": SpeciesProfile(10, 1, "semi-aggressive", "saltwater", 250, family="marine angelfish"),
+    "french angelfish": SpeciesProfile(40, 1, "semi-aggressive", "saltwater", 800, family="marine angelfish"),
+    "queen angelfish": SpeciesProfile(45, 1, "aggressive", "saltwater", 800, family="marine angelfish"),
+}
+
+# Common names people type that mean a catalog species
+ALIASES = {
+    "betta": "betta fish",
+    "siamese fighting fish": "betta fish",
+    "veiltail betta": "betta fish",
+    "black molly": "molly",
+    "southern platy": "platy",
+    "green swordtail": "swordtail",
+    "freshwater angelfish": "angelfish",
+    "cory": "corydoras catfish",
+    "corydoras": "corydoras catfish",
+    "percula cownfish": "percula clownfish",
+    "clownfish": "ocellaris clownfish",
+}
+
+
+def lookup_species(name: str) -> Optional[SpeciesProfile]:
+    key = " ".join(name.split()).casefold()
+    return SPECIES.get(ALIASES.get(key, key))
+
+
+@dataclass
+class StockingReport:
+    volume_liters: float
+    volume_gallons: float
+    water_type: str
+    total_fish: int
+    total_adult_cm: float
+    capacity_cm: float
+    bioload_percent: float
+    stocking_density: float  # adult cm of fish per liter
+    undersized_for: List[Tuple[str, int]] = field(default_factory=list)  # (species, liters needed)
+    schooling_shortfalls: List[Tuple[str, int, int]] = field(default_factory=list)  # (species, have, need)
+    incompatibilities: List[str] = field(default_factory=list)
+    unknown_species: List[str] = field(default_factory=list)
+    rating: int = 10
+
+    def facts(self) -> List[str]:
+        """The computed findings as short lines (used by the hybrid prompt)."""
+        facts = [
+            f"Volume: {self.volume_liters} L ({self.volume_gallons} gal)",
+            f"Stock: {self.total_fish} fish, {self.total_adult_cm:.0f} cm total adult length",
+            f"Bioload: {self.bioload_percent:.0f}% of a {self.capacity_cm:.0f} cm capacity "
+            f"({self.stocking_density:.2f} cm per liter)",
+        ]
+        facts += [f"Tank too small for {name}: needs at least {liters} L" for name, liters in self.undersized_for]
+        facts += [f"{name}: {have} kept, needs a group of {need}+" for name, have, need in self.schooling_shortfalls]
+        facts += [f"Conflict: {issue}" for issue in self.incompatibilities]
+        if self.unknown_species:
+            facts.append(f"No reference data for: {', '.join(self.unknown_species)}")
+        facts.append(f"Rule-based rating: {self.rating}/10")
+        return facts
+
+
+def _incompatibilities(stock: List[Tuple[str, int, SpeciesProfile]], water_type: str, volume_liters: float) -> List[str]:
+    issues = []
+    for name, _, profile in stock:
+        if profile.water_type != water_type:
+            issues.append(f"{name} is a {profile.water_type} species and cannot live in a {water_type} tank")
+
+    for name, quantity, profile in stock:
+        if profile.one_per_tank and quantity > 1:
+            issues.append(f"{quantity} {name} will fight; keep only one male per tank")
+
+    families: Dict[str, List[str]] = {}
+    for name, _, profile in stock:
+        if profile.family:
+            families.setdefault(profile.family, []).append(name)
+    for family, names in families.items():
+        if len(names) > 1 and not (family == "tang" and volume_liters >= 1000):
+            issues.append(f"{' and '.join(names)} are both {family} species and are likely to fight")
+
+    coldwater = [name for name, _, profile in stock if profile.coldwater]
+    tropical = [name for name, _, profile in stock if not profile.coldwater and profile.water_type == "freshwater"]
+    if coldwater and tropical:
+        issues.append(f"{', '.join(coldwater)} need cooler water than {', '.join(tropical)}")
+
+    nippers = [name for name, _, profile in stock if profile.fin_nipper]
+    long_fins = [name for name, _, profile in stock if profile.long_finned]
+    if nippers and long_fins:
+        issues.append(f"{', '.join(nippers)} are fin nippers and will harass {', '.join(long_fins)}")
+
+    for predator_name, _, predator in stock:
+        if not predator.predator and predator.temperament != "aggressive":
+            continue
+        for prey_name, _, prey in stock:
+            if prey_name == predator_name:
+                continue
+            if predator.predator and prey.adult_cm * 3 <= predator.adult_cm:
+                issues.append(f"{predator_name} may eat {prey_name}")
+            elif predator.temperament == "aggressive" and prey.temperament == "peaceful" and prey.adult_cm <= predator.adult_cm:
+                issues.append(f"{predator_name} is aggressive and will bully {prey_name}")
+    return issues
+
+
+def analyze_layout(layout: AquariumLayoutRequest) -> StockingReport:
+    """
+    Compute stocking facts for a layout without calling any model.
+
+    Args:
+        layout: AquariumLayoutRequest model containing all aquarium details
+
+    Returns:
+        StockingReport with bioload, schooling, size and compatibility findings
+    """
+    volume_liters, volume_gallons = calculate_tank_volume(layout)
+    water_type = layout.water_type.lower()
+
+    # Merge duplicate entries for the same species
+    merged: Dict[str, int] = {}
+    for fish in layout.fish_data:
+        name = " ".join(fish.name.split())
+        existing = next((key for key in merged if key.casefold() == name.casefold()), name)
+        merged[existing] = merged.get(existing, 0) + fish.quantity
+
+    stock, unknown = [], []
+    total_adult_cm = 0.0
+    for name, quantity in merged.items():
+        profile = lookup_species(name)
+        if profile is None:
+            unknown.append(name)
+            total_adult_cm += DEFAULT_ADULT_CM * quantity
+            continue
+        stock.append((name, quantity, profile))
+        total_adult_cm += profile.adult_cm * profile.bioload * quantity
+
+    capacity_cm = volume_liters * CAPACITY_CM_PER_LITER.get(water_type, CAPACITY_CM_PER_LITER["freshwater"])
+    bioload_percent = round(total_adult_cm / capacity_cm * 100, 1) if capacity_cm else 0.0
+
+    report = StockingReport(
+        volume_liters=volume_liters,
+        volume_gallons=volume_gallons,
+        water_type=water_type,
+        total_fish=sum(merged.values()),
+        total_adult_cm=round(total_adult_cm, 1),
+        capacity_cm=round(capacity_cm, 1),
+        bioload_percent=bioload_percent,
+        stocking_density=round(total_adult_cm / volume_liters, 3) if volume_liters else 0.0,
+        undersized_for=[(name, profile.min_liters) for name, _, profile in stock if volume_liters < profile.min_liters],
+        schooling_shortfalls=[
+            (name, quantity, profile.min_group) for name, quantity, profile in stock if quantity < profile.min_group
+        ],
+        incompatibilities=_incompatibilities(stock, water_type, volume_liters),
+        unknown_species=unknown,
+    )
+    report.rating = _rating(report)
+    return report
+
+
+def _rating(report: StockingReport) -> int:
+    score = 10
+    if report.bioload_percent > 100:
+        score -= 3
+    elif report.bioload_percent > 80:
+        score -= 1
+    score -= 2 * len(report.incompatibilities)
+    score -= len(report.schooling_shortfalls)
+    score -= len(report.undersized_for)
+    return max(1, min(10, score))
+
+
+def render_report(report: StockingReport, layout: AquariumLayoutRequest) -> str:
+    """
+    Write a report in the same six-section format the model is asked for.
+    """
+    stock_line = ", ".join(f"{fish.quantity} {fish.name}" for fish in layout.fish_data)
+
+    if report.undersized_for:
+        needs = ", ".join(f"{name} (at least {liters} L)" for name, liters in report.undersized_for)
+        volume_text = f"At {report.volume_liters} liters ({report.volume_gallons} gallons) the tank is too small for {needs}."
+    else:
+        volume_text = (
+            f"At {report.volume_liters} liters ({report.volume_gallons} gallons) the tank meets the minimum size "
+            f"of every species you have chosen."
+        )
+
+    if report.bioload_percent > 100:
+        bioload_level = "overstocked; reduce the number of fish or move to a larger tank"
+    elif report.bioload_percent > 80:
+        bioload_level = "close to the limit; strong filtration and frequent water changes are essential"
+    elif report.bioload_percent > 50:
+        bioload_level = "moderate and manageable with a good filter"
+    else:
+        bioload_level = "light, leaving room for more fish"
+    bioload_text = (
+        f"{report.total_fish} fish reach about {report.total_adult_cm:.0f} cm of adult length against a capacity of "
+        f"roughly {report.capacity_cm:.0f} cm, a bioload of {report.bioload_percent:.0f}%. The stocking is {bioload_level}."
+    )
+
+    if report.incompatibilities:
+        compatibility_text = "Current Setup: " + stock_line + "\n" + "\n".join(f"- {issue}" for issue in report.incompatibilities)
+    else:
+        compatibility_text = f"Current Setup: {stock_line}\nNo known conflicts between these {report.water_type} species."
+    if report.unknown_species:
+        compatibility_text += f"\nNo reference data for {', '.join(report.unknown_species)}; research them before adding."
+
+    if report.schooling_shortfalls:
+        schooling_text = "\n".join(
+            f"- {name}: you have {have}, keep at least {need} so they feel secure"
+            for name, have, need in report.schooling_shortfalls
+        )
+    else:
+        schooling_text = "Every schooling species is kept in a large enough group."
+
+    recommendations = []
+    if report.bioload_percent > 100:
+        recommendations.append("Reduce the stock or upgrade the tank before adding anything else")
+    for name, liters in report.undersized_for:
+        recommendations.append(f"Rehome {name} or upgrade to at least {liters} liters")
+    for name, have, need in report.schooling_shortfalls:
+        if report.bioload_percent <= 80:
+            recommendations.append(f"Add {need - have} more {name}")
+        else:
+            recommendations.append(f"Keep {name} in a group of {need} or choose a non-schooling species")
+    for issue in report.incompatibilities:
+        recommendations.append(f"Resolve: {issue}")
+    water_change = "25-30%" if report.bioload_percent > 80 else "10-15%"
+    recommendations.append(f"Change {water_change} of the water weekly and test ammonia, nitrite and nitrate regularly")
+
+    verdict = {
+        10: "Excellent setup.", 9: "Excellent setup.", 8: "Good setup with minor points to watch.",
+        7: "Good setup with minor points to watch.", 6: "Workable, but address the issues above.",
+        5: "Workable, but address the issues above.",
+    }.get(report.rating, "Needs changes before it is safe for the fish.")
+
+    return f"""🔵 Tank Volume Assessment
+{volume_text}
+
+🟡 Bioload Assessment
+{bioload_text}
+
+🟣 Fish Compatibility & Behavior
+{compatibility_text}
+
+🟢 Schooling Requirements
+{schooling_text}
+
+✅ Recommendations
+{chr(10).join(f"- {item}" for item in recommendations)}
+
+⭐ Overall Rating
+{report.rating}/10 - {verdict}"""
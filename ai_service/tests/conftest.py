@@ -0,0 +1,26 @@
+import os
+import sys
+import pytest
+
+# The service uses top-level imports (``from config import settings``) as it
+# does inside the container, where /app is on PYTHONPATH.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+
+@pytest.fixture(autouse=True)
+def clear_evaluation_cache():
+    """Each test starts with an empty in-memory evaluation cache."""
+    from services.evaluation_cache import evaluation_cache
+    evaluation_cache.clear()
+    yield
+    evaluation_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_model_router():
+    """Circuit breakers and latency windows do not leak between tests."""
+    from services.model_router import model_router
+    model_router.reset()
+    yield
+    model_router.reset()
@@ -0,0 +1,70 @@
+import asyncio
+import time
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import FastAPI
+from routes import ai_routes
+from tests.test_openrouter_client import SAMPLE_AQUARIUM_LAYOUT, VALID_RESPONSE, completion
+
+CREATE = "services.openrouter_client.client.chat.completions.create"
+
+
+def client() -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(ai_routes.router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://ai")
+
+
+def deadline_in(seconds: float) -> dict:
+    return {"X-Request-Deadline": f"{time.time() + seconds:.3f}"}
+
+
+async def slow_completion(*args, **kwargs):
+    await asyncio.sleep(5)
+    return completion(VALID_RESPONSE)
+
+
+@pytest.mark.asyncio
+class TestRequestDeadline:
+    async def test_an_expired_deadline_is_rejected_without_calling_the_model(self):
+        create = AsyncMock(return_value=completion(VALID_RESPONSE))
+        with patch(CREATE, new=create):
+            async with client() as ai:
+                response = await ai.post("/evaluate", json=SAMPLE_AQUARIUM_LAYOUT, headers=deadline_in(-1))
+
+        assert response.status_code == 504
+        create.assert_not_called()
+
+    async def test_the_deadline_bounds_the_model_call(self):
+        with patch(CREATE, new=slow_completion):
+            async with client() as ai:
+                started = time.monotonic()
+                response = await ai.post("/evaluate", json=SAMPLE_AQUARIUM_LAYOUT, headers=deadline_in(0.2))
+
+        assert response.status_code == 504
+        assert time.monotonic() - started < 2
+
+    async def test_an_invalid_deadline_is_ignored(self):
+        with patch(CREATE, new=AsyncMock(return_value=completion(VALID_RESPONSE))):
+            async with client() as ai:
+                response = await ai.post(
+                    "/evaluate", json=SAMPLE_AQUARIUM_LAYOUT, headers={"X-Request-Deadline": "soon"}
+                )
+
+        assert response.status_code == 200
+
+    async def test_an_expired_deadline_is_rejected_before_streaming(self):
+        async with client() as ai:
+            response = await ai.post("/evaluate/stream", json=SAMPLE_AQUARIUM_LAYOUT, headers=deadline_in(-1))
+
+        assert response.status_code == 504
+
+    async def test_a_stream_that_misses_its_deadline_ends_with_an_error(self):
+        with patch(CREATE, new=slow_completion):
+            async with client() as ai:
+                response = await ai.post("/evaluate/stream", json=SAMPLE_AQUARIUM_LAYOUT, headers=deadline_in(0.2))
+
+        assert response.status_code == 200
+        assert response.text.startswith("event: error")
+        assert ai_routes.DEADLINE_DETAIL in response.text
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from models.ai_model import AquariumLayout
+from services.batch_service import batch_concurrency, evaluate_batch
+from config import settings
+from tests.test_openrouter_client import SAMPLE_AQUARIUM_LAYOUT, VALID_RESPONSE, completion
+
+
+def layout_with(quantity: int, **overrides) -> AquariumLayout:
+    return AquariumLayout(**{
+        **SAMPLE_AQUARIUM_LAYOUT,
+        "fish_data": [{"name": "Neon Tetra", "quantity": quantity}],
+        **overrides,
+    })
+
+
+@pytest.mark.asyncio
+class TestBatchEvaluation:
+    async def test_duplicates_are_evaluated_once_and_reported_per_item(self):
+        calls = 0
+
+        async def create(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return completion(VALID_RESPONSE)
+
+        layouts = [layout_with(6), layout_with(6, tank_name="Copy"), layout_with(8)]
+        with patch("services.openrouter_client.client.chat.completions.create", side_effect=create):
+            results = [item async for item in evaluate_batch(layouts, concurrency=2)]
+
+        assert calls == 2
+        assert sorted(item["index"] for item in results) == [0, 1, 2]
+        assert {item["status"] for item in results} == {"success"}
+        assert next(item for item in results if item["index"] == 1)["duplicate_of"] == 0
+
+    async def test_parallelism_is_bounded(self):
+        running = peak = 0
+
+        async def create(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return completion(VALID_RESPONSE)
+
+        layouts = [layout_with(quantity) for quantity in range(1, 11)]
+        with patch("services.openrouter_client.client.chat.completions.create", side_effect=create):
+            results = [item async for item in evaluate_batch(layouts, concurrency=3)]
+
+        assert len(results) == 10
+        assert peak == 3
+
+    async def test_invalid_layouts_fail_individually(self):
+        layouts = [layout_with(6, water_type="brackish")]
+        results = [item async for item in evaluate_batch(layouts)]
+
+        assert results == [{
+            "index": 0,
+            "status": "error",
+            "error": "Water type must be either 'freshwater' or 'saltwater'",
+        }]
+
+    async def test_concurrency_is_capped(self):
+        assert batch_concurrency(10_000) == settings.BATCH_MAX_CONCURRENCY
+        assert batch_concurrency(None) == settings.BATCH_CONCURRENCY
@@ -0,0 +1,156 @@
+import asyncio
+import sqlite3
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from models.ai_model import AquariumLayout
+from services.canonical import canonical_layout, layout_cache_key
+from services.evaluation_cache import CacheState, EvaluationCache, evaluation_cache
+from services.aqua_service import evaluate_aquarium_layout, OpenRouterError
+from tests.test_openrouter_client import SAMPLE_AQUARIUM_LAYOUT, VALID_RESPONSE, completion
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCanonicalLayout:
+    def test_equivalent_layouts_share_a_key(self):
+        first = AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT)
+        second = AquariumLayout(**{
+            **SAMPLE_AQUARIUM_LAYOUT,
+            "owner_email": "someone@example.com",
+            "tank_name": "Another Tank",
+            "fish_data": [
+                {"name": "neon  tetra", "quantity": 2},
+                {"name": "NEON TETRA", "quantity": 4},
+            ],
+        })
+        assert layout_cache_key(first) == layout_cache_key(second)
+
+    def test_dimensions_are_normalized_to_centimetres(self):
+        layout = AquariumLayout(**{**SAMPLE_AQUARIUM_LAYOUT, "tank_length": 10, "unit": "inch"})
+        assert canonical_layout(layout)["dimensions_cm"][0] == 25.4
+
+        # The backend converts inches itself and sends fractional centimetres
+        inches = AquariumLayout(**{**SAMPLE_AQUARIUM_LAYOUT, "tank_length": 24, "unit": "inch"})
+        converted = AquariumLayout(**{
+            **SAMPLE_AQUARIUM_LAYOUT, "tank_length": 60.96, "tank_width": 76.2, "tank_height": 101.6,
+        })
+        assert layout_cache_key(inches) == layout_cache_key(converted)
+
+    def test_different_stock_changes_the_key(self):
+        first = AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT)
+        second = AquariumLayout(**{**SAMPLE_AQUARIUM_LAYOUT, "fish_data": [{"name": "Neon Tetra", "quantity": 7}]})
+        assert layout_cache_key(first) != layout_cache_key(second)
+
+
+@pytest.mark.asyncio
+class TestEvaluationCache:
+    async def test_lru_eviction(self):
+        cache = EvaluationCache(max_entries=2, ttl=60)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        await cache.get("a")
+        cache.set("c", "C")
+
+        assert (await cache.get("b")).state == CacheState.MISS
+        assert (await cache.get("a")).value == "A"
+        assert cache.evictions == 1
+
+    async def test_entry_ages_through_fresh_stale_and_expired(self):
+        clock = FakeClock()
+        cache = EvaluationCache(max_entries=10, ttl=10, stale_while_revalidate=10, stale_if_error=100, clock=clock)
+        cache.set("k", "value", cost_seconds=2.0)
+
+        assert (await cache.get("k")).state == CacheState.FRESH
+        clock.now += 15
+        assert (await cache.get("k")).state == CacheState.STALE
+        clock.now += 50
+        assert (await cache.get("k")).state == CacheState.EXPIRED
+        clock.now += 100
+        assert (await cache.get("k")).state == CacheState.MISS
+        assert cache.stats()["llm_seconds_saved"] == 4.0
+
+    async def test_disk_tier_survives_a_new_instance(self, tmp_path):
+        path = str(tmp_path / "evaluations.sqlite3")
+        cache = EvaluationCache(max_entries=10, ttl=60, disk_path=path)
+        cache.set("k", "persisted")
+        await cache.flush()
+
+        restarted = EvaluationCache(max_entries=10, ttl=60, disk_path=path)
+        lookup = await restarted.get("k")
+
+        assert lookup.state == CacheState.FRESH
+        assert lookup.value == "persisted"
+        assert restarted.disk_hits == 1
+
+    async def test_a_locked_disk_tier_does_not_block_the_event_loop(self, tmp_path):
+        path = str(tmp_path / "evaluations.sqlite3")
+        cache = EvaluationCache(max_entries=10, ttl=60, disk_path=path)
+        # Another worker holds the write lock: the disk write waits for the busy timeout
+        other = sqlite3.connect(path, timeout=0)
+        other.execute("BEGIN IMMEDIATE")
+        try:
+            cache._disk._conn.execute("PRAGMA busy_timeout = 500")
+            started = time.monotonic()
+            cache.set("k", "value")
+            ticks = 0
+            while cache._disk_writes:
+                await asyncio.sleep(0.01)
+                ticks += 1
+            # The loop kept running while the write waited for the lock
+            assert ticks >= 10
+            assert time.monotonic() - started >= 0.4
+        finally:
+            other.rollback()
+            other.close()
+        assert (await cache.get("k")).value == "value"
+
+
+@pytest.mark.asyncio
+class TestCachedEvaluation:
+    async def test_repeat_evaluation_is_served_from_cache(self):
+        create = AsyncMock(return_value=completion(VALID_RESPONSE))
+        with patch("services.openrouter_client.client.chat.completions.create", new=create):
+            first = await evaluate_aquarium_layout(AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT))
+            second = await evaluate_aquarium_layout(AquariumLayout(**{**SAMPLE_AQUARIUM_LAYOUT, "tank_name": "Other"}))
+
+        assert create.await_count == 1
+        assert first.response == second.response
+        assert evaluation_cache.hits == 1
+
+    async def test_fallback_responses_are_not_cached(self):
+        create = AsyncMock(return_value=completion("too short"))
+        with patch("services.openrouter_client.client.chat.completions.create", new=create):
+            await evaluate_aquarium_layout(AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT))
+            await evaluate_aquarium_layout(AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT))
+
+        assert create.await_count == 2
+
+    async def test_expired_entry_is_served_when_openrouter_fails(self):
+        layout = AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT)
+        key = layout_cache_key(layout)
+        evaluation_cache.set(key, VALID_RESPONSE)
+        evaluation_cache._entries[key].stored_at -= evaluation_cache.ttl + evaluation_cache.stale_while_revalidate + 1
+
+        with patch(
+            "services.openrouter_client.client.chat.completions.create",
+            new=AsyncMock(side_effect=RuntimeError("down")),
+        ):
+            result = await evaluate_aquarium_layout(layout)
+
+        assert result.response == VALID_RESPONSE
+        assert evaluation_cache.served_on_error == 1
+
+    async def test_error_without_cached_entry_is_raised(self):
+        with patch(
+            "services.openrouter_client.client.chat.completions.create",
+            new=AsyncMock(side_effect=RuntimeError("down")),
+        ):
+            with pytest.raises(OpenRouterError):
+                await evaluate_aquarium_layout(AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT))
@@ -0,0 +1,21 @@
+import logging
+import logging_config
+from logging_config import setup_logging, shutdown_logging
+
+
+def test_shutdown_closes_the_log_file(tmp_path):
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    log_file = tmp_path / "aquarium_ai.log"
+    try:
+        setup_logging(level="INFO", log_file=str(log_file))
+        files = [h for h in logging_config._listener.handlers if isinstance(h, logging.FileHandler)]
+        logging.getLogger("ai_service.test").info("evaluated tank")
+
+        shutdown_logging()
+
+        assert files and all(h.stream is None for h in files)
+        assert "evaluated tank" in log_file.read_text()
+    finally:
+        shutdown_logging()
+        root.handlers, root.level = saved_handlers, saved_level
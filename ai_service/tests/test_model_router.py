@@ -0,0 +1,145 @@
+import asyncio
+import json
+import time
+import httpx
+import openai
+import pytest
+from services.model_router import BreakerState, ModelRouter, NoHealthyModelError
+
+REQUEST = {"messages": [{"role": "user", "content": "Evaluate my tank"}], "max_tokens": 50}
+
+
+def openai_stub(behaviour: dict, calls: list) -> openai.AsyncOpenAI:
+    """
+    A local OpenAI-compatible endpoint.
+
+    ``behaviour`` maps a model name to ``{"delay": seconds, "status": code,
+    "text": content}``; every request is appended to ``calls``.
+    """
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        model = body["model"]
+        calls.append(model)
+        spec = behaviour[model]
+        await asyncio.sleep(spec.get("delay", 0))
+        if spec.get("status", 200) != 200:
+            return httpx.Response(spec["status"], json={"error": {"message": f"{model} unavailable"}})
+
+        text = spec.get("text", f"answer from {model}")
+        if body.get("stream"):
+            events = "".join(
+                "data: " + json.dumps({
+                    "id": "stub", "object": "chat.completion.chunk", "created": 0, "model": model,
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                }) + "\n\n"
+                for piece in text.split(" ")
+            )
+            return httpx.Response(
+                200, content=events + "data: [DONE]\n\n", headers={"content-type": "text/event-stream"}
+            )
+        return httpx.Response(200, json={
+            "id": "stub", "object": "chat.completion", "created": 0, "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        })
+
+    return openai.AsyncOpenAI(
+        api_key="test-key",
+        base_url="http://openrouter.stub/api/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        max_retries=0,
+    )
+
+
+@pytest.mark.asyncio
+class TestModelRouter:
+    async def test_fails_over_to_the_next_model(self):
+        calls = []
+        router = ModelRouter(["primary", "backup"], client=openai_stub({
+            "primary": {"status": 429},
+            "backup": {},
+        }, calls))
+
+        text, model = await router.complete(REQUEST)
+
+        assert (text, model) == ("answer from backup", "backup")
+        assert calls == ["primary", "backup"]
+        assert router.stats()["models"]["primary"]["failures"] == 1
+
+    async def test_open_circuit_stops_traffic_to_an_unhealthy_model(self):
+        calls = []
+        router = ModelRouter(["primary", "backup"], failure_threshold=2, client=openai_stub({
+            "primary": {"status": 500},
+            "backup": {},
+        }, calls))
+
+        for _ in range(4):
+            await router.complete(REQUEST)
+
+        assert calls.count("primary") == 2
+        assert router.models[0].state == BreakerState.OPEN
+
+    async def test_half_open_probe_closes_the_circuit(self):
+        now = [0.0]
+        behaviour = {"primary": {"status": 500}, "backup": {}}
+        router = ModelRouter(
+            ["primary", "backup"], failure_threshold=1, reset_seconds=30,
+            client=openai_stub(behaviour, []), clock=lambda: now[0],
+        )
+        await router.complete(REQUEST)
+        assert router.models[0].state == BreakerState.OPEN
+
+        now[0] += 31
+        behaviour["primary"] = {}
+        text, model = await router.complete(REQUEST)
+
+        assert model == "primary"
+        assert router.models[0].state == BreakerState.CLOSED
+
+    async def test_every_circuit_open_raises(self):
+        router = ModelRouter(["primary"], failure_threshold=1, client=openai_stub({"primary": {"status": 503}}, []))
+        with pytest.raises(openai.APIStatusError):
+            await router.complete(REQUEST)
+
+        with pytest.raises(NoHealthyModelError):
+            await router.complete(REQUEST)
+
+    async def test_slow_primary_is_hedged(self):
+        calls = []
+        router = ModelRouter(["primary", "backup"], hedging=True, hedge_delay=0.05, client=openai_stub({
+            "primary": {"delay": 1.0},
+            "backup": {},
+        }, calls))
+
+        started = time.monotonic()
+        text, model = await router.complete(REQUEST)
+
+        assert model == "backup"
+        assert text == "answerfrombackup"  # the stub streams one word per chunk
+        assert time.monotonic() - started < 0.5
+        assert router.stats()["hedges_won"] == 1
+        # The losing request was cancelled without counting against the primary
+        assert router.models[0].failures == 0
+
+    async def test_fast_primary_is_not_hedged(self):
+        calls = []
+        router = ModelRouter(["primary", "backup"], hedging=True, hedge_delay=0.5, client=openai_stub({
+            "primary": {},
+            "backup": {},
+        }, calls))
+
+        opened = await router.open_stream(REQUEST)
+        text = " ".join([delta async for delta in opened.deltas()])
+
+        assert text == "answer from primary"
+        assert calls == ["primary"]
+        assert router.stats()["hedges_started"] == 0
+
+    async def test_hedge_delay_follows_the_first_token_p95(self):
+        router = ModelRouter(["primary"], hedge_delay=3.0, hedge_min_samples=5, client=openai_stub({}, []))
+        health = router.models[0]
+        assert router.hedge_delay(health) == 3.0
+
+        for latency in [0.1, 0.2, 0.3, 0.4, 1.5]:
+            health.record_success(first_token=latency)
+
+        assert router.hedge_delay(health) == 1.5
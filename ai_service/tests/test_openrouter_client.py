@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from models.ai_model import AquariumLayout
+from services.openrouter_client import ConcurrencyGovernor
+from services.aqua_service import evaluate_aquarium_layout, OpenRouterError
+
+SAMPLE_AQUARIUM_LAYOUT = {
+    "owner_email": "user@example.com",
+    "tank_name": "My First Aquarium",
+    "tank_length": 60,
+    "tank_width": 30,
+    "tank_height": 40,
+    "water_type": "freshwater",
+    "fish_data": [{"name": "Neon Tetra", "quantity": 6}],
+}
+
+VALID_RESPONSE = "\n\n".join(
+    f"{header}\nDetailed assessment text for this section of the evaluation."
+    for header in [
+        "🔵 Tank Volume Assessment",
+        "🟡 Bioload Assessment",
+        "🟣 Fish Compatibility & Behavior",
+        "🟢 Schooling Requirements",
+        "✅ Recommendations",
+        "⭐ Overall Rating",
+    ]
+)
+
+
+def completion(content: str):
+    return Mock(choices=[Mock(message=Mock(content=content))])
+
+
+@pytest.mark.asyncio
+class TestConcurrencyGovernor:
+    async def test_limits_in_flight_calls(self):
+        governor = ConcurrencyGovernor(limit=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with governor:
+                peak = max(peak, governor.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert governor.completed == 6
+        assert governor.peak_waiting == 4
+        assert governor.stats()["queue_depth"] == 0
+
+    async def test_queue_timeout_rejects_waiters(self):
+        governor = ConcurrencyGovernor(limit=1, queue_timeout=0.01)
+        async with governor:
+            with pytest.raises(asyncio.TimeoutError):
+                async with governor:
+                    pass
+        assert governor.rejected == 1
+        assert governor.waiting == 0
+
+    async def test_rejects_invalid_limit(self):
+        with pytest.raises(ValueError):
+            ConcurrencyGovernor(limit=0)
+
+
+@pytest.mark.asyncio
+class TestAsyncEvaluation:
+    async def test_concurrent_evaluations_do_not_block_each_other(self):
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.05)
+            return completion(VALID_RESPONSE)
+
+        # Distinct stock per layout so every call really goes upstream
+        layouts = [
+            AquariumLayout(**{**SAMPLE_AQUARIUM_LAYOUT, "fish_data": [{"name": "Neon Tetra", "quantity": n}]})
+            for n in range(1, 6)
+        ]
+        with patch("services.openrouter_client.client.chat.completions.create", side_effect=slow_create):
+            started = asyncio.get_running_loop().time()
+            results = await asyncio.gather(*(evaluate_aquarium_layout(layout) for layout in layouts))
+            elapsed = asyncio.get_running_loop().time() - started
+
+        assert all(result.status == "success" for result in results)
+        assert elapsed < 0.2
+
+    async def test_upstream_error_maps_to_openrouter_error(self):
+        layout = AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT)
+        with patch(
+            "services.openrouter_client.client.chat.completions.create",
+            new=AsyncMock(side_effect=RuntimeError("boom")),
+        ):
+            with pytest.raises(OpenRouterError):
+                await evaluate_aquarium_layout(layout)
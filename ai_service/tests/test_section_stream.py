@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from models.ai_model import AquariumLayout
+from services.section_stream import SECTION_HEADERS, SectionStreamParser, split_sections
+from services.aqua_service import stream_aquarium_evaluation
+from services.evaluation_cache import evaluation_cache
+from services.openrouter_client import governor
+from tests.test_openrouter_client import SAMPLE_AQUARIUM_LAYOUT, VALID_RESPONSE
+
+
+def chunked(text: str, size: int = 7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def upstream_stream(text: str):
+    async def chunks():
+        for piece in chunked(text):
+            yield Mock(choices=[Mock(delta=Mock(content=piece))])
+    return AsyncMock(return_value=chunks())
+
+
+class TestSectionStreamParser:
+    def test_sections_complete_when_the_next_header_arrives(self):
+        parser = SectionStreamParser()
+        completed = []
+        for piece in chunked(VALID_RESPONSE, size=3):
+            completed.extend(parser.feed(piece))
+
+        # The last section is only known to be complete at the end of the stream
+        assert [header for header, _ in completed] == SECTION_HEADERS[:-1]
+        assert parser.finish()[0][0] == SECTION_HEADERS[-1]
+
+    def test_preamble_is_ignored(self):
+        sections = split_sections("Sure! Here is my evaluation.\n" + VALID_RESPONSE)
+        assert list(sections) == SECTION_HEADERS
+        assert not sections[SECTION_HEADERS[0]].startswith("Sure")
+
+
+@pytest.mark.asyncio
+class TestStreamingEvaluation:
+    async def test_valid_sections_stream_from_the_model_and_are_cached(self):
+        layout = AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT)
+        with patch("services.openrouter_client.client.chat.completions.create", new=upstream_stream(VALID_RESPONSE)):
+            events = [event async for event in stream_aquarium_evaluation(layout)]
+
+        assert [event["header"] for event in events] == SECTION_HEADERS
+        assert {event["source"] for event in events} == {"model"}
+        assert evaluation_cache.stores == 1
+
+    async def test_only_invalid_sections_use_the_fallback(self):
+        broken = VALID_RESPONSE.replace(
+            "🟡 Bioload Assessment\nDetailed assessment text for this section of the evaluation.",
+            "🟡 Bioload Assessment\nok",
+        )
+        layout = AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT)
+        with patch("services.openrouter_client.client.chat.completions.create", new=upstream_stream(broken)):
+            events = [event async for event in stream_aquarium_evaluation(layout)]
+
+        sources = {event["header"]: event["source"] for event in events}
+        assert sources.pop("🟡 Bioload Assessment") == "fallback"
+        assert set(sources.values()) == {"model"}
+        assert evaluation_cache.stores == 0
+
+    async def test_missing_sections_are_filled_in_at_the_end(self):
+        truncated = VALID_RESPONSE.split("✅ Recommendations")[0]
+        layout = AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT)
+        with patch("services.openrouter_client.client.chat.completions.create", new=upstream_stream(truncated)):
+            events = [event async for event in stream_aquarium_evaluation(layout)]
+
+        assert sorted(event["header"] for event in events) == sorted(SECTION_HEADERS)
+        assert [event["source"] for event in events[-2:]] == ["fallback", "fallback"]
+
+    async def test_a_slow_reader_does_not_hold_a_governor_slot(self):
+        layout = AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT)
+        with patch("services.openrouter_client.client.chat.completions.create", new=upstream_stream(VALID_RESPONSE)):
+            stream = stream_aquarium_evaluation(layout)
+            first = await anext(stream)
+            # The client stalls after one section; the upstream call still finishes
+            for _ in range(50):
+                if governor.in_flight == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert governor.in_flight == 0
+            rest = [event async for event in stream]
+
+        assert [event["header"] for event in [first, *rest]] == SECTION_HEADERS
+        assert evaluation_cache.stores == 1
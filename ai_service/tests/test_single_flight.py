@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from models.ai_model import AquariumLayout
+from services.single_flight import SingleFlight
+from services.aqua_service import evaluate_aquarium_layout, evaluation_flights
+from tests.test_openrouter_client import SAMPLE_AQUARIUM_LAYOUT, VALID_RESPONSE, completion
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flights.coalesced == 4
+        assert not flights.in_flight("key")
+
+    async def test_errors_are_shared_by_all_waiters(self):
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream failed")
+
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def test_cancelling_one_waiter_keeps_the_shared_call(self):
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flights.do("key", work))
+        second = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "done"
+        assert first.cancelled()
+
+    async def test_shared_call_is_cancelled_when_nobody_waits(self):
+        flights = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(flights.do("key", work))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert not flights.in_flight("key")
+
+    async def test_a_retry_right_after_cancelling_starts_a_new_call(self):
+        flights = SingleFlight()
+        started = asyncio.Event()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await asyncio.sleep(0.01)
+            return "done"
+
+        waiter = asyncio.create_task(flights.do("key", work))
+        await started.wait()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        # The cancelled call's done-callback has not run yet
+        assert await flights.do("key", work) == "done"
+        assert calls == 2
+        assert not flights.in_flight("key")
+
+
+@pytest.mark.asyncio
+class TestCoalescedEvaluation:
+    async def test_identical_requests_make_one_upstream_call(self):
+        calls = 0
+
+        async def slow_create(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return completion(VALID_RESPONSE)
+
+        coalesced_before = evaluation_flights.coalesced
+        with patch("services.openrouter_client.client.chat.completions.create", side_effect=slow_create):
+            results = await asyncio.gather(
+                *(evaluate_aquarium_layout(AquariumLayout(**SAMPLE_AQUARIUM_LAYOUT)) for _ in range(4))
+            )
+
+        assert calls == 1
+        assert {result.response for result in results} == {VALID_RESPONSE}
+        assert evaluation_flights.coalesced - coalesced_before == 3
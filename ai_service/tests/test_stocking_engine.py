@@ -0,0 +1,112 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from models.ai_model import AquariumLayout, EvaluationMode
+from services.stocking_engine import analyze_layout, render_report
+from services.aqua_service import evaluate_aquarium_layout, validate_response_format
+from services.section_stream import split_sections, validate_section
+from tests.test_openrouter_client import SAMPLE_AQUARIUM_LAYOUT, VALID_RESPONSE, completion
+
+
+def layout_with(fish, **overrides) -> AquariumLayout:
+    return AquariumLayout(**{
+        **SAMPLE_AQUARIUM_LAYOUT,
+        "fish_data": [{"name": name, "quantity": quantity} for name, quantity in fish],
+        **overrides,
+    })
+
+
+class TestStockingEngine:
+    def test_balanced_community_tank(self):
+        report = analyze_layout(layout_with([("Neon Tetra", 8), ("Corydoras Catfish", 6)]))
+
+        assert report.volume_liters == 72.0
+        assert report.incompatibilities == []
+        assert report.schooling_shortfalls == []
+        assert report.bioload_percent < 100
+        assert report.rating >= 8
+
+    def test_schooling_shortfall(self):
+        report = analyze_layout(layout_with([("Neon Tetra", 2)]))
+
+        assert report.schooling_shortfalls == [("Neon Tetra", 2, 6)]
+
+    def test_overstocking_lowers_the_rating(self):
+        light = analyze_layout(layout_with([("Neon Tetra", 6)]))
+        heavy = analyze_layout(layout_with([("Goldfish", 4)]))
+
+        assert heavy.bioload_percent > 100
+        assert heavy.rating < light.rating
+        assert ("Goldfish", 150) in heavy.undersized_for
+
+    @pytest.mark.parametrize("fish, fragment", [
+        ([("Betta Fish", 2)], "keep only one male"),
+        ([("Tiger Barb", 6), ("Guppy", 3)], "fin nippers"),
+        ([("Angelfish", 1), ("Neon Tetra", 6)], "may eat Neon Tetra"),
+        ([("Goldfish", 1), ("Platy", 3)], "cooler water"),
+        ([("Ocellaris Clownfish", 6)], "saltwater species"),
+    ])
+    def test_known_incompatibilities(self, fish, fragment):
+        report = analyze_layout(layout_with(fish))
+
+        assert any(fragment in issue for issue in report.incompatibilities)
+
+    def test_species_lookup_is_case_insensitive_and_merges_duplicates(self):
+        report = analyze_layout(layout_with([("neon  tetra", 3), ("Neon Tetra", 3)]))
+
+        assert report.total_fish == 6
+        assert report.schooling_shortfalls == []
+        assert report.unknown_species == []
+
+    def test_unknown_species_are_reported(self):
+        report = analyze_layout(layout_with([("Mystery Fish", 2)]))
+
+        assert report.unknown_species == ["Mystery Fish"]
+
+    def test_inch_dimensions_use_gallon_math(self):
+        report = analyze_layout(layout_with(
+            [("Neon Tetra", 6)], tank_length=24, tank_width=12, tank_height=16, unit="inch"
+        ))
+
+        assert report.volume_gallons == 19.9
+        assert report.volume_liters == 75.3
+
+    def test_rendered_report_has_every_section(self):
+        layout = layout_with([("Tiger Barb", 3), ("Guppy", 3)])
+        text = render_report(analyze_layout(layout), layout)
+
+        assert validate_response_format(text)
+        assert all(validate_section(header, body) for header, body in split_sections(text).items())
+
+
+@pytest.mark.asyncio
+class TestEvaluationModes:
+    async def test_fast_mode_never_calls_openrouter(self):
+        layout = layout_with([("Neon Tetra", 2)])
+        with patch("services.openrouter_client.client.chat.completions.create") as create:
+            result = await evaluate_aquarium_layout(layout, EvaluationMode.FAST)
+
+        create.assert_not_called()
+        assert validate_response_format(result.response)
+        assert "Add 4 more Neon Tetra" in result.response
+
+    async def test_hybrid_mode_sends_engine_facts(self):
+        layout = layout_with([("Neon Tetra", 2)])
+        with patch(
+            "services.openrouter_client.client.chat.completions.create", new=AsyncMock(return_value=completion(VALID_RESPONSE))
+        ) as create:
+            result = await evaluate_aquarium_layout(layout, EvaluationMode.HYBRID)
+
+        prompt = create.call_args.kwargs["messages"][1]["content"]
+        assert "Neon Tetra: 2 kept, needs a group of 6+" in prompt
+        assert result.response == VALID_RESPONSE
+
+    async def test_hybrid_and_llm_answers_are_cached_separately(self):
+        layout = layout_with([("Neon Tetra", 6)])
+        with patch(
+            "services.openrouter_client.client.chat.completions.create", new=AsyncMock(return_value=completion(VALID_RESPONSE))
+        ) as create:
+            await evaluate_aquarium_layout(layout, EvaluationMode.LLM)
+            await evaluate_aquarium_layout(layout, EvaluationMode.HYBRID)
+            await evaluate_aquarium_layout(layout, EvaluationMode.HYBRID)
+
+        assert create.call_count == 2
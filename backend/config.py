@@ -10,6 +10,47 @@ class Settings(BaseSettings):
     POSTGRES_USER: Optional[str] = None
     POSTGRES_PASSWORD: Optional[str] = None
     POSTGRES_DB: Optional[str] = None
+
+    # Connection pool (see db/engine_options.py)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables
+    DB_PGBOUNCER: bool = False  # behind PgBouncer in transaction mode
+    DB_POOL_PREWARM: int = 2  # connections opened at startup
+
+    # Schema migrations (see db/migrate.py); normally run once per deploy, not by every process
+    DB_AUTO_MIGRATE: bool = False
+
+    # Per-request SQL instrumentation (see db/instrumentation.py)
+    DB_INSTRUMENTATION_ENABLED: bool = True
+    DB_SLOW_QUERY_MS: float = 200.0  # statements at least this slow go to the backend.db.slow_queries log
+    DB_N_PLUS_ONE_THRESHOLD: int = 5  # identical statements per request before it is flagged
+
+    # List endpoints (cursor pagination, see repositories/pagination.py)
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+
+    # Name search (pg_trgm on PostgreSQL, see repositories/search.py)
+    SEARCH_LIMIT_DEFAULT: int = 20
+    SEARCH_LIMIT_MAX: int = 100
+
+    # Layout statistics counters (see repositories/layout_stats_repository.py)
+    STATS_CACHE_SECONDS: float = 5.0  # /aquariums/stats responses are reused this long
+    STATS_RECONCILE_INTERVAL: float = 0.0  # seconds between recounts in each API process; 0 leaves it to a scheduled job
+
+    # In-process fish catalog (see services/fish_catalog.py)
+    FISH_CATALOG_CHECK_SECONDS: float = 5.0  # how often each process compares catalog_versions; 0 checks on every read
+
+    # Cache-Control of ETagged GETs (see routes/conditional.py)
+    CACHE_CONTROL_PRIVATE: str = "private, no-cache"  # layouts and maintenance: stored by the browser, revalidated on every use
+    CACHE_CONTROL_CATALOG: str = "public, max-age=5"  # fish catalog: as fresh as the per-process snapshot
+
+    # Serialized responses of hot list endpoints (see services/response_cache.py)
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # total body size per process before LRU eviction; 0 disables
+    RESPONSE_CACHE_TTL_SECONDS: float = 5.0  # bounds staleness from writes made by other processes
     
     # Security
     SECRET_KEY: str
@@ -26,10 +67,40 @@ class Settings(BaseSettings):
     
     # OpenRouter (for AI service integration)
     OPENROUTER_API_KEY: Optional[str] = None
+
+    # AI service (docker-compose name by default)
+    AI_SERVICE_URL: str = "http://ai-service:8001"
+
+    # Shared outbound HTTP client (AI service, Google OAuth)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CLIENT_HTTP2: bool = False  # needs the h2 package (httpx[http2])
+    HTTP_CLIENT_TIMEOUT: float = 30.0
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5.0
+    HTTP_CLIENT_RETRIES: int = 2
+    HTTP_CLIENT_RETRY_BACKOFF: float = 0.2  # seconds, doubled per attempt (with full jitter)
+    HTTP_CLIENT_RETRY_BACKOFF_MAX: float = 2.0
+
+    # Asynchronous evaluation jobs (evaluation_jobs table)
+    EVALUATION_JOB_WORKERS: int = 1  # worker tasks inside each API process; 0 to rely on separate workers
+    EVALUATION_JOB_LEASE_SECONDS: float = 120.0  # a job is reclaimed if its worker is silent this long
+    EVALUATION_JOB_POLL_INTERVAL: float = 1.0
+    EVALUATION_JOB_MAX_ATTEMPTS: int = 3
+    EVALUATION_JOB_RETRY_DELAY: float = 5.0  # seconds, doubled per failed attempt
     
     # Debug
     DEBUG: bool = False
 
+    # Logging (see logging_config.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    LOG_LEVELS: str = ""  # per-logger overrides, e.g. "backend.routes=DEBUG,sqlalchemy.engine=INFO"
+    LOG_DEBUG_SAMPLE_RATE: float = 0.01  # fraction of DEBUG records kept
+    LOG_PAYLOADS: bool = False  # log request/response bodies (at DEBUG)
+    LOG_FILES: str = ""  # extra files per logger, e.g. "backend.db.slow_queries=/var/log/slow_queries.log"
+    DB_ECHO: bool = False  # log every SQL statement
+
     class Config:
         env_file = ".env"
 
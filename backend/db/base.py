@@ -1,3 +1,9 @@
+from sqlalchemy import DDL, event
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+# Trigram operator classes for the name search indexes (PostgreSQL only)
+event.listen(
+    Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
@@ -1,18 +1,85 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import logging
+import threading
+from typing import Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
 from backend.config import settings
-from backend.db.base import Base
+from backend.db.engine_options import engine_options
+from backend.db.instrumentation import instrument_engine
 
 # ✅ Import model(s) so SQLAlchemy sees them
+from backend.models import (  # noqa: F401
+    user_model, fish_model, aqualayout_model, tank_maintain_model, evaluation_job_model, aquarium_evaluation_model,
+    layout_fish_model, layout_stats_model,
+)
 
-# Create the engine
-engine = create_engine(settings.DATABASE_URL, echo=True)
+logger = logging.getLogger(__name__)
 
-# Create the tables
-Base.metadata.create_all(bind=engine)
+# Created on first use: importing this module opens no connections and changes no schema.
+# Tables are created by migrations (python -m backend.db.migrate), run once per deploy.
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_lock = threading.Lock()
 
-# Create a session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_engine() -> Engine:
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+                if settings.DB_INSTRUMENTATION_ENABLED:
+                    instrument_engine(engine)
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+
+def SessionLocal() -> Session:
+    get_engine()
+    return _session_factory()
+
+
+def prewarm_pool(connections: int) -> None:
+    """Open ``connections`` pooled connections now, so the first requests don't pay for the handshakes."""
+    engine = get_engine()
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in opened:
+            connection.close()  # back to the pool, still open
+
+
+def init_database() -> None:
+    """Startup hook: create the engine, check the schema version and warm the pool."""
+    from backend.db.migrate import pending_migrations, run_migrations
+
+    engine = get_engine()
+    if settings.DB_AUTO_MIGRATE:
+        run_migrations(engine)
+    else:
+        pending = pending_migrations(engine)
+        if pending:
+            logger.warning(
+                "Database schema is behind: %d pending migration(s), starting with %04d_%s. "
+                "Run `python -m backend.db.migrate`.",
+                len(pending), pending[0].version, pending[0].name,
+            )
+    prewarm_pool(settings.DB_POOL_PREWARM)
+
+
+def dispose_engine() -> None:
+    """Close pooled connections (called on shutdown)."""
+    global _engine, _session_factory
+    with _lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine, _session_factory = None, None
 
 
 
@@ -0,0 +1,31 @@
+from sqlalchemy.pool import NullPool
+from backend.config import settings
+
+
+def engine_options(url: str) -> dict:
+    """
+    Keyword arguments for create_engine, from settings.
+
+    In PgBouncer mode (transaction pooling) PgBouncer owns the pool: the
+    engine opens a connection per checkout (NullPool), and the statement
+    timeout is left to the database role because PgBouncer rejects unknown
+    startup parameters.
+    """
+    options = {"echo": settings.DB_ECHO}
+    if url.startswith("sqlite"):
+        # SQLite uses its own pool classes; sizing and timeouts do not apply
+        return options
+
+    if settings.DB_PGBOUNCER:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
@@ -0,0 +1,204 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+# Dedicated loggers, so slow queries and N+1 warnings can be routed to their own file (LOG_FILES)
+slow_query_logger = logging.getLogger("backend.db.slow_queries")
+n_plus_one_logger = logging.getLogger("backend.db.n_plus_one")
+
+
+@dataclass
+class QueryStats:
+    """Statements issued while handling one request (or one tracked block)."""
+
+    route: str = ""
+    count: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: Optional[str] = None
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.statements[statement] += 1
+        if duration > self.slowest_time:
+            self.slowest_time, self.slowest_statement = duration, statement
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Identical statements issued at least ``threshold`` times: likely N+1 loops."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_time * 1000
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Totals per route since startup, served by /api/metrics/db
+route_totals: Dict[str, dict] = {}
+
+
+def parameter_shape(parameters):
+    """Describe bound parameters by type only, never by value."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: the shape of one row and how many there were
+            return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is discarded with the statement even when it fails
+    if context is not None:
+        context._instrumentation_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_instrumentation_started", None)
+    if started is None:
+        return
+    duration = time.perf_counter() - started
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, duration)
+
+    if duration * 1000 >= settings.DB_SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms) in %s: %s",
+            duration * 1000,
+            stats.route if stats is not None and stats.route else "background",
+            " ".join(statement.split()),
+            extra={"duration_ms": round(duration * 1000, 1), "parameters": parameter_shape(parameters)},
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement run on ``engine``."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries(route: str = "") -> Iterator[QueryStats]:
+    """Attribute statements run inside the block (including in threads it starts) to one QueryStats."""
+    stats = QueryStats(route=route)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def finish_request(stats: QueryStats) -> None:
+    """Flag likely N+1 patterns and add the request to the per-route totals."""
+    for statement, count in stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD):
+        n_plus_one_logger.warning(
+            "Possible N+1 in %s: statement ran %d times: %s",
+            stats.route, count, " ".join(statement.split()),
+            extra={"route": stats.route, "repeats": count},
+        )
+
+    totals = route_totals.setdefault(stats.route, {
+        "requests": 0, "queries": 0, "db_time_ms": 0.0, "max_queries": 0,
+        "slowest_ms": 0.0, "slowest_statement": None,
+    })
+    totals["requests"] += 1
+    totals["queries"] += stats.count
+    totals["db_time_ms"] += stats.total_ms
+    totals["max_queries"] = max(totals["max_queries"], stats.count)
+    if stats.slowest_time * 1000 > totals["slowest_ms"]:
+        totals["slowest_ms"] = stats.slowest_time * 1000
+        totals["slowest_statement"] = " ".join(stats.slowest_statement.split())
+
+
+def route_summary() -> Dict[str, dict]:
+    """Per-route query counts and DB time since startup, busiest first."""
+    summary = {}
+    for route, totals in sorted(route_totals.items(), key=lambda item: -item[1]["db_time_ms"]):
+        requests = totals["requests"] or 1
+        summary[route] = {
+            **totals,
+            "db_time_ms": round(totals["db_time_ms"], 1),
+            "slowest_ms": round(totals["slowest_ms"], 1),
+            "avg_queries": round(totals["queries"] / requests, 2),
+            "avg_db_time_ms": round(totals["db_time_ms"] / requests, 2),
+        }
+    return summary
+
+
+def _route_name(scope, unmatched: str = None) -> str:
+    """``METHOD /path/{template}`` once routed; before that the raw path (or ``unmatched``)."""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or unmatched or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class QueryStatsMiddleware:
+    """
+    Track the statements of every HTTP request.
+
+    Responses carry the count and DB time so far (``X-DB-Query-Count`` and a
+    ``Server-Timing`` ``db`` entry); queries issued while a streaming body is
+    sent still count toward the route's totals.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Query-Count", str(stats.count))
+                headers.append("Server-Timing", f"db;dur={stats.total_ms:.1f}")
+            await send(message)
+
+        with track_queries(_route_name(scope)) as stats:
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                # Unrouted paths (404s) share one entry so the totals stay bounded
+                stats.route = _route_name(scope, unmatched="<unmatched>")
+                finish_request(stats)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, label: str = "block") -> Iterator[QueryStats]:
+    """
+    Test helper: fail if the block issues more than ``max_queries`` statements.
+
+    Example:
+        with query_budget(3, "TankMaintenanceService.create"):
+            TankMaintenanceService(db).create(entry)
+
+    For whole endpoints, read the ``X-DB-Query-Count`` response header.
+    """
+    with track_queries(label) as stats:
+        yield stats
+    if stats.count > max_queries:
+        issued = "\n".join(f"  {count}x {' '.join(sql.split())}" for sql, count in stats.statements.most_common())
+        raise QueryBudgetExceeded(f"{label} issued {stats.count} queries, budget is {max_queries}:\n{issued}")
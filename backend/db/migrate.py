@@ -0,0 +1,171 @@
+"""
+Schema Migrations
+
+Applies the versioned migrations in backend/db/migrations in order and
+records each one in the schema_migrations table. Every migration runs in its
+own transaction; on PostgreSQL an advisory lock keeps concurrent runners
+(several containers starting at once) from applying the same one twice.
+
+A migration module defines ``upgrade(connection)``. Modules that set
+``transactional = False`` run in autocommit mode instead, which PostgreSQL
+requires for CREATE INDEX CONCURRENTLY; they must be safe to re-run, since a
+failure part-way leaves the earlier statements applied.
+
+Usage (from project root, once per deploy):
+    python -m backend.db.migrate                 # apply everything pending
+    python -m backend.db.migrate --status        # list applied and pending
+    python -m backend.db.migrate --wait 30       # retry the connection while the database starts
+"""
+
+import argparse
+import importlib
+import logging
+import pkgutil
+import re
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Set
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = "backend.db.migrations"
+MIGRATION_NAME = re.compile(r"^(\d{4})_(\w+)$")
+
+# Arbitrary key for pg_advisory_lock, shared by every migration runner
+ADVISORY_LOCK_KEY = 74_211_001
+
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    module: str
+
+    def upgrade(self, connection) -> None:
+        importlib.import_module(self.module).upgrade(connection)
+
+    @property
+    def transactional(self) -> bool:
+        return getattr(importlib.import_module(self.module), "transactional", True)
+
+
+def discover() -> List[Migration]:
+    """All migrations in the package, ordered by version."""
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    migrations = []
+    for module in pkgutil.iter_modules(package.__path__):
+        match = MIGRATION_NAME.match(module.name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), f"{MIGRATIONS_PACKAGE}.{module.name}"))
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {MIGRATIONS_PACKAGE}: {versions}")
+    return migrations
+
+
+def applied_versions(engine: Engine) -> Set[int]:
+    with engine.begin() as connection:
+        schema_migrations.create(connection, checkfirst=True)
+        return set(connection.scalars(select(schema_migrations.c.version)))
+
+
+def pending_migrations(engine: Engine) -> List[Migration]:
+    applied = applied_versions(engine)
+    return [migration for migration in discover() if migration.version not in applied]
+
+
+def _record(connection, migration: Migration) -> None:
+    connection.execute(insert(schema_migrations).values(version=migration.version, name=migration.name))
+
+
+def run_migrations(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations up to ``target`` (all by default).
+
+    Returns:
+        The migrations that were applied by this call
+    """
+    postgres = engine.dialect.name == "postgresql"
+    applied = []
+    with engine.connect() as lock:
+        if postgres:
+            lock.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        try:
+            # Read after taking the lock, so a runner that waited sees what the other one applied
+            for migration in pending_migrations(engine):
+                if target is not None and migration.version > target:
+                    break
+                started = time.perf_counter()
+                if migration.transactional:
+                    with engine.begin() as connection:
+                        migration.upgrade(connection)
+                        _record(connection, migration)
+                else:
+                    with engine.connect() as connection:
+                        migration.upgrade(connection.execution_options(isolation_level="AUTOCOMMIT"))
+                    with engine.begin() as connection:
+                        _record(connection, migration)
+                logger.info(
+                    f"Applied migration {migration.version:04d}_{migration.name} "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+                applied.append(migration)
+        finally:
+            if postgres:
+                lock.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+    return applied
+
+
+def wait_for_database(engine: Engine, timeout: float) -> None:
+    """Retry connecting until the database accepts connections or ``timeout`` passes."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            return
+        except OperationalError:
+            if time.monotonic() >= deadline:
+                raise
+            logger.info("Database not ready, retrying")
+            time.sleep(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--status", action="store_true", help="list applied and pending migrations")
+    parser.add_argument("--target", type=int, help="stop after this version")
+    parser.add_argument("--wait", type=float, default=0.0, help="seconds to wait for the database")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    from backend.db.db import get_engine
+    engine = get_engine()
+    if args.wait:
+        wait_for_database(engine, args.wait)
+
+    if args.status:
+        applied = applied_versions(engine)
+        for migration in discover():
+            state = "applied" if migration.version in applied else "pending"
+            print(f"{migration.version:04d}_{migration.name:<40} {state}")
+        return
+
+    applied = run_migrations(engine, target=args.target)
+    print(f"Applied {len(applied)} migration(s)" if applied else "Schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Tables as they existed before migrations (previously made by create_all)."""
+
+from sqlalchemy import (
+    JSON, Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text, func,
+)
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("first_name", String, nullable=False),
+    Column("last_name", String, nullable=False),
+    Column("email", String, unique=True, nullable=False),
+    Column("birthdate", Date, nullable=True),
+    Column("password", String, nullable=False),
+    Column("role", String, nullable=False),
+)
+
+Table(
+    "fish_catalog", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String, nullable=False, unique=True),
+    Column("image_url", String, nullable=True),
+    Column("water_type", String, nullable=False),
+)
+
+Table(
+    "aquarium_layouts", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("owner_email", String, ForeignKey("users.email"), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("tank_name", String, nullable=False),
+    Column("tank_length", Float, nullable=False),
+    Column("tank_width", Float, nullable=False),
+    Column("tank_height", Float, nullable=False),
+    Column("water_type", String, nullable=False),
+    Column("fish_data", JSON, nullable=False),
+    Column("comments", String, nullable=True),
+)
+
+Table(
+    "tank_maintenance", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("layout_id", Integer, ForeignKey("aquarium_layouts.id"), nullable=False),
+    Column("owner_email", String, ForeignKey("users.email"), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("maintenance_date", DateTime(timezone=True), nullable=False),
+    Column("maintenance_type", String, nullable=False),
+    Column("description", Text, nullable=True),
+    Column("notes", Text, nullable=True),
+    Column("completed", Integer),
+)
+
+Table(
+    "evaluation_jobs", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("status", String, nullable=False),
+    Column("payload", JSON, nullable=False),
+    Column("result", JSON, nullable=True),
+    Column("error", Text, nullable=True),
+    Column("attempts", Integer, nullable=False),
+    Column("max_attempts", Integer, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("available_at", DateTime(timezone=True), nullable=False),
+    Column("started_at", DateTime(timezone=True), nullable=True),
+    Column("finished_at", DateTime(timezone=True), nullable=True),
+    Column("locked_by", String, nullable=True),
+    Column("locked_until", DateTime(timezone=True), nullable=True),
+    Index("ix_evaluation_jobs_status_available_at", "status", "available_at"),
+)
+
+Table(
+    "aquarium_evaluations", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("layout_id", Integer, ForeignKey("aquarium_layouts.id"), nullable=False, unique=True, index=True),
+    Column("content_hash", String(64), nullable=False),
+    Column("model", String, nullable=True),
+    Column("latency_ms", Integer, nullable=True),
+    Column("response", Text, nullable=False),
+    Column("stale", Boolean, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def upgrade(connection):
+    # Existing databases already have some or all of these tables
+    metadata.create_all(connection, checkfirst=True)
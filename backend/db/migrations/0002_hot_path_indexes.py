@@ -0,0 +1,73 @@
+"""Indexes for the hot filters and orderings, and jsonb fish_data with a GIN index (PostgreSQL).
+
+Runs outside a transaction so PostgreSQL can build the indexes CONCURRENTLY,
+without blocking writes. If a concurrent build fails it leaves an INVALID
+index behind: drop it and run the migration again.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, MetaData, String, Table, func, inspect, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.schema import CreateIndex
+
+transactional = False
+
+metadata = MetaData()
+
+users = Table(
+    "users", metadata,
+    Column("email", String),
+)
+
+aquarium_layouts = Table(
+    "aquarium_layouts", metadata,
+    Column("owner_email", String),
+    Column("created_at", DateTime(timezone=True)),
+    Column("fish_data", JSON),
+)
+
+tank_maintenance = Table(
+    "tank_maintenance", metadata,
+    Column("layout_id", Integer),
+    Column("owner_email", String),
+    Column("maintenance_date", DateTime(timezone=True)),
+)
+
+# postgresql_concurrently is ignored by other databases
+INDEXES = [
+    Index("ix_users_email_lower", func.lower(users.c.email), postgresql_concurrently=True),
+    Index(
+        "ix_aquarium_layouts_owner_email_created_at",
+        aquarium_layouts.c.owner_email, aquarium_layouts.c.created_at.desc(), postgresql_concurrently=True,
+    ),
+    Index("ix_aquarium_layouts_created_at", aquarium_layouts.c.created_at, postgresql_concurrently=True),
+    Index(
+        "ix_tank_maintenance_layout_id_maintenance_date",
+        tank_maintenance.c.layout_id, tank_maintenance.c.maintenance_date, postgresql_concurrently=True,
+    ),
+    Index(
+        "ix_tank_maintenance_owner_email_maintenance_date",
+        tank_maintenance.c.owner_email, tank_maintenance.c.maintenance_date, postgresql_concurrently=True,
+    ),
+]
+
+POSTGRES_INDEXES = [
+    Index(
+        "ix_aquarium_layouts_fish_data", aquarium_layouts.c.fish_data,
+        postgresql_using="gin", postgresql_ops={"fish_data": "jsonb_path_ops"}, postgresql_concurrently=True,
+    ),
+]
+
+
+def upgrade(connection):
+    postgres = connection.dialect.name == "postgresql"
+    indexes = INDEXES
+    if postgres:
+        columns = {column["name"]: column["type"] for column in inspect(connection).get_columns("aquarium_layouts")}
+        if not isinstance(columns["fish_data"], JSONB):
+            # Rewrites the table under an exclusive lock; jsonb is needed for @> and the GIN index
+            connection.execute(text("ALTER TABLE aquarium_layouts ALTER COLUMN fish_data TYPE jsonb USING fish_data::jsonb"))
+        indexes = INDEXES + POSTGRES_INDEXES
+
+    for index in indexes:
+        # IF NOT EXISTS rather than checkfirst: expression indexes are not reflected everywhere
+        connection.execute(CreateIndex(index, if_not_exists=True))
@@ -0,0 +1,24 @@
+"""layout_fish: the catalog species stocked in each layout, normalized from aquarium_layouts.fish_data.
+
+Existing layouts are filled in by backend/scripts/backfill_layout_fish.py.
+"""
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, Table
+
+metadata = MetaData()
+
+# Referenced tables, for the foreign keys only
+Table("aquarium_layouts", metadata, Column("id", Integer, primary_key=True))
+Table("fish_catalog", metadata, Column("id", Integer, primary_key=True))
+
+layout_fish = Table(
+    "layout_fish", metadata,
+    Column("layout_id", Integer, ForeignKey("aquarium_layouts.id", ondelete="CASCADE"), primary_key=True),
+    Column("fish_id", Integer, ForeignKey("fish_catalog.id", ondelete="CASCADE"), primary_key=True),
+    Column("quantity", Integer, nullable=False),
+    Index("ix_layout_fish_fish_id_layout_id", "fish_id", "layout_id"),
+)
+
+
+def upgrade(connection):
+    layout_fish.create(connection, checkfirst=True)
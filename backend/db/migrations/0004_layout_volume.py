@@ -0,0 +1,39 @@
+"""aquarium_layouts.volume_liters: tank volume computed by the database from the dimensions (cm), indexed.
+
+PostgreSQL stores the generated column, which rewrites the table under an
+exclusive lock once. SQLite cannot add a stored generated column to an
+existing table, so there it is virtual (computed on read, stored in the index).
+The index is built CONCURRENTLY on PostgreSQL, hence autocommit; every step
+checks what already exists, so the migration can be re-run.
+"""
+
+from sqlalchemy import Column, Float, Index, MetaData, String, Table, inspect, text
+from sqlalchemy.schema import CreateIndex
+
+transactional = False
+
+VOLUME_LITERS_SQL = "tank_length * tank_width * tank_height / 1000.0"
+
+metadata = MetaData()
+
+aquarium_layouts = Table(
+    "aquarium_layouts", metadata,
+    Column("volume_liters", Float),
+    Column("water_type", String),
+)
+
+INDEX = Index(
+    "ix_aquarium_layouts_volume_liters_water_type",
+    aquarium_layouts.c.volume_liters, aquarium_layouts.c.water_type, postgresql_concurrently=True,
+)
+
+
+def upgrade(connection):
+    columns = {column["name"] for column in inspect(connection).get_columns("aquarium_layouts")}
+    if "volume_liters" not in columns:
+        storage = "STORED" if connection.dialect.name == "postgresql" else "VIRTUAL"
+        connection.execute(text(
+            f"ALTER TABLE aquarium_layouts ADD COLUMN volume_liters FLOAT "
+            f"GENERATED ALWAYS AS ({VOLUME_LITERS_SQL}) {storage}"
+        ))
+    connection.execute(CreateIndex(INDEX, if_not_exists=True))
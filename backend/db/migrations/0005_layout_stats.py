@@ -0,0 +1,21 @@
+"""layout_stats: counters over aquarium_layouts (totals, per water type, per owner, per species).
+
+The counters start empty. The API fills them on startup when layouts exist
+but no counter does, or run backend/scripts/reconcile_layout_stats.py.
+"""
+
+from sqlalchemy import BigInteger, Column, Index, MetaData, String, Table
+
+metadata = MetaData()
+
+layout_stats = Table(
+    "layout_stats", metadata,
+    Column("scope", String, primary_key=True),
+    Column("key", String, primary_key=True),
+    Column("value", BigInteger, nullable=False),
+    Index("ix_layout_stats_scope_value", "scope", "value"),
+)
+
+
+def upgrade(connection):
+    layout_stats.create(connection, checkfirst=True)
@@ -0,0 +1,36 @@
+"""pg_trgm GIN indexes for substring search on fish_catalog.name and aquarium_layouts.tank_name (PostgreSQL).
+
+Needs permission to CREATE EXTENSION pg_trgm (or the extension installed
+beforehand). Indexes are built CONCURRENTLY, so this runs in autocommit
+mode and can be re-run. Other databases search through an in-process
+n-gram index instead and need nothing here.
+"""
+
+from sqlalchemy import Column, Index, MetaData, String, Table, text
+from sqlalchemy.schema import CreateIndex
+
+transactional = False
+
+metadata = MetaData()
+
+fish_catalog = Table("fish_catalog", metadata, Column("name", String))
+aquarium_layouts = Table("aquarium_layouts", metadata, Column("tank_name", String))
+
+INDEXES = [
+    Index(
+        "ix_fish_catalog_name_trgm", fish_catalog.c.name,
+        postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}, postgresql_concurrently=True,
+    ),
+    Index(
+        "ix_aquarium_layouts_tank_name_trgm", aquarium_layouts.c.tank_name,
+        postgresql_using="gin", postgresql_ops={"tank_name": "gin_trgm_ops"}, postgresql_concurrently=True,
+    ),
+]
+
+
+def upgrade(connection):
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for index in INDEXES:
+        connection.execute(CreateIndex(index, if_not_exists=True))
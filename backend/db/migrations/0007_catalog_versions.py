@@ -0,0 +1,18 @@
+"""catalog_versions: a version number per in-memory catalog, bumped on every write to it.
+
+Starts empty; the first fish_catalog write through the ORM inserts version 1.
+"""
+
+from sqlalchemy import BigInteger, Column, MetaData, String, Table
+
+metadata = MetaData()
+
+catalog_versions = Table(
+    "catalog_versions", metadata,
+    Column("name", String, primary_key=True),
+    Column("version", BigInteger, nullable=False),
+)
+
+
+def upgrade(connection):
+    catalog_versions.create(connection, checkfirst=True)
@@ -0,0 +1,16 @@
+"""aquarium_layouts.version, tank_maintenance.version: row versions for ETags.
+
+Every ORM UPDATE increments them. Existing rows start at 1; adding a column
+with a constant default does not rewrite the table on PostgreSQL 11+.
+"""
+
+from sqlalchemy import inspect, text
+
+TABLES = ("aquarium_layouts", "tank_maintenance")
+
+
+def upgrade(connection):
+    for table in TABLES:
+        columns = {column["name"] for column in inspect(connection).get_columns(table)}
+        if "version" not in columns:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
@@ -0,0 +1,11 @@
+"""layout_stats: drop the per-species counters.
+
+Tanks and fish per species are read from layout_fish (0003), which keeps
+them in the same transaction as the layout and answers from its index.
+"""
+
+from sqlalchemy import text
+
+
+def upgrade(connection):
+    connection.execute(text("DELETE FROM layout_stats WHERE scope IN ('species_tanks', 'species_quantity')"))
@@ -0,0 +1,7 @@
+"""
+Versioned schema migrations, applied in order by ``python -m backend.db.migrate``.
+
+Each module is named ``NNNN_description.py`` and defines
+``upgrade(connection)``. Never edit a migration that has been released; add
+a new one instead.
+"""
@@ -0,0 +1,165 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Libraries that are far too chatty below WARNING; LOG_LEVELS can override them
+DEFAULT_LOGGER_LEVELS = {
+    "sqlalchemy.engine": "WARNING",
+    "httpx": "WARNING",
+    "httpcore": "WARNING",
+    "passlib": "WARNING",
+}
+
+# Attributes every LogRecord has; anything else was passed with ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_payloads_enabled = False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != "sample":
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DebugSampler(logging.Filter):
+    """Let through a fraction of DEBUG records; everything at INFO and above passes."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or not getattr(record, "sample", True):
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hand records to the listener with as little work as possible on the caller's thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Resolve the message now: args may be mutated after the call returns
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_logger_levels(value: str) -> Dict[str, str]:
+    """Parse ``"name=LEVEL,other=LEVEL"`` into a dict."""
+    levels = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def parse_logger_files(value: str) -> Dict[str, str]:
+    """Parse ``"name=path,other=path"`` into a dict."""
+    files = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            name, path = item.split("=", 1)
+            files[name.strip()] = path.strip()
+    return files
+
+
+def setup_logging(
+    level: str = "INFO",
+    fmt: str = "json",
+    logger_levels: str = "",
+    debug_sample_rate: float = 1.0,
+    log_payloads: bool = False,
+    logger_files: str = "",
+) -> None:
+    """
+    Route all logging through a queue to a background listener thread.
+
+    Callers only enqueue records; formatting and writing to stdout happen on
+    the listener thread, so request latency does not include log I/O.
+    ``logger_files`` (``"name=path,..."``) also copies a logger's records to
+    its own file. Calling it again replaces the previous configuration.
+    """
+    global _listener, _payloads_enabled
+    shutdown_logging()
+
+    formatter = (
+        JsonFormatter() if fmt == "json"
+        else logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    outputs = [logging.StreamHandler(sys.stdout)]
+    for name, path in parse_logger_files(logger_files).items():
+        file_output = logging.FileHandler(path)
+        file_output.addFilter(logging.Filter(name))
+        outputs.append(file_output)
+    for output in outputs:
+        output.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(DebugSampler(debug_sample_rate))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level.upper())
+
+    for name, logger_level in {**DEFAULT_LOGGER_LEVELS, **parse_logger_levels(logger_levels)}.items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    # uvicorn installs its own synchronous handlers; send its records through the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+    _payloads_enabled = log_payloads
+    _listener = logging.handlers.QueueListener(log_queue, *outputs, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            if isinstance(handler, logging.FileHandler):
+                handler.close()
+        _listener = None
+
+
+def log_payload(logger: logging.Logger, label: str, payload) -> None:
+    """Log a request or response body at DEBUG, only when payload logging is enabled."""
+    if _payloads_enabled and logger.isEnabledFor(logging.DEBUG):
+        # Payloads are opted into explicitly, so they are never sampled away
+        logger.debug("%s: %s", label, payload, extra={"sample": False})
+
+
+atexit.register(shutdown_logging)
@@ -1,12 +1,75 @@
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from backend.config import settings
+from backend.logging_config import setup_logging, shutdown_logging
+
+# Configure logging before anything else logs
+setup_logging(
+    level=settings.LOG_LEVEL,
+    fmt=settings.LOG_FORMAT,
+    logger_levels=settings.LOG_LEVELS,
+    debug_sample_rate=settings.LOG_DEBUG_SAMPLE_RATE,
+    log_payloads=settings.LOG_PAYLOADS,
+    logger_files=settings.LOG_FILES,
+)
+
 from backend.routes import user_routes, fish_routes, aquarium_routes, ai_routes, tank_maintain_routes
+from backend.services.http_client import close_http_client, pool_stats, start_http_client
+from backend.services.evaluation_job_service import start_in_process_workers, stop_in_process_workers
+from backend.services.layout_stats_service import start_stats_reconciler, stop_stats_reconciler
+from backend.db.db import SessionLocal, dispose_engine, init_database
+from backend.db.instrumentation import QueryStatsMiddleware, route_summary
+from backend.routes.pagination import NEXT_CURSOR_HEADER
+from backend.services.aquarium_service import AquariumService
+from backend.services.fish_service import FishService
+from backend.services.response_cache import RESPONSE_CACHE
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 
 app = FastAPI()
 
+
+def warm_caches():
+    """Configure mappers, load the fish catalog snapshot and compile the hottest reads once, so the first requests skip that work."""
+    configure_mappers()
+    db = SessionLocal()
+    try:
+        FishService(db).get_all()
+        AquariumService(db).get_by_id(0)
+    except SQLAlchemyError as e:
+        # A schema that is behind was already reported; serve anyway
+        logger.warning(f"Skipped cache warm-up: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+async def startup_event():
+    # Engine, schema check and warm connections before the first request, not during it
+    await run_in_threadpool(init_database)
+    await run_in_threadpool(warm_caches)
+    # One pooled client for every outbound call (AI service, Google OAuth)
+    await start_http_client()
+    await start_in_process_workers(SessionLocal)
+    await start_stats_reconciler(SessionLocal)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await stop_stats_reconciler()
+    await stop_in_process_workers()
+    await close_http_client()
+    await run_in_threadpool(dispose_engine)
+    shutdown_logging()
+
+
 # Mount static files (for fish images)
 static_path = os.path.join(os.path.dirname(__file__), "static")
 if os.path.exists(static_path):
@@ -26,9 +89,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],  # Let browser clients follow list pagination and revalidate
 )
 
 
+# Count and time the SQL statements of every request
+if settings.DB_INSTRUMENTATION_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
+
 # Mount the user routes using `include_router` to register the endpoints
 app.include_router(user_routes.router, prefix="/api")
 app.include_router(fish_routes.router, prefix="/api")
@@ -41,3 +110,21 @@ app.include_router(tank_maintain_routes.router, prefix="/api")
 @app.get("/")
 def read_root():
     return {"Hello": "Backend with Fish Catalog"}
+
+
+@app.get("/api/metrics/http-client")
+def http_client_metrics():
+    """Connection pool usage and retry counters of the shared outbound HTTP client"""
+    return pool_stats()
+
+
+@app.get("/api/metrics/db")
+def db_metrics():
+    """Query counts and database time per route since startup"""
+    return route_summary()
+
+
+@app.get("/api/metrics/response-cache")
+def response_cache_metrics():
+    """Size of the response cache and its hit ratio per route since startup"""
+    return RESPONSE_CACHE.summary()
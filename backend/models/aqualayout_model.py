@@ -1,11 +1,19 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Float
+from sqlalchemy import Column, Computed, Integer, String, DateTime, JSON, ForeignKey, Float, Index, literal_column, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from backend.db.base import Base
-from pydantic import BaseModel, ConfigDict, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, model_validator
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
+LITERS_PER_GALLON = 3.785411784  # US gallon
+CM_PER_INCH = 2.54
+VOLUME_LITERS_SQL = "tank_length * tank_width * tank_height / 1000.0"
+VolumeUnit = Literal["liters", "gallons"]
+LITERS_PER_UNIT = {"liters": 1.0, "gallons": LITERS_PER_GALLON}
+
+
 # SQLAlchemy model for aquarium layouts
 class AquaLayout(Base):
     __tablename__ = 'aquarium_layouts'
@@ -18,8 +26,29 @@ class AquaLayout(Base):
     tank_width = Column(Float, nullable=False)  # in cm (stored as decimal)
     tank_height = Column(Float, nullable=False)  # in cm (stored as decimal)
     water_type = Column(String, nullable=False)  # Freshwater or Saltwater
-    fish_data = Column(JSON, nullable=False)  # [{"name": "Goldfish", "quantity": 2}]
+    fish_data = Column(JSON().with_variant(JSONB(), 'postgresql'), nullable=False)  # [{"name": "Goldfish", "quantity": 2}]
     comments = Column(String, nullable=True)
+    # Kept by the database from the dimensions (cm³ / 1000), so volume filters can use an index
+    volume_liters = Column(Float, Computed(VOLUME_LITERS_SQL, persisted=True))
+    # Bumped by every UPDATE; ETags are built from it (see routes/conditional.py)
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"), onupdate=literal_column("version") + 1)
+
+    # Match the repository queries: per-owner lists newest first, global newest-first lists,
+    # volume ranges and histograms (water_type makes the histogram index-only),
+    # and, on PostgreSQL only, fish_data @> '[{"name": ...}]' containment and tank name search
+    __table_args__ = (
+        Index('ix_aquarium_layouts_owner_email_created_at', 'owner_email', created_at.desc()),
+        Index('ix_aquarium_layouts_created_at', 'created_at'),
+        Index('ix_aquarium_layouts_volume_liters_water_type', 'volume_liters', 'water_type'),
+        Index(
+            'ix_aquarium_layouts_fish_data', 'fish_data',
+            postgresql_using='gin', postgresql_ops={'fish_data': 'jsonb_path_ops'},
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_aquarium_layouts_tank_name_trgm', 'tank_name',
+            postgresql_using='gin', postgresql_ops={'tank_name': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+    )
 
 
 # Pydantic schemas
@@ -37,6 +66,22 @@ class AquaLayoutCreate(BaseModel):
     water_type: str
     fish_data: List[FishEntry]
     comments: Optional[str] = None
+    # Unit of the dimensions above; they are converted to cm on input and stored in cm
+    unit: Literal["cm", "inch"] = Field("cm", exclude=True)
+
+    @model_validator(mode="after")
+    def dimensions_in_cm(self):
+        if self.unit == "inch":
+            self.tank_length *= CM_PER_INCH
+            self.tank_width *= CM_PER_INCH
+            self.tank_height *= CM_PER_INCH
+            self.unit = "cm"
+        return self
+
+
+class AquaLayoutBatchEvaluate(BaseModel):
+    layouts: List[AquaLayoutCreate] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(None, ge=1)
 
 
 class AquaLayoutResponse(BaseModel):
@@ -50,5 +95,14 @@ class AquaLayoutResponse(BaseModel):
     water_type: str
     fish_data: List[FishEntry]
     comments: Optional[str] = None
+    volume_liters: Optional[float] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class VolumeBucket(BaseModel):
+    """Tanks with ``min_volume <= volume < max_volume``, in the requested unit"""
+    water_type: str
+    min_volume: float
+    max_volume: float
+    tank_count: int
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy.sql import func
+from backend.db.base import Base
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+
+# SQLAlchemy model for the stored AI evaluation of an aquarium layout
+class AquariumEvaluation(Base):
+    __tablename__ = 'aquarium_evaluations'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    layout_id = Column(Integer, ForeignKey('aquarium_layouts.id'), nullable=False, unique=True, index=True)
+    content_hash = Column(String(64), nullable=False)  # hash of the layout fields the evaluation depends on
+    model = Column(String, nullable=True)  # model that produced the response (None for fallbacks)
+    latency_ms = Column(Integer, nullable=True)
+    response = Column(Text, nullable=False)
+    stale = Column(Boolean, nullable=False, default=False)  # set when the layout is edited
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# Pydantic schemas
+class AquariumEvaluationResponse(BaseModel):
+    layout_id: int
+    content_hash: str
+    model: Optional[str] = None
+    latency_ms: Optional[int] = None
+    response: str
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
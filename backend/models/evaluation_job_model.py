@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Index
+from sqlalchemy.sql import func
+from backend.db.base import Base
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Optional
+from datetime import datetime
+
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED)
+
+
+# SQLAlchemy model for queued AI evaluations
+class EvaluationJob(Base):
+    __tablename__ = 'evaluation_jobs'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    status = Column(String, nullable=False, default=JOB_QUEUED)
+    payload = Column(JSON, nullable=False)  # the AquaLayoutCreate body to evaluate
+    result = Column(JSON, nullable=True)  # the AI service response
+    error = Column(Text, nullable=True)  # last failure
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    available_at = Column(DateTime(timezone=True), nullable=False)  # not picked up before (retry backoff)
+    started_at = Column(DateTime(timezone=True), nullable=True)  # latest attempt
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    locked_by = Column(String, nullable=True)  # worker holding the lease
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # lease expiry; a crashed worker's job is reclaimed after it
+
+    __table_args__ = (
+        Index('ix_evaluation_jobs_status_available_at', 'status', 'available_at'),
+    )
+
+
+# Pydantic schemas
+class EvaluationJobResponse(BaseModel):
+    id: int
+    status: str
+    attempts: int
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import BigInteger, Column, Index, Integer, String
 from backend.db.base import Base
 from pydantic import BaseModel, ConfigDict
 
@@ -11,6 +11,22 @@ class Fish(Base):
     image_url = Column(String, nullable=True)
     water_type = Column(String, nullable=False)  # "freshwater" or "saltwater"
 
+    # Substring search: name ILIKE '%term%' (PostgreSQL; see repositories/search.py)
+    __table_args__ = (
+        Index(
+            'ix_fish_catalog_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+    )
+
+
+# Bumped in the same transaction as every ORM write to fish_catalog, so each
+# process can tell its in-memory catalog is out of date (see services/fish_catalog.py)
+class CatalogVersion(Base):
+    __tablename__ = 'catalog_versions'
+
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
 
 # Pydantic schema for response
 class FishResponse(BaseModel):
@@ -19,7 +35,8 @@ class FishResponse(BaseModel):
     image_url: str | None = None
     water_type: str
 
-    model_config = ConfigDict(from_attributes=True)
+    # Instances are shared by every request through the catalog snapshot
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 # Pydantic schema for creation
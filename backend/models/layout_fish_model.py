@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from backend.db.base import Base
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+
+
+# SQLAlchemy model for the fish stocked in each layout, normalized from AquaLayout.fish_data.
+# Only names found in fish_catalog are linked; fish_data stays the source of truth.
+class LayoutFish(Base):
+    __tablename__ = 'layout_fish'
+
+    layout_id = Column(Integer, ForeignKey('aquarium_layouts.id', ondelete='CASCADE'), primary_key=True)
+    fish_id = Column(Integer, ForeignKey('fish_catalog.id', ondelete='CASCADE'), primary_key=True)
+    quantity = Column(Integer, nullable=False)
+
+    # The primary key serves per-layout lookups; this one serves per-species ones
+    __table_args__ = (
+        Index('ix_layout_fish_fish_id_layout_id', 'fish_id', 'layout_id'),
+    )
+
+
+# Pydantic schema for per-species stock totals
+class SpeciesStockResponse(BaseModel):
+    fish_id: int
+    name: str
+    water_type: str
+    image_url: Optional[str] = None
+    tank_count: int
+    total_quantity: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,35 @@
+from sqlalchemy import BigInteger, Column, Index, String
+from backend.db.base import Base
+from pydantic import BaseModel
+from typing import Dict, List
+
+
+# SQLAlchemy model for the layout counters (see repositories/layout_stats_repository.py).
+# One row per counter, e.g. ("water_type", "freshwater") -> 1250.
+class LayoutStat(Base):
+    __tablename__ = 'layout_stats'
+
+    scope = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+    # Non-zero counters of a scope
+    __table_args__ = (
+        Index('ix_layout_stats_scope_value', 'scope', 'value'),
+    )
+
+
+# Pydantic schemas
+class SpeciesTotal(BaseModel):
+    name: str
+    tank_count: int
+    total_quantity: int
+
+
+class TankStatisticsResponse(BaseModel):
+    total_layouts: int
+    freshwater_tanks: int
+    saltwater_tanks: int
+    unique_users: int
+    by_water_type: Dict[str, int]
+    top_species: List[SpeciesTotal]
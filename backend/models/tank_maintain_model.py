@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index, literal_column, text
 from sqlalchemy.sql import func
 from backend.db.base import Base
 from pydantic import BaseModel, ConfigDict, EmailStr
@@ -19,6 +19,14 @@ class TankMaintenance(Base):
     description = Column(Text, nullable=True)
     notes = Column(Text, nullable=True)
     completed = Column(Integer, default=0)  # 0 for pending, 1 for completed
+    # Bumped by every UPDATE; ETags are built from it (see routes/conditional.py)
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"), onupdate=literal_column("version") + 1)
+
+    # Maintenance logs are listed per tank and per owner, in date order
+    __table_args__ = (
+        Index('ix_tank_maintenance_layout_id_maintenance_date', 'layout_id', 'maintenance_date'),
+        Index('ix_tank_maintenance_owner_email_maintenance_date', 'owner_email', 'maintenance_date'),
+    )
 
 
 # Pydantic schemas
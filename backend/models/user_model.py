@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, String, Date, Index, func
 from backend.db.base import Base
 from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Literal, Optional
@@ -18,6 +18,16 @@ class User(Base):
     password = Column(String, nullable=False)
     role = Column(String, nullable=False, default="user")
 
+    # Emails are looked up case-insensitively (see email_matches)
+    __table_args__ = (
+        Index('ix_users_email_lower', func.lower(email)),
+    )
+
+    @staticmethod
+    def email_matches(email: str):
+        """Case-insensitive email filter that can use ix_users_email_lower"""
+        return func.lower(User.email) == email.lower()
+
 
 # Pydantic model for user profile.
 # These define the schemas for API requests/responses
@@ -1,8 +1,46 @@
+from sqlalchemy import Integer, cast, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
-from backend.models.aqualayout_model import AquaLayout, AquaLayoutCreate
+from backend.models.aqualayout_model import LITERS_PER_GALLON, AquaLayout, AquaLayoutCreate
+from backend.models.fish_model import Fish
+from backend.models.layout_fish_model import LayoutFish
+from backend.models.tank_maintain_model import TankMaintenance
+from backend.repositories.aquarium_evaluation_repository import AquariumEvaluationRepository
+from backend.repositories.layout_fish_repository import LayoutFishRepository
+from backend.repositories.layout_stats_repository import OWNERS, TOTAL, WATER_TYPE, LayoutStatsRepository
+from backend.repositories.pagination import Keyset, Page
+from backend.repositories.search import TextSearch
+from backend.config import settings
+
+# Newest first; id breaks ties between layouts created in the same instant
+LAYOUT_ORDER = Keyset(AquaLayout.created_at, AquaLayout.id, descending=True)
+# Smallest first, in ix_aquarium_layouts_volume_liters_water_type order
+VOLUME_ORDER = Keyset(AquaLayout.volume_liters, AquaLayout.id)
+TANK_NAME_SEARCH = TextSearch(AquaLayout, "tank_name")
 from typing import List, Optional
 
 
+def contains_fish(fish_name: str, dialect: str):
+    """Filter for layouts whose fish_data lists ``fish_name``
+    PostgreSQL: jsonb containment (fish_data @> '[{"name": ...}]'), served by the GIN index.
+    Elsewhere: a scan with json_each.
+    """
+    if dialect == "postgresql":
+        return type_coerce(AquaLayout.fish_data, JSONB).contains([{"name": fish_name}])
+    entries = func.json_each(AquaLayout.fish_data).table_valued("value")
+    return select(entries.c.value).where(func.json_extract(entries.c.value, "$.name") == fish_name).exists()
+
+
+def volume_bucket(bucket_liters: float, dialect: str):
+    """Index of the ``bucket_liters``-wide volume bucket each layout falls in (0 for the first)
+    PostgreSQL rounds when casting to integer, so it floors first; SQLite's cast truncates.
+    """
+    scaled = AquaLayout.volume_liters / bucket_liters
+    if dialect == "postgresql":
+        scaled = func.floor(scaled)
+    return cast(scaled, Integer)
+
+
 class AquaLayoutRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -11,10 +49,32 @@ class AquaLayoutRepository:
         """Get all aquarium layouts ordered by creation date (newest first)"""
         return self.db.query(AquaLayout).order_by(AquaLayout.created_at.desc()).all()
 
+    def get_page(
+        self, owner_email: Optional[str] = None, cursor: Optional[str] = None, limit: int = settings.PAGE_SIZE_DEFAULT
+    ) -> Page[AquaLayout]:
+        """One page of layouts (optionally one owner's), newest first"""
+        query = self.db.query(AquaLayout)
+        if owner_email:
+            query = query.filter(AquaLayout.owner_email == owner_email)
+        return LAYOUT_ORDER.page(query, cursor, limit)
+
+    def get_page_versions(
+        self, owner_email: Optional[str] = None, cursor: Optional[str] = None, limit: int = settings.PAGE_SIZE_DEFAULT
+    ) -> Page:
+        """The page get_page() returns, as (id, version, created_at) rows only; for ETags"""
+        query = self.db.query(AquaLayout.id, AquaLayout.version, AquaLayout.created_at)
+        if owner_email:
+            query = query.filter(AquaLayout.owner_email == owner_email)
+        return LAYOUT_ORDER.page(query, cursor, limit)
+
     def get_by_id(self, layout_id: int) -> Optional[AquaLayout]:
         """Get an aquarium layout by ID"""
         return self.db.query(AquaLayout).filter(AquaLayout.id == layout_id).first()
 
+    def get_version(self, layout_id: int) -> Optional[int]:
+        """Row version of a layout, None if it does not exist; for ETags"""
+        return self.db.scalar(select(AquaLayout.version).where(AquaLayout.id == layout_id))
+
     def get_by_user_email(self, owner_email: str) -> List[AquaLayout]:
         """Get all aquarium layouts for a specific user"""
         return self.db.query(AquaLayout).filter(
@@ -28,11 +88,9 @@ class AquaLayoutRepository:
             AquaLayout.tank_name == tank_name
         ).first()
 
-    def search_by_tank_name(self, search_term: str) -> List[AquaLayout]:
-        """Search layouts by tank name (case-insensitive partial match)"""
-        return self.db.query(AquaLayout).filter(
-            AquaLayout.tank_name.ilike(f"%{search_term}%")
-        ).order_by(AquaLayout.created_at.desc()).all()
+    def search_by_tank_name(self, search_term: str, limit: int = settings.SEARCH_LIMIT_DEFAULT) -> List[AquaLayout]:
+        """Search layouts by tank name (case-insensitive partial match), closest names first"""
+        return TANK_NAME_SEARCH.search(self.db, search_term, limit)
 
     def get_by_water_type(self, water_type: str) -> List[AquaLayout]:
         """Get all layouts by water type (freshwater/saltwater)"""
@@ -41,18 +99,41 @@ class AquaLayoutRepository:
         ).order_by(AquaLayout.created_at.desc()).all()
 
     def get_by_tank_size_range(self, min_gallons: float, max_gallons: float) -> List[AquaLayout]:
-        """Get layouts within a tank size range (calculated volume in gallons)
-        Formula: (length × width × height) ÷ 231 = gallons
-        """
-        # Calculate volume bounds in cubic inches
-        min_cubic_inches = min_gallons * 231
-        max_cubic_inches = max_gallons * 231
-        
+        """Get layouts within a tank size range (US gallons), newest first"""
         return self.db.query(AquaLayout).filter(
-            (AquaLayout.tank_length * AquaLayout.tank_width * AquaLayout.tank_height) >= min_cubic_inches,
-            (AquaLayout.tank_length * AquaLayout.tank_width * AquaLayout.tank_height) <= max_cubic_inches
+            AquaLayout.volume_liters.between(min_gallons * LITERS_PER_GALLON, max_gallons * LITERS_PER_GALLON)
         ).order_by(AquaLayout.created_at.desc()).all()
 
+    def get_volume_page(
+        self,
+        min_liters: Optional[float] = None,
+        max_liters: Optional[float] = None,
+        water_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+    ) -> Page[AquaLayout]:
+        """One page of layouts within a volume range (litres, inclusive), smallest first"""
+        # Always a range on volume_liters, so the index is used even without a minimum
+        query = self.db.query(AquaLayout).filter(AquaLayout.volume_liters >= (min_liters or 0))
+        if max_liters is not None:
+            query = query.filter(AquaLayout.volume_liters <= max_liters)
+        if water_type:
+            query = query.filter(func.lower(AquaLayout.water_type) == water_type.lower())
+        return VOLUME_ORDER.page(query, cursor, limit)
+
+    def get_volume_histogram(self, bucket_liters: float, water_type: Optional[str] = None) -> List[tuple]:
+        """Tank counts per volume bucket and water type: ``(water_type, bucket, count)`` rows,
+        where bucket ``n`` covers ``[n * bucket_liters, (n + 1) * bucket_liters)``.
+        A range scan of the volume/water type index.
+        """
+        kind = func.lower(AquaLayout.water_type).label("water_type")
+        bucket = volume_bucket(bucket_liters, self.db.get_bind().dialect.name).label("bucket")
+        # Volumes are never negative; a range predicate rather than IS NOT NULL lets SQLite use the index too
+        query = self.db.query(kind, bucket, func.count().label("tank_count")).filter(AquaLayout.volume_liters >= 0)
+        if water_type:
+            query = query.filter(func.lower(AquaLayout.water_type) == water_type.lower())
+        return query.group_by(kind, bucket).order_by(kind, bucket).all()
+
     def get_recent_layouts(self, limit: int = 10) -> List[AquaLayout]:
         """Get most recent aquarium layouts"""
         return self.db.query(AquaLayout).order_by(
@@ -75,6 +156,8 @@ class AquaLayoutRepository:
             comments=layout_data.comments
         )
         self.db.add(layout)
+        self.db.flush()
+        LayoutFishRepository(self.db).sync(layout.id, fish_data_json)
         self.db.commit()
         self.db.refresh(layout)
         return layout
@@ -93,6 +176,7 @@ class AquaLayoutRepository:
             layout.water_type = layout_data.water_type
             layout.fish_data = fish_data_json
             layout.comments = layout_data.comments
+            LayoutFishRepository(self.db).sync(layout_id, fish_data_json)
             
             self.db.commit()
             self.db.refresh(layout)
@@ -102,8 +186,7 @@ class AquaLayoutRepository:
         """Delete an aquarium layout"""
         layout = self.get_by_id(layout_id)
         if layout:
-            self.db.delete(layout)
-            self.db.commit()
+            self._delete(layout)
             return True
         return False
 
@@ -111,11 +194,19 @@ class AquaLayoutRepository:
         """Delete a specific tank by user and tank name"""
         layout = self.get_by_user_and_tank_name(owner_email, tank_name)
         if layout:
-            self.db.delete(layout)
-            self.db.commit()
+            self._delete(layout)
             return True
         return False
 
+    def _delete(self, layout: AquaLayout) -> None:
+        """Delete a layout with the rows that reference it (none of those foreign keys cascade)"""
+        self.db.query(TankMaintenance).filter(TankMaintenance.layout_id == layout.id).delete()
+        AquariumEvaluationRepository(self.db).delete_by_layout_id(layout.id)
+        LayoutFishRepository(self.db).delete_by_layout_id(layout.id)
+        self.db.flush()
+        self.db.delete(layout)
+        self.db.commit()
+
     def get_count(self) -> int:
         """Get total number of aquarium layouts"""
         return self.db.query(AquaLayout).count()
@@ -128,12 +219,14 @@ class AquaLayoutRepository:
 
     def get_layouts_with_fish(self, fish_name: str) -> List[AquaLayout]:
         """Get all layouts that contain a specific fish species
-        Note: This uses JSON contains operation - database-specific
+        Catalog species are joined through layout_fish; other names fall back to searching fish_data.
         """
-        # For PostgreSQL JSON operations
-        return self.db.query(AquaLayout).filter(
-            AquaLayout.fish_data.contains([{"name": fish_name}])
-        ).order_by(AquaLayout.created_at.desc()).all()
+        fish_id = self.db.scalar(select(Fish.id).where(Fish.name == fish_name))
+        if fish_id is None:
+            stocked = contains_fish(fish_name, self.db.get_bind().dialect.name)
+        else:
+            stocked = AquaLayout.id.in_(select(LayoutFish.layout_id).where(LayoutFish.fish_id == fish_id))
+        return self.db.query(AquaLayout).filter(stocked).order_by(AquaLayout.created_at.desc()).all()
 
     def get_user_tank_names(self, owner_email: str) -> List[str]:
         """Get all tank names for a specific user"""
@@ -144,28 +237,19 @@ class AquaLayoutRepository:
         return [result[0] for result in results]
 
     def calculate_tank_volume_gallons(self, layout: AquaLayout) -> float:
-        """Calculate tank volume in gallons
-        Formula: (length × width × height) ÷ 231 = gallons
+        """Calculate tank volume in US gallons from the dimensions in cm
+        Formula: (length × width × height) ÷ 1000 ÷ 3.785 = gallons
         """
-        cubic_inches = layout.tank_length * layout.tank_width * layout.tank_height
-        return round(cubic_inches / 231, 1)
+        liters = layout.tank_length * layout.tank_width * layout.tank_height / 1000
+        return round(liters / LITERS_PER_GALLON, 1)
 
     def get_tank_statistics(self) -> dict:
-        """Get statistics about all tanks in the system"""
-        total_layouts = self.get_count()
-        
-        # Get water type distribution
-        freshwater_count = self.db.query(AquaLayout).filter(
-            AquaLayout.water_type.ilike('freshwater')
-        ).count()
-        
-        saltwater_count = self.db.query(AquaLayout).filter(
-            AquaLayout.water_type.ilike('saltwater')
-        ).count()
-        
+        """Get statistics about all tanks in the system, from the layout_stats counters"""
+        repository = LayoutStatsRepository(self.db)
+        by_water_type = repository.get_scope(WATER_TYPE)
         return {
-            "total_layouts": total_layouts,
-            "freshwater_tanks": freshwater_count,
-            "saltwater_tanks": saltwater_count,
-            "unique_users": self.db.query(AquaLayout.owner_email).distinct().count()
-        } 
\ No newline at end of file
+            "total_layouts": repository.get(TOTAL),
+            "freshwater_tanks": by_water_type.get("freshwater", 0),
+            "saltwater_tanks": by_water_type.get("saltwater", 0),
+            "unique_users": repository.get(OWNERS),
+        }
@@ -0,0 +1,39 @@
+from sqlalchemy.orm import Session
+from backend.models.aquarium_evaluation_model import AquariumEvaluation
+from typing import Optional
+
+
+class AquariumEvaluationRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_layout_id(self, layout_id: int) -> Optional[AquariumEvaluation]:
+        """Get the stored evaluation of a layout (unique index on layout_id)"""
+        return self.db.query(AquariumEvaluation).filter(AquariumEvaluation.layout_id == layout_id).first()
+
+    def save(
+        self, layout_id: int, content_hash: str, response: str, model: Optional[str], latency_ms: Optional[int]
+    ) -> AquariumEvaluation:
+        """Store an evaluation, replacing the previous one for the layout"""
+        evaluation = self.get_by_layout_id(layout_id)
+        if evaluation is None:
+            evaluation = AquariumEvaluation(layout_id=layout_id)
+            self.db.add(evaluation)
+        evaluation.content_hash = content_hash
+        evaluation.response = response
+        evaluation.model = model
+        evaluation.latency_ms = latency_ms
+        evaluation.stale = False
+        self.db.commit()
+        self.db.refresh(evaluation)
+        return evaluation
+
+    def mark_stale(self, layout_id: int) -> None:
+        """Flag a layout's evaluation as outdated; committed by the caller"""
+        self.db.query(AquariumEvaluation).filter(
+            AquariumEvaluation.layout_id == layout_id
+        ).update({AquariumEvaluation.stale: True}, synchronize_session=False)
+
+    def delete_by_layout_id(self, layout_id: int) -> None:
+        """Remove a layout's evaluation; committed by the caller"""
+        self.db.query(AquariumEvaluation).filter(AquariumEvaluation.layout_id == layout_id).delete()
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from backend.models.evaluation_job_model import (
+    EvaluationJob, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED,
+)
+from typing import Dict, Optional
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class EvaluationJobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(self, payload: dict, max_attempts: int = 3) -> EvaluationJob:
+        """Add a job to the queue"""
+        job = EvaluationJob(
+            status=JOB_QUEUED,
+            payload=payload,
+            attempts=0,
+            max_attempts=max_attempts,
+            available_at=_utcnow(),
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get_by_id(self, job_id: int) -> Optional[EvaluationJob]:
+        """Get a job by ID"""
+        return self.db.query(EvaluationJob).filter(EvaluationJob.id == job_id).first()
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[EvaluationJob]:
+        """Lease the oldest runnable job to a worker.
+
+        Runnable means queued and due, or running with an expired lease (its
+        worker died). ``FOR UPDATE SKIP LOCKED`` lets many workers claim
+        concurrently without blocking on, or double-claiming, the same row.
+        """
+        while True:
+            now = _utcnow()
+            job = self.db.query(EvaluationJob).filter(
+                or_(
+                    and_(EvaluationJob.status == JOB_QUEUED, EvaluationJob.available_at <= now),
+                    and_(EvaluationJob.status == JOB_RUNNING, EvaluationJob.locked_until < now),
+                )
+            ).order_by(
+                EvaluationJob.available_at, EvaluationJob.id
+            ).limit(1).with_for_update(skip_locked=True).first()
+
+            if job is None:
+                self.db.rollback()  # nothing to do; end the read transaction
+                return None
+
+            if job.status == JOB_RUNNING and job.attempts >= job.max_attempts:
+                # Abandoned on its last attempt: give up instead of retrying forever
+                job.status = JOB_FAILED
+                job.error = job.error or "Worker lease expired"
+                job.finished_at = now
+                job.locked_by = job.locked_until = None
+                self.db.commit()
+                continue
+
+            job.status = JOB_RUNNING
+            job.attempts += 1
+            job.started_at = now
+            job.locked_by = worker_id
+            job.locked_until = now + timedelta(seconds=lease_seconds)
+            self.db.commit()
+            self.db.refresh(job)
+            return job
+
+    def complete(self, job_id: int, worker_id: str, result: dict) -> bool:
+        """Store the result of a job still leased to ``worker_id``"""
+        job = self._leased(job_id, worker_id)
+        if job is None:
+            return False
+        job.status = JOB_SUCCEEDED
+        job.result = result
+        job.error = None
+        job.finished_at = _utcnow()
+        job.locked_by = job.locked_until = None
+        self.db.commit()
+        return True
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry_delay: float, permanent: bool = False) -> bool:
+        """Record a failed attempt; requeue it after ``retry_delay`` unless it is permanent or attempts are used up"""
+        job = self._leased(job_id, worker_id)
+        if job is None:
+            return False
+        now = _utcnow()
+        job.error = error
+        job.locked_by = job.locked_until = None
+        if not permanent and job.attempts < job.max_attempts:
+            job.status = JOB_QUEUED
+            job.available_at = now + timedelta(seconds=retry_delay)
+        else:
+            job.status = JOB_FAILED
+            job.finished_at = now
+        self.db.commit()
+        return True
+
+    def _leased(self, job_id: int, worker_id: str) -> Optional[EvaluationJob]:
+        # A worker whose lease expired must not overwrite the job's new owner
+        return self.db.query(EvaluationJob).filter(
+            EvaluationJob.id == job_id,
+            EvaluationJob.status == JOB_RUNNING,
+            EvaluationJob.locked_by == worker_id,
+        ).with_for_update().first()
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Number of jobs in each state"""
+        rows = self.db.query(EvaluationJob.status, func.count(EvaluationJob.id)).group_by(EvaluationJob.status).all()
+        return {status: count for status, count in rows}
@@ -1,7 +1,20 @@
+from itertools import chain
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from backend.models.fish_model import Fish, FishCreate
+from backend.models.fish_model import CatalogVersion, Fish, FishCreate
+from backend.repositories.layout_fish_repository import LayoutFishRepository
+from backend.repositories.pagination import Keyset, Page
+from backend.repositories.search import TextSearch
+from backend.config import settings
 from typing import List, Optional
 
+# Alphabetical; the unique index on name serves it
+FISH_ORDER = Keyset(Fish.name, Fish.id)
+FISH_NAME_SEARCH = TextSearch(Fish, "name")
+# catalog_versions row of fish_catalog
+CATALOG_NAME = "fish_catalog"
+
 
 class FishRepository:
     def __init__(self, db: Session):
@@ -11,6 +24,10 @@ class FishRepository:
         """Get all fish from the catalog"""
         return self.db.query(Fish).order_by(Fish.name).all()
 
+    def get_page(self, cursor: Optional[str] = None, limit: int = settings.PAGE_SIZE_DEFAULT) -> Page[Fish]:
+        """One page of the catalog, by name"""
+        return FISH_ORDER.page(self.db.query(Fish), cursor, limit)
+
     def get_by_id(self, fish_id: int) -> Optional[Fish]:
         """Get a fish by ID"""
         return self.db.query(Fish).filter(Fish.id == fish_id).first()
@@ -23,11 +40,9 @@ class FishRepository:
         """Get fish by water type (freshwater or saltwater)"""
         return self.db.query(Fish).filter(Fish.water_type == water_type).order_by(Fish.name).all()
 
-    def search_by_name(self, search_term: str) -> List[Fish]:
-        """Search fish by name (case-insensitive partial match)"""
-        return self.db.query(Fish).filter(
-            Fish.name.ilike(f"%{search_term}%")
-        ).order_by(Fish.name).all()
+    def search_by_name(self, search_term: str, limit: int = settings.SEARCH_LIMIT_DEFAULT) -> List[Fish]:
+        """Search fish by name (case-insensitive partial match), closest names first"""
+        return FISH_NAME_SEARCH.search(self.db, search_term, limit)
 
     def create(self, fish_data: FishCreate) -> Fish:
         """Create a new fish in the catalog"""
@@ -56,6 +71,7 @@ class FishRepository:
         """Delete a fish from the catalog"""
         fish = self.get_by_id(fish_id)
         if fish:
+            LayoutFishRepository(self.db).delete_by_fish_id(fish_id)
             self.db.delete(fish)
             self.db.commit()
             return True
@@ -63,4 +79,39 @@ class FishRepository:
 
     def get_count(self) -> int:
         """Get total number of fish in catalog"""
-        return self.db.query(Fish).count() 
\ No newline at end of file
+        return self.db.query(Fish).count()
+
+    def get_catalog_version(self) -> int:
+        """Version of the catalog; 0 until its first write"""
+        return self.db.scalar(select(CatalogVersion.version).where(CatalogVersion.name == CATALOG_NAME)) or 0
+
+    def bump_catalog_version(self) -> None:
+        """Mark the catalog as changed; committed by the caller
+
+        ORM writes do this on flush (see track_catalog_changes). Call it after
+        writing fish_catalog with Core or SQL, so other processes reload it.
+        """
+        insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        statement = insert(CatalogVersion.__table__).values(name=CATALOG_NAME, version=1)
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=["name"], set_={"version": CatalogVersion.__table__.c.version + 1},
+        ))
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    changed = chain(
+        (obj for obj in chain(session.new, session.deleted) if isinstance(obj, Fish)),
+        (obj for obj in session.dirty if isinstance(obj, Fish) and session.is_modified(obj)),
+    )
+    if next(changed, None) is not None:
+        with session.no_autoflush:
+            FishRepository(session).bump_catalog_version()
+
+
+def track_catalog_changes(session_class=Session) -> None:
+    """Bump the catalog version on every ORM flush that writes fish_catalog rows (idempotent)"""
+    if not event.contains(session_class, "before_flush", _before_flush):
+        event.listen(session_class, "before_flush", _before_flush)
+
+
+track_catalog_changes()
@@ -0,0 +1,94 @@
+from sqlalchemy import delete, desc, func, insert, select
+from sqlalchemy.orm import Session
+from backend.models.aqualayout_model import AquaLayout
+from backend.models.fish_model import Fish
+from backend.models.layout_fish_model import LayoutFish
+from typing import Dict, Iterable, List, Optional
+
+
+def stock_quantities(fish_data: Iterable[dict]) -> Dict[str, int]:
+    """Quantity per lower-cased fish name; repeated names are added up"""
+    quantities: Dict[str, int] = {}
+    for entry in fish_data or []:
+        name = entry["name"].strip().lower()
+        quantities[name] = quantities.get(name, 0) + entry["quantity"]
+    return quantities
+
+
+def stock_rows(layout_id: int, fish_data: Iterable[dict], catalog: Dict[str, int]) -> List[dict]:
+    """layout_fish rows for the names in ``fish_data`` that ``catalog`` (lower-cased name -> id) knows"""
+    return [
+        {"layout_id": layout_id, "fish_id": catalog[name], "quantity": quantity}
+        for name, quantity in stock_quantities(fish_data).items() if name in catalog
+    ]
+
+
+def species_stock_query():
+    """Tanks and total quantity per species, most widely kept first"""
+    tank_count = func.count(LayoutFish.layout_id).label("tank_count")
+    total_quantity = func.coalesce(func.sum(LayoutFish.quantity), 0).label("total_quantity")
+    return select(
+        Fish.id.label("fish_id"), Fish.name, Fish.water_type, Fish.image_url, tank_count, total_quantity,
+    ).outerjoin(LayoutFish, LayoutFish.fish_id == Fish.id).group_by(Fish.id).order_by(
+        desc(tank_count), desc(total_quantity), Fish.name
+    )
+
+
+class LayoutFishRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def catalog_ids(self, names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Lower-cased catalog name -> fish id, for ``names`` (or the whole catalog)"""
+        query = self.db.query(func.lower(Fish.name), Fish.id)
+        if names is not None:
+            query = query.filter(func.lower(Fish.name).in_(list(names)))
+        return dict(query.all())
+
+    def sync(self, layout_id: int, fish_data: List[dict]) -> None:
+        """Replace a layout's rows to match its fish_data; committed by the caller"""
+        catalog = self.catalog_ids(stock_quantities(fish_data))
+        self.delete_by_layout_id(layout_id)
+        rows = stock_rows(layout_id, fish_data, catalog)
+        if rows:
+            self.db.execute(insert(LayoutFish), rows)
+
+    def delete_by_layout_id(self, layout_id: int) -> None:
+        """Remove a layout's rows; committed by the caller"""
+        self.db.execute(delete(LayoutFish).where(LayoutFish.layout_id == layout_id))
+
+    def delete_by_fish_id(self, fish_id: int) -> None:
+        """Remove a species from every layout; committed by the caller"""
+        self.db.execute(delete(LayoutFish).where(LayoutFish.fish_id == fish_id))
+
+    def backfill_batch(self, after_id: int, batch_size: int, catalog: Dict[str, int]) -> Optional[int]:
+        """Rebuild the rows of the next ``batch_size`` layouts after ``after_id``; committed by the caller
+
+        Returns:
+            The last layout id of the batch, or None once every layout is done
+        """
+        layouts = self.db.execute(
+            select(AquaLayout.id, AquaLayout.fish_data).where(AquaLayout.id > after_id).order_by(AquaLayout.id).limit(batch_size)
+        ).all()
+        if not layouts:
+            return None
+        ids = [layout.id for layout in layouts]
+        self.db.execute(delete(LayoutFish).where(LayoutFish.layout_id.in_(ids)))
+        rows = [row for layout in layouts for row in stock_rows(layout.id, layout.fish_data, catalog)]
+        if rows:
+            self.db.execute(insert(LayoutFish), rows)
+        return ids[-1]
+
+    def get_layout_ids(self, fish_id: int) -> List[int]:
+        """Ids of the layouts that keep a species"""
+        return list(self.db.scalars(select(LayoutFish.layout_id).where(LayoutFish.fish_id == fish_id)))
+
+    def get_popular_species(self, limit: int = 10) -> List[dict]:
+        """Species kept in the most tanks, with their total stock"""
+        query = species_stock_query().having(func.count(LayoutFish.layout_id) > 0).limit(limit)
+        return [row._asdict() for row in self.db.execute(query)]
+
+    def get_species_stock(self, fish_id: int) -> Optional[dict]:
+        """Tank count and total stock of one species (zeros if nobody keeps it)"""
+        row = self.db.execute(species_stock_query().where(Fish.id == fish_id)).first()
+        return row._asdict() if row else None
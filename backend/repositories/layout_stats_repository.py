@@ -0,0 +1,197 @@
+from sqlalchemy import delete, event, inspect, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from backend.models.aqualayout_model import AquaLayout
+from backend.models.layout_stats_model import LayoutStat
+from typing import Dict, List, Tuple
+
+# Counter scopes; keys are "" for the global counters
+TOTAL = "layouts"
+WATER_TYPE = "water_type"  # per lower-cased water type
+OWNER = "owner"  # layouts per owner email
+OWNERS = "owners"  # owners with at least one layout
+RECONCILES = "reconciles"  # corrections applied by reconcile; keeps overlapping ones from both applying
+
+Counters = Dict[Tuple[str, str], int]
+Drift = Dict[Tuple[str, str], Tuple[int, int]]
+
+# Layout columns the counters depend on; per-species totals come from layout_fish
+TRACKED_COLUMNS = ("owner_email", "water_type")
+
+
+def layout_counters(owner_email: str, water_type: str) -> Counters:
+    """What one layout adds to the counters (OWNERS aside, which depends on the other layouts)"""
+    return {(TOTAL, ""): 1, (WATER_TYPE, water_type.strip().lower()): 1, (OWNER, owner_email): 1}
+
+
+def combine(target: Counters, counters: Counters, sign: int = 1) -> Counters:
+    """Add (or with ``sign=-1`` subtract) ``counters`` into ``target``"""
+    for key, value in counters.items():
+        target[key] = target.get(key, 0) + sign * value
+    return target
+
+
+def _insert(dialect: str):
+    # Both dialects spell upserts as INSERT ... ON CONFLICT ... RETURNING
+    return postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+
+class LayoutStatsRepository:
+    """
+    Counters over aquarium_layouts, kept in layout_stats.
+
+    Every ORM flush that adds, changes or deletes layouts applies its deltas in
+    the same transaction (see track_layout_changes), so reading a statistic is
+    a primary-key lookup. Writes that bypass the ORM (bulk inserts, Core
+    deletes) are caught up by drift() and correct().
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @property
+    def dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    def _increment(self, deltas: Counters):
+        """An upsert adding ``deltas`` to the counters"""
+        insert = _insert(self.dialect)
+        # Sorted, so concurrent transactions lock the counter rows in the same order
+        statement = insert(LayoutStat.__table__).values([
+            {"scope": scope, "key": key, "value": value} for (scope, key), value in sorted(deltas.items())
+        ])
+        return statement.on_conflict_do_update(
+            index_elements=["scope", "key"], set_={"value": LayoutStat.__table__.c.value + statement.excluded.value},
+        )
+
+    def add(self, deltas: Counters) -> None:
+        """Apply counter deltas; committed by the caller"""
+        deltas = {key: value for key, value in deltas.items() if value}
+        if not deltas:
+            return
+        table = LayoutStat.__table__
+        statement = self._increment(deltas).returning(table.c.scope, table.c.key, table.c.value)
+
+        owners = 0
+        for row in self.db.execute(statement):
+            if row.scope == OWNER:
+                before = row.value - deltas[(OWNER, row.key)]
+                owners += (row.value > 0) - (before > 0)
+        if owners:
+            self.add({(OWNERS, ""): owners})
+
+    def get(self, scope: str, key: str = "") -> int:
+        return self.db.scalar(select(LayoutStat.value).where(LayoutStat.scope == scope, LayoutStat.key == key)) or 0
+
+    def get_scope(self, scope: str) -> Dict[str, int]:
+        """Every non-zero counter of a scope"""
+        rows = self.db.execute(
+            select(LayoutStat.key, LayoutStat.value).where(LayoutStat.scope == scope, LayoutStat.value != 0)
+        )
+        return dict(rows.all())
+
+    def stored(self) -> Counters:
+        """Every counter as stored"""
+        return {(row.scope, row.key): row.value for row in self.db.execute(select(LayoutStat)).scalars()}
+
+    def expected(self, batch_size: int = 1000) -> Counters:
+        """Every counter recomputed from aquarium_layouts (one pass over the table)"""
+        counters: Counters = {}
+        rows = self.db.execute(
+            select(*(getattr(AquaLayout, column) for column in TRACKED_COLUMNS)).execution_options(yield_per=batch_size)
+        )
+        for row in rows:
+            combine(counters, layout_counters(*row))
+        owners = sum(1 for (scope, _), value in counters.items() if scope == OWNER and value > 0)
+        if owners:
+            counters[(OWNERS, "")] = owners
+        return counters
+
+    def drift(self) -> Tuple[Drift, int]:
+        """Counters that differ from a recount, and the RECONCILES generation read with them
+
+        Call it at the start of a transaction. On PostgreSQL the counters and
+        the recount are read in one REPEATABLE READ snapshot, so
+        ``expected - stored`` is exactly how far each counter is off, however
+        long the recount takes. Nothing is locked.
+
+        Returns:
+            ``({(scope, key): (stored, expected)}, generation)``
+        """
+        if self.dialect == "postgresql":
+            self.db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        stored, expected = self.stored(), self.expected()
+        generation = stored.pop((RECONCILES, ""), 0)
+        drift = {
+            key: (stored.get(key, 0), expected.get(key, 0))
+            for key in stored.keys() | expected.keys() if stored.get(key, 0) != expected.get(key, 0)
+        }
+        return drift, generation
+
+    def correct(self, drift: Drift, generation: int) -> bool:
+        """Add to each counter what drift() found it off by; committed by the caller
+
+        The corrections are deltas, like a layout write's, so writes
+        committed since the recount are kept. Returns False, writing nothing,
+        when another reconcile has corrected the counters since ``generation``.
+        """
+        table = LayoutStat.__table__
+        claimed = self.db.execute(
+            update(table).where(table.c.scope == RECONCILES, table.c.key == "", table.c.value == generation)
+            .values(value=table.c.value + 1)
+        ).rowcount
+        if not claimed and generation == 0:
+            claimed = self.db.execute(
+                _insert(self.dialect)(table).values(scope=RECONCILES, key="", value=1).on_conflict_do_nothing()
+            ).rowcount
+        if not claimed:
+            return False
+        self.db.execute(self._increment({key: expected - stored for key, (stored, expected) in drift.items()}))
+        self.db.execute(delete(table).where(table.c.value == 0, tuple_(table.c.scope, table.c.key).in_(sorted(drift))))
+        return True
+
+def _stored_counters(session: Session, layout_ids: List[int]) -> Dict[int, Counters]:
+    """Counters of layouts as they are in the database, before this flush"""
+    if not layout_ids:
+        return {}
+    columns = (getattr(AquaLayout, column) for column in TRACKED_COLUMNS)
+    rows = session.execute(select(AquaLayout.id, *columns).where(AquaLayout.id.in_(layout_ids)))
+    return {row[0]: layout_counters(*row[1:]) for row in rows}
+
+
+def _current_counters(layout: AquaLayout) -> Counters:
+    return layout_counters(*(getattr(layout, column) for column in TRACKED_COLUMNS))
+
+
+def _changed(layout: AquaLayout) -> bool:
+    attributes = inspect(layout).attrs
+    return any(attributes[column].history.has_changes() for column in TRACKED_COLUMNS)
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    added = [obj for obj in session.new if isinstance(obj, AquaLayout)]
+    deleted = [obj for obj in session.deleted if isinstance(obj, AquaLayout)]
+    changed = [obj for obj in session.dirty if isinstance(obj, AquaLayout) and obj not in session.deleted]
+    if not (added or deleted or changed):
+        return
+
+    with session.no_autoflush:
+        changed = [layout for layout in changed if _changed(layout)]
+        deltas: Counters = {}
+        for layout in added:
+            combine(deltas, _current_counters(layout))
+        stored = _stored_counters(session, [layout.id for layout in deleted + changed])
+        for layout in deleted + changed:
+            combine(deltas, stored.get(layout.id, {}), sign=-1)
+        for layout in changed:
+            combine(deltas, _current_counters(layout))
+        LayoutStatsRepository(session).add(deltas)
+
+
+def track_layout_changes(session_class=Session) -> None:
+    """Keep layout_stats in step with every ORM flush of AquaLayout rows (idempotent)"""
+    if not event.contains(session_class, "before_flush", _before_flush):
+        event.listen(session_class, "before_flush", _before_flush)
+
+
+track_layout_changes()
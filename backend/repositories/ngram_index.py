@@ -0,0 +1,203 @@
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+N = 3
+
+
+def ngrams(text: str) -> Set[str]:
+    """The distinct n-grams of an (already lower-cased) string"""
+    return {text[i:i + N] for i in range(len(text) - N + 1)}
+
+
+def word_trigrams(text: str) -> Set[str]:
+    """Trigrams as pg_trgm builds them: per word, padded with two spaces in front and one behind"""
+    grams: Set[str] = set()
+    for word in text.split():
+        grams |= ngrams(f"  {word} ")
+    return grams
+
+
+def similarity(a: str, b: str) -> float:
+    """pg_trgm's similarity(): shared trigrams over all trigrams of both strings"""
+    return _overlap(word_trigrams(a), word_trigrams(b))
+
+
+def _overlap(left: Set[str], right: Set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+class NGramIndex:
+    """
+    In-memory substring index over (id, text) pairs, for databases without pg_trgm.
+
+    Texts are lower-cased and de-duplicated, so many rows with the same name
+    share one entry. A search intersects the postings of the term's trigrams,
+    confirms each candidate contains the term, and ranks by similarity() like
+    the PostgreSQL path. Terms shorter than three characters have no trigram
+    and scan every distinct text, as ILIKE would.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._text_of: Dict[int, str] = {}
+        self._ids_by_text: Dict[str, Set[int]] = {}
+        # word_trigrams() of each distinct text, for ranking without recomputing them
+        self._word_grams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._text_of)
+
+    def _add(self, item_id: int, text: str) -> None:
+        text = text.lower()
+        self._text_of[item_id] = text
+        ids = self._ids_by_text.get(text)
+        if ids is None:
+            self._ids_by_text[text] = ids = set()
+            self._word_grams[text] = word_trigrams(text)
+            for gram in ngrams(text):
+                self._postings.setdefault(gram, set()).add(text)
+        ids.add(item_id)
+
+    def _remove(self, item_id: int) -> None:
+        text = self._text_of.pop(item_id, None)
+        if text is None:
+            return
+        ids = self._ids_by_text[text]
+        ids.discard(item_id)
+        if not ids:
+            del self._ids_by_text[text]
+            del self._word_grams[text]
+            for gram in ngrams(text):
+                texts = self._postings[gram]
+                texts.discard(text)
+                if not texts:
+                    del self._postings[gram]
+
+    def load(self, items: Iterable[Tuple[int, str]]) -> None:
+        with self._lock:
+            for item_id, text in items:
+                self._add(item_id, text)
+
+    def apply(self, changes: Iterable[Tuple[int, Optional[str]]]) -> None:
+        """Upsert ``(id, text)`` pairs; ``(id, None)`` removes the id"""
+        with self._lock:
+            for item_id, text in changes:
+                self._remove(item_id)
+                if text is not None:
+                    self._add(item_id, text)
+
+    def search(self, term: str, limit: int) -> List[int]:
+        """Ids whose text contains ``term`` (case-insensitive), most similar first, then by text and id"""
+        term = term.lower()
+        term_grams = word_trigrams(term)
+        with self._lock:
+            # Rarest trigram first, so the candidate set starts small
+            grams = sorted(ngrams(term), key=lambda gram: len(self._postings.get(gram, ())))
+            if grams:
+                candidates = set(self._postings.get(grams[0], ()))
+                for gram in grams[1:]:
+                    if not candidates:
+                        break
+                    candidates &= self._postings.get(gram, set())
+            else:
+                candidates = set(self._ids_by_text)
+            ranked = sorted(
+                ((_overlap(self._word_grams[text], term_grams), text) for text in candidates if term in text),
+                key=lambda match: (-match[0], match[1]),
+            )
+            ids: List[int] = []
+            for _, text in ranked:
+                ids.extend(sorted(self._ids_by_text[text])[:limit - len(ids)])
+                if len(ids) >= limit:
+                    break
+        return ids
+
+
+class IndexedColumn:
+    """
+    An NGramIndex per engine over one text column of a model, built on first
+    use and kept current by the ORM: changes flushed through a Session are
+    applied when it commits. Writes that bypass the ORM, or come from other
+    processes, are seen after refresh().
+    """
+
+    def __init__(self, model, column: str):
+        self.model = model
+        self.column = column
+        self._indexes: "weakref.WeakKeyDictionary[Engine, NGramIndex]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, session: Session) -> NGramIndex:
+        engine = session.get_bind()
+        index = self._indexes.get(engine)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(engine)
+                if index is None:
+                    index = NGramIndex()
+                    id_column, text_column = self.model.id, getattr(self.model, self.column)
+                    index.load(session.execute(select(id_column, text_column).execution_options(yield_per=10_000)))
+                    self._indexes[engine] = index
+        return index
+
+    def refresh(self, engine: Engine) -> None:
+        """Drop the index of ``engine``; the next search rebuilds it"""
+        self._indexes.pop(engine, None)
+
+    def built(self, engine: Engine) -> Optional[NGramIndex]:
+        return self._indexes.get(engine)
+
+
+_columns: List[IndexedColumn] = []
+PENDING_KEY = "ngram_index_changes"
+
+
+def indexed_column(model, column: str) -> IndexedColumn:
+    indexed = IndexedColumn(model, column)
+    _columns.append(indexed)
+    return indexed
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    changes: List[Tuple[IndexedColumn, int, Optional[str]]] = []
+    for indexed in _columns:
+        for obj in session.new | session.dirty:
+            if isinstance(obj, indexed.model):
+                changes.append((indexed, obj.id, getattr(obj, indexed.column)))
+        for obj in session.deleted:
+            if isinstance(obj, indexed.model):
+                changes.append((indexed, obj.id, None))
+    if changes:
+        session.info.setdefault(PENDING_KEY, []).extend(changes)
+
+
+def _after_commit(session: Session) -> None:
+    changes = session.info.pop(PENDING_KEY, None)
+    if not changes:
+        return
+    engine = session.get_bind()
+    for indexed in {change[0] for change in changes}:
+        index = indexed.built(engine)
+        if index is not None:
+            index.apply((item_id, text) for column, item_id, text in changes if column is indexed)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
+
+
+def _listen(session_class, name: str, listener: Callable) -> None:
+    if not event.contains(session_class, name, listener):
+        event.listen(session_class, name, listener)
+
+
+_listen(Session, "after_flush", _after_flush)
+_listen(Session, "after_commit", _after_commit)
+_listen(Session, "after_rollback", _after_rollback)
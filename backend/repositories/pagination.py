@@ -0,0 +1,109 @@
+import base64
+import binascii
+import json
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, List, Optional, Sequence, TypeVar
+from fastapi import HTTPException
+from sqlalchemy import bindparam, tuple_
+from backend.config import settings
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=400, detail="Invalid cursor")
+
+
+def key_value(column, value):
+    """A decoded cursor value as ``column``'s Python type; ValueError if it is not one"""
+    # Key columns are never null, and JSON true would otherwise pass as the integer 1
+    if value is None or isinstance(value, bool):
+        raise ValueError(value)
+    python_type = column.type.python_type
+    if python_type is datetime:
+        if not isinstance(value, str):
+            raise ValueError(value)
+        return datetime.fromisoformat(value)
+    if python_type is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, python_type):
+        raise ValueError(value)
+    return value
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class Keyset:
+    """
+    A stable sort order over unique keys, e.g. ``Keyset(AquaLayout.created_at, AquaLayout.id, descending=True)``.
+
+    Pages continue with ``WHERE (created_at, id) < (:last_created_at, :last_id)``
+    instead of OFFSET, so each page reads only its own rows off the index no
+    matter how deep it is. Cursors are the last row's key values, encoded opaquely.
+    """
+
+    def __init__(self, *columns, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def order_by(self) -> list:
+        return [column.desc() if self.descending else column for column in self.columns]
+
+    def after(self, values: list):
+        bound = tuple_(*(bindparam(None, value, type_=column.type) for column, value in zip(self.columns, values)))
+        keys = tuple_(*self.columns)
+        return keys < bound if self.descending else keys > bound
+
+    def encode(self, item) -> str:
+        values = [getattr(item, column.key) for column in self.columns]
+        raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> list:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError(cursor)
+            return [key_value(column, value) for column, value in zip(self.columns, values)]
+        except (ValueError, TypeError, binascii.Error):
+            raise InvalidCursorError()
+
+    def _bounded(self, statement, cursor: Optional[str], limit: int):
+        if cursor:
+            statement = statement.filter(self.after(self.decode(cursor)))
+        # One extra row tells whether there is a next page
+        return statement.order_by(*self.order_by()).limit(limit + 1)
+
+    def _page(self, items: list, limit: int) -> Page:
+        if len(items) > limit:
+            return Page(items[:limit], self.encode(items[limit - 1]))
+        return Page(items)
+
+    def key(self, item) -> tuple:
+        return tuple(getattr(item, column.key) for column in self.columns)
+
+    def page_of(self, items: Sequence, cursor: Optional[str], limit: int) -> Page:
+        """One page of ``items`` held in memory and sorted by this (ascending) order, e.g. by key()"""
+        if self.descending:
+            raise ValueError("page_of() needs an ascending order")
+        limit = min(limit, settings.PAGE_SIZE_MAX)
+        start = 0
+        if cursor:
+            try:
+                start = bisect_right(items, tuple(self.decode(cursor)), key=self.key)
+            except TypeError:  # values of the wrong types for this order
+                raise InvalidCursorError()
+        return self._page(list(items[start:start + limit + 1]), limit)
+
+    def page(self, query, cursor: Optional[str], limit: int) -> Page:
+        """One page of an ORM query; ``limit`` is capped at PAGE_SIZE_MAX"""
+        limit = min(limit, settings.PAGE_SIZE_MAX)
+        return self._page(self._bounded(query, cursor, limit).all(), limit)
+
@@ -0,0 +1,39 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from backend.repositories.ngram_index import indexed_column
+from typing import List
+
+
+def like_pattern(term: str) -> str:
+    """``%term%`` with LIKE wildcards in ``term`` escaped (ESCAPE '\\')"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class TextSearch:
+    """
+    Case-insensitive substring search over one text column, best matches first.
+
+    PostgreSQL: ILIKE served by a pg_trgm GIN index on the column, ranked by
+    similarity(). Other databases: an in-process NGramIndex (see ngram_index.py)
+    that returns ranked ids, then one primary-key lookup for the rows.
+    """
+
+    def __init__(self, model, column: str):
+        self.model = model
+        self.column = getattr(model, column)
+        self.fallback = indexed_column(model, column)
+
+    def search(self, db: Session, term: str, limit: int) -> List:
+        if db.get_bind().dialect.name == "postgresql":
+            return list(db.scalars(
+                select(self.model)
+                .where(self.column.ilike(like_pattern(term), escape="\\"))
+                .order_by(func.similarity(self.column, term).desc(), self.column, self.model.id)
+                .limit(limit)
+            ))
+        ids = self.fallback.get(db).search(term, limit)
+        if not ids:
+            return []
+        rows = {row.id: row for row in db.scalars(select(self.model).where(self.model.id.in_(ids)))}
+        return [rows[item_id] for item_id in ids if item_id in rows]
@@ -1,5 +1,21 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from backend.models.tank_maintain_model import TankMaintenance
+from backend.repositories.pagination import Keyset, Page
+from backend.config import settings
+from typing import Optional
+
+# Date order; the (layout_id, maintenance_date) and (owner_email, maintenance_date) indexes serve it
+MAINTENANCE_ORDER = Keyset(TankMaintenance.maintenance_date, TankMaintenance.id)
+
+
+def _maintenance_filters(layout_id: Optional[int], owner_email: Optional[str]) -> list:
+    filters = []
+    if layout_id is not None:
+        filters.append(TankMaintenance.layout_id == layout_id)
+    if owner_email is not None:
+        filters.append(TankMaintenance.owner_email == owner_email)
+    return filters
 
 
 class TankMaintenanceRepository:
@@ -10,10 +26,33 @@ class TankMaintenanceRepository:
         return self.db.query(TankMaintenance).filter(TankMaintenance.id == maintenance_id).first()
 
     def get_by_layout(self, layout_id: int):
-        return self.db.query(TankMaintenance).filter(TankMaintenance.layout_id == layout_id).all()
+        return self.db.query(TankMaintenance).filter(
+            TankMaintenance.layout_id == layout_id
+        ).order_by(TankMaintenance.maintenance_date).all()
 
     def get_by_owner(self, owner_email: str):
-        return self.db.query(TankMaintenance).filter(TankMaintenance.owner_email == owner_email).all()
+        return self.db.query(TankMaintenance).filter(
+            TankMaintenance.owner_email == owner_email
+        ).order_by(TankMaintenance.maintenance_date).all()
+
+    def get_page(
+        self, layout_id: Optional[int] = None, owner_email: Optional[str] = None,
+        cursor: Optional[str] = None, limit: int = settings.PAGE_SIZE_DEFAULT,
+    ) -> Page[TankMaintenance]:
+        query = self.db.query(TankMaintenance).filter(*_maintenance_filters(layout_id, owner_email))
+        return MAINTENANCE_ORDER.page(query, cursor, limit)
+
+    def get_page_versions(
+        self, layout_id: Optional[int] = None, owner_email: Optional[str] = None,
+        cursor: Optional[str] = None, limit: int = settings.PAGE_SIZE_DEFAULT,
+    ) -> Page:
+        """The page get_page() returns, as (id, version, maintenance_date) rows only; for ETags"""
+        query = self.db.query(TankMaintenance.id, TankMaintenance.version, TankMaintenance.maintenance_date)
+        return MAINTENANCE_ORDER.page(query.filter(*_maintenance_filters(layout_id, owner_email)), cursor, limit)
+
+    def get_version(self, maintenance_id: int) -> Optional[int]:
+        """Row version of an entry, None if it does not exist; for ETags"""
+        return self.db.scalar(select(TankMaintenance.version).where(TankMaintenance.id == maintenance_id))
 
     def create(self, maintenance_data: dict):
         maintenance = TankMaintenance(**maintenance_data)
@@ -38,4 +77,4 @@ class TankMaintenanceRepository:
             return None
         self.db.delete(maintenance)
         self.db.commit()
-        return maintenance 
\ No newline at end of file
+        return maintenance
@@ -1,10 +1,114 @@
-from fastapi import APIRouter
-from backend.models.aqualayout_model import AquaLayoutCreate
-from backend.services.ai_proxy_service import evaluate_with_ai
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.db.db import SessionLocal, get_db
+from backend.models.aqualayout_model import AquaLayoutBatchEvaluate, AquaLayoutCreate
+from backend.models.evaluation_job_model import EvaluationJobResponse, FINISHED_STATES
+from backend.services.ai_proxy_service import evaluate_batch_with_ai, evaluate_with_ai, stream_evaluation_with_ai
+from backend.services.evaluation_job_service import EvaluationJobService
+from backend.services.http_client import parse_deadline
+
+JOB_NOT_FOUND = "Evaluation job not found"
 
 router = APIRouter(prefix="/ai", tags=["AI Evaluation"])
 
 @router.post("/evaluate")
-async def evaluate_layout(layout: AquaLayoutCreate):
-    result = await evaluate_with_ai(layout)
+async def evaluate_layout(
+    layout: AquaLayoutCreate,
+    response: Response,
+    run_async: bool = Query(False, alias="async"),
+    x_request_deadline: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Evaluate a layout; X-Request-Deadline (Unix time) bounds the call and its retries
+
+    With ``?async=true`` the evaluation is queued instead and a 202 with the
+    job is returned at once; follow it at ``/ai/jobs/{id}``.
+    """
+    if run_async:
+        job = await run_in_threadpool(EvaluationJobService(db).enqueue, layout)
+        response.status_code = 202
+        response.headers["Location"] = f"/api/ai/jobs/{job.id}"
+        return EvaluationJobResponse.model_validate(job)
+
+    result = await evaluate_with_ai(layout, deadline=parse_deadline(x_request_deadline))
     return result
+
+
+@router.post("/evaluate/stream")
+async def evaluate_layout_stream(layout: AquaLayoutCreate, x_request_deadline: Optional[str] = Header(None)):
+    """Stream the evaluation as Server-Sent Events, one event per section"""
+    return StreamingResponse(
+        stream_evaluation_with_ai(layout, deadline=parse_deadline(x_request_deadline)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/evaluate/batch")
+async def evaluate_layouts_batch(batch: AquaLayoutBatchEvaluate):
+    """Evaluate many layouts; results stream back as NDJSON in completion order"""
+    return StreamingResponse(evaluate_batch_with_ai(batch), media_type="application/x-ndjson")
+
+
+@router.get("/jobs/stats")
+def get_job_queue_stats(db: Session = Depends(get_db)):
+    """Number of evaluation jobs in each state"""
+    return EvaluationJobService(db).get_queue_stats()
+
+
+@router.get("/jobs/{job_id}", response_model=EvaluationJobResponse)
+def get_evaluation_job(job_id: int, db: Session = Depends(get_db)):
+    """Poll a queued evaluation"""
+    job = EvaluationJobService(db).get_by_id(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=JOB_NOT_FOUND)
+    return job
+
+
+def _load_job(job_id: int) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        job = EvaluationJobService(db).get_by_id(job_id)
+        return EvaluationJobResponse.model_validate(job).model_dump(mode="json") if job else None
+    finally:
+        db.close()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_evaluation_job(job_id: int):
+    """Subscribe to a queued evaluation as Server-Sent Events
+
+    A ``status`` event is sent whenever the job changes state, and a final
+    ``result`` event once it has succeeded or failed.
+    """
+    job = await run_in_threadpool(_load_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=JOB_NOT_FOUND)
+
+    async def events():
+        current, last = job, None
+        while True:
+            if current is None:
+                yield f"event: error\ndata: {json.dumps({'detail': JOB_NOT_FOUND})}\n\n"
+                return
+            state = (current["status"], current["attempts"])
+            if current["status"] in FINISHED_STATES:
+                yield f"event: result\ndata: {json.dumps(current)}\n\n"
+                return
+            if state != last:
+                yield f"event: status\ndata: {json.dumps(current)}\n\n"
+                last = state
+            await asyncio.sleep(settings.EVALUATION_JOB_POLL_INTERVAL)
+            current = await run_in_threadpool(_load_job, job_id)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,32 +1,164 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from backend.config import settings
 from backend.db.db import get_db
-from backend.models.aqualayout_model import AquaLayoutCreate, AquaLayoutResponse
+from backend.models.aqualayout_model import AquaLayoutCreate, AquaLayoutResponse, VolumeBucket, VolumeUnit
+from backend.models.aquarium_evaluation_model import AquariumEvaluationResponse
+from backend.models.layout_stats_model import TankStatisticsResponse
+from backend.services.aquarium_evaluation_service import AquariumEvaluationService, EvaluationFailedError
+from backend.routes.cached import cached_json
+from backend.routes.conditional import cache_headers, etag_of, not_modified, page_etag
+from backend.routes.pagination import PageParams, page_params, paged
+from backend.routes.serialization import RowSerializer
 from backend.services.aquarium_service import AquariumService
+from backend.services.http_client import parse_deadline
+from backend.services.layout_stats_service import LayoutStatsService
+from backend.services.response_cache import LAYOUTS_TAG, owner_tag
 
 LAYOUT_NOT_FOUND = "Layout not found"
+EVALUATION_NOT_FOUND = "No current evaluation for this layout"
 
 router = APIRouter(prefix="/aquariums", tags=["Aquarium Layouts"])
 
+LAYOUT_LIST = RowSerializer(AquaLayoutResponse)
+
+
+def cached_layouts_page(request: Request, db: Session, email: Optional[str], page: PageParams) -> Response:
+    """One page of layouts with its ETag; a 304 when the client's copy is current"""
+    service = AquariumService(db)
+
+    def current_etag():
+        return page_etag(service.get_page_versions(email, page.cursor, page.limit))
+
+    def load(response: Response):
+        unchanged = not_modified(request, current_etag, settings.CACHE_CONTROL_PRIVATE)
+        if unchanged:
+            return unchanged
+        result = service.get_page(email, page.cursor, page.limit)
+        cache_headers(response, page_etag(result), settings.CACHE_CONTROL_PRIVATE)
+        return paged(response, result)
+
+    return cached_json(request, LAYOUT_LIST, [owner_tag(email) if email else LAYOUTS_TAG], load, current_etag)
+
 
 @router.get("/", response_model=list[AquaLayoutResponse])
-def list_layouts(email: str = Query(None), db: Session = Depends(get_db)):
-    return AquariumService(db).get_all(email=email)
+def list_layouts(
+    request: Request, email: str = Query(None),
+    page: PageParams = Depends(page_params), db: Session = Depends(get_db),
+):
+    return cached_layouts_page(request, db, email, page)
 
 
 @router.get("/by-owner/{email}", response_model=list[AquaLayoutResponse])
-def get_layouts_by_owner(email: str, db: Session = Depends(get_db)):
-    return AquariumService(db).get_all(email=email)
+def get_layouts_by_owner(
+    email: str, request: Request,
+    page: PageParams = Depends(page_params), db: Session = Depends(get_db),
+):
+    return cached_layouts_page(request, db, email, page)
+
+
+@router.get("/with-fish/{fish_name}", response_model=list[AquaLayoutResponse])
+def get_layouts_with_fish(fish_name: str, db: Session = Depends(get_db)):
+    return LAYOUT_LIST.response(AquariumService(db).get_with_fish(fish_name))
+
+
+@router.get("/search", response_model=list[AquaLayoutResponse])
+def search_layouts(
+    q: str = Query(..., min_length=1, description="Search term for tank name"),
+    limit: int = Query(settings.SEARCH_LIMIT_DEFAULT, ge=1, le=settings.SEARCH_LIMIT_MAX),
+    db: Session = Depends(get_db),
+):
+    """Tanks whose name contains the term, closest names first"""
+    return LAYOUT_LIST.response(AquariumService(db).search_by_tank_name(q, limit))
+
+
+@router.get("/by-volume", response_model=list[AquaLayoutResponse])
+def get_layouts_by_volume(
+    response: Response,
+    min_volume: Optional[float] = Query(None, ge=0),
+    max_volume: Optional[float] = Query(None, ge=0),
+    unit: VolumeUnit = Query("liters"),
+    water_type: Optional[str] = Query(None),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    """Tanks within a volume range (inclusive), smallest first"""
+    result = AquariumService(db).get_by_volume(min_volume, max_volume, unit, water_type, page.cursor, page.limit)
+    return LAYOUT_LIST.response(paged(response, result), response)
+
+
+@router.get("/volume-histogram", response_model=list[VolumeBucket])
+def get_volume_histogram(
+    bucket_size: float = Query(50, gt=0),
+    unit: VolumeUnit = Query("liters"),
+    water_type: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """Tank counts per volume bucket and water type; empty buckets are omitted"""
+    return AquariumService(db).get_volume_histogram(bucket_size, unit, water_type)
+
+
+@router.get("/stats", response_model=TankStatisticsResponse)
+def get_tank_statistics(db: Session = Depends(get_db)):
+    """Totals, tanks per water type, distinct owners and the most kept species"""
+    return LayoutStatsService(db).get_statistics()
+
+
+def layout_etag(layout_id: int, version: Optional[int]) -> Optional[str]:
+    return etag_of(layout_id, version) if version is not None else None
 
 
 @router.get("/{layout_id}", response_model=AquaLayoutResponse)
-def get_layout(layout_id: int, db: Session = Depends(get_db)):
-    layout = AquariumService(db).get_by_id(layout_id)
+def get_layout(layout_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    service = AquariumService(db)
+    unchanged = not_modified(
+        request, lambda: layout_etag(layout_id, service.get_version(layout_id)), settings.CACHE_CONTROL_PRIVATE,
+    )
+    if unchanged:
+        return unchanged
+    layout = service.get_by_id(layout_id)
     if not layout:
         raise HTTPException(status_code=404, detail=LAYOUT_NOT_FOUND)
+    cache_headers(response, layout_etag(layout.id, layout.version), settings.CACHE_CONTROL_PRIVATE)
     return layout
 
 
+@router.get("/{layout_id}/evaluation", response_model=AquariumEvaluationResponse)
+def get_layout_evaluation(layout_id: int, db: Session = Depends(get_db)):
+    """Stored evaluation of a layout, as long as the layout has not changed since"""
+    layout, evaluation = AquariumEvaluationService(db).get_current(layout_id)
+    if not layout:
+        raise HTTPException(status_code=404, detail=LAYOUT_NOT_FOUND)
+    if not evaluation:
+        raise HTTPException(status_code=404, detail=EVALUATION_NOT_FOUND)
+    return evaluation
+
+
+@router.post("/{layout_id}/evaluation", response_model=AquariumEvaluationResponse)
+async def evaluate_stored_layout(
+    layout_id: int,
+    refresh: bool = Query(False),
+    x_request_deadline: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Return the stored evaluation, or evaluate the layout and store it
+
+    ``?refresh=true`` re-evaluates even when the stored evaluation is current.
+    """
+    service = AquariumEvaluationService(db)
+    layout, evaluation = await run_in_threadpool(service.get_current, layout_id)
+    if not layout:
+        raise HTTPException(status_code=404, detail=LAYOUT_NOT_FOUND)
+    if evaluation and not refresh:
+        return evaluation
+    try:
+        return await service.evaluate(layout, deadline=parse_deadline(x_request_deadline))
+    except EvaluationFailedError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
 @router.post("/", response_model=AquaLayoutResponse)
 def create_layout(layout: AquaLayoutCreate, db: Session = Depends(get_db)):
     return AquariumService(db).create(layout)
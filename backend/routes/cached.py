@@ -0,0 +1,43 @@
+from typing import Any, Callable, Iterable, Optional
+from fastapi import Request, Response
+from backend.routes.conditional import etag_matches
+from backend.routes.serialization import JSON, RowSerializer
+from backend.services.response_cache import RESPONSE_CACHE
+
+
+def cached_json(
+    request: Request, serializer: RowSerializer, tags: Iterable[str], load: Callable[[Response], Any],
+    current_etag: Optional[Callable[[], Optional[str]]] = None, variant: str = "",
+) -> Response:
+    """Serve a GET from the response cache, or run the route and cache what it returns
+
+    ``load(response)`` is the uncached route: it sets headers (ETag,
+    Cache-Control, X-Next-Cursor) on ``response`` and returns the body, or
+    returns a Response of its own (a 304), which is passed through. Errors
+    propagate and are not cached. ``tags`` name what the body was read from;
+    ``variant`` is added to the key for state the URL does not carry.
+    ``current_etag`` is the route's cheap version query. Plain hits run no
+    query and may trail writes made by other processes by up to
+    RESPONSE_CACHE_TTL_SECONDS. A request with If-None-Match is checked
+    against row versions first, so a client revalidating sees such writes at
+    once.
+    """
+    route = f"{request.method} {request.scope['route'].path}"
+    key = f"{variant}{request.url.path}?{request.url.query}"
+    revalidate = current_etag if request.headers.get("if-none-match") else None
+    entry = RESPONSE_CACHE.get(route, key, revalidate)
+    if entry is not None:
+        etag = entry.headers.get("etag")
+        if etag and etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": entry.headers["cache-control"]})
+        return Response(entry.body, media_type=JSON, headers=entry.headers)
+
+    token = RESPONSE_CACHE.token()
+    response = Response()
+    result = load(response)
+    if isinstance(result, Response):
+        return result
+    body = serializer.dumps(result)
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    RESPONSE_CACHE.put(route, key, body, headers, tags, token)
+    return Response(body, media_type=JSON, headers=headers)
@@ -0,0 +1,43 @@
+import hashlib
+from typing import Callable, Optional
+from fastapi import Request, Response
+from backend.repositories.pagination import Page
+
+
+def etag_of(*parts) -> str:
+    """A strong ETag: the quoted hash of ``parts`` (ids, row versions, cursors...)"""
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+def page_etag(page: Page, *parts) -> str:
+    """ETag of a page of versioned rows: their ids and versions, and whether more follow"""
+    return etag_of([(item.id, item.version) for item in page.items], page.next_cursor, *parts)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison: ``*`` or any listed tag, weak or not (RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def not_modified(request: Request, current_etag: Callable[[], Optional[str]], cache_control: str) -> Optional[Response]:
+    """The 304 to return when the client already has the current representation
+
+    ``current_etag`` is only called when the request carries If-None-Match. It
+    should read row versions, not whole rows; None means the resource is gone.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    etag = current_etag()
+    if etag is None or not etag_matches(if_none_match, etag):
+        return None
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    """ETag and Cache-Control of a full response; ``etag`` comes from the rows being returned"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
@@ -1,60 +1,144 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
+from backend.config import settings
 from backend.db.db import get_db
 from backend.models.fish_model import FishCreate, FishResponse
+from backend.models.layout_fish_model import SpeciesStockResponse
+from backend.routes.cached import cached_json
+from backend.routes.conditional import cache_headers, etag_of, not_modified
+from backend.routes.pagination import PageParams, page_params, paged
+from backend.routes.serialization import RowSerializer
+from backend.services.fish_catalog import CatalogSnapshot
 from backend.services.fish_service import FishService
+from backend.services.response_cache import FISH_TAG
 
 FISH_NOT_FOUND = "Fish not found"
 
 router = APIRouter(prefix="/fish", tags=["Fish Catalog"])
 
+FISH_LIST = RowSerializer(FishResponse)
+
+
+def conditional_read(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Tag a catalog read with ``etag``; the 304 to return when the client already has it"""
+    unchanged = not_modified(request, lambda: etag, settings.CACHE_CONTROL_CATALOG)
+    if not unchanged:
+        cache_headers(response, etag, settings.CACHE_CONTROL_CATALOG)
+    return unchanged
+
+
+def catalog_not_modified(request: Request, response: Response, catalog: CatalogSnapshot) -> Optional[Response]:
+    """Conditional read of a catalog-wide view, tagged with the snapshot's digest"""
+    return conditional_read(request, response, etag_of(catalog.digest))
+
+
+def fish_not_modified(request: Request, response: Response, fish: FishResponse) -> Optional[Response]:
+    """Conditional read of one fish, tagged with its own fields; other catalog writes leave it valid"""
+    return conditional_read(request, response, etag_of(fish.id, fish.name, fish.image_url, fish.water_type))
+
 
 @router.get("/", response_model=list[FishResponse])
-def list_fish(db: Session = Depends(get_db)):
-    """Get all fish in the catalog"""
-    return FishService(db).get_all()
+def list_fish(request: Request, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
+    """Get the fish catalog, one page at a time"""
+    service = FishService(db)
+    catalog = service.catalog
+
+    def load(response: Response):
+        unchanged = catalog_not_modified(request, response, catalog)
+        if unchanged:
+            return unchanged
+        return paged(response, catalog.page(page.cursor, page.limit))
+
+    # Keyed by snapshot: a catalog changed by another process is a different entry
+    return cached_json(request, FISH_LIST, [FISH_TAG], load, variant=catalog.digest)
 
 
 @router.get("/by-water-type/{water_type}", response_model=list[FishResponse])
-def list_fish_by_water_type(water_type: str, db: Session = Depends(get_db)):
+def list_fish_by_water_type(water_type: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get fish by water type (freshwater or saltwater)"""
     if water_type not in ["freshwater", "saltwater"]:
         raise HTTPException(status_code=400, detail="Water type must be 'freshwater' or 'saltwater'")
-    return FishService(db).get_by_water_type(water_type)
+    service = FishService(db)
+    unchanged = catalog_not_modified(request, response, service.catalog)
+    if unchanged:
+        return unchanged
+    return FISH_LIST.response(service.get_by_water_type(water_type), response)
 
 
 @router.get("/search", response_model=list[FishResponse])
 def search_fish(
+    request: Request,
+    response: Response,
     q: str = Query(..., min_length=1, description="Search term for fish name"),
+    limit: int = Query(settings.SEARCH_LIMIT_DEFAULT, ge=1, le=settings.SEARCH_LIMIT_MAX),
+    db: Session = Depends(get_db)
+):
+    """Search for fish by name (partial match), closest names first"""
+    service = FishService(db)
+    unchanged = catalog_not_modified(request, response, service.catalog)
+    if unchanged:
+        return unchanged
+    return FISH_LIST.response(service.search_by_name(q, limit), response)
+
+
+@router.get("/autocomplete", response_model=list[FishResponse])
+def autocomplete_fish(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, description="Start of the fish name"),
+    limit: int = Query(settings.SEARCH_LIMIT_DEFAULT, ge=1, le=settings.SEARCH_LIMIT_MAX),
     db: Session = Depends(get_db)
 ):
-    """Search for fish by name (partial match)"""
-    return FishService(db).search_by_name(q)
+    """Fish whose name starts with q (case-insensitive), alphabetically"""
+    service = FishService(db)
+    unchanged = catalog_not_modified(request, response, service.catalog)
+    if unchanged:
+        return unchanged
+    return FISH_LIST.response(service.autocomplete(q, limit), response)
 
 
 @router.get("/count")
-def get_fish_count(db: Session = Depends(get_db)):
+def get_fish_count(request: Request, response: Response, db: Session = Depends(get_db)):
     """Get total number of fish in catalog"""
-    count = FishService(db).get_count()
-    return {"count": count}
+    service = FishService(db)
+    unchanged = catalog_not_modified(request, response, service.catalog)
+    if unchanged:
+        return unchanged
+    return {"count": service.get_count()}
+
+
+@router.get("/popular", response_model=list[SpeciesStockResponse])
+def get_popular_species(limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    """Species kept in the most tanks, with their total stock"""
+    return FishService(db).get_popular_species(limit)
 
 
 @router.get("/name/{fish_name}", response_model=FishResponse)
-def get_fish_by_name(fish_name: str, db: Session = Depends(get_db)):
+def get_fish_by_name(fish_name: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get a fish by exact name match"""
     fish = FishService(db).get_by_name(fish_name)
     if not fish:
         raise HTTPException(status_code=404, detail=FISH_NOT_FOUND)
-    return fish
+    return fish_not_modified(request, response, fish) or fish
 
 
 @router.get("/{fish_id}", response_model=FishResponse)
-def get_fish(fish_id: int, db: Session = Depends(get_db)):
+def get_fish(fish_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get a fish by ID"""
     fish = FishService(db).get_by_id(fish_id)
     if not fish:
         raise HTTPException(status_code=404, detail=FISH_NOT_FOUND)
-    return fish
+    return fish_not_modified(request, response, fish) or fish
+
+
+@router.get("/{fish_id}/stock", response_model=SpeciesStockResponse)
+def get_species_stock(fish_id: int, db: Session = Depends(get_db)):
+    """How many tanks keep a species, and how many fish in total"""
+    stock = FishService(db).get_species_stock(fish_id)
+    if not stock:
+        raise HTTPException(status_code=404, detail=FISH_NOT_FOUND)
+    return stock
 
 
 @router.post("/", response_model=FishResponse)
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import Query, Response
+from backend.config import settings
+from backend.repositories.pagination import Page
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description=f"Value of {NEXT_CURSOR_HEADER} from the previous page"),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+) -> PageParams:
+    """Dependency for list endpoints: ``?cursor=...&limit=...``"""
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def paged(response: Response, page: Page) -> list:
+    """Return the page's items as the body and its next cursor as a header."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
@@ -1,26 +1,82 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from backend.config import settings
 from backend.db.db import get_db
 from backend.models.tank_maintain_model import TankMaintenanceCreate, TankMaintenanceResponse
+from backend.routes.cached import cached_json
+from backend.routes.conditional import cache_headers, etag_of, not_modified, page_etag
+from backend.routes.pagination import PageParams, page_params, paged
+from backend.routes.serialization import RowSerializer
+from backend.services.response_cache import layout_tag, owner_tag
 from backend.services.tank_maintain_service import TankMaintenanceService
 
 router = APIRouter(prefix="/maintenance", tags=["Tank Maintenance"])
 
+MAINTENANCE_LIST = RowSerializer(TankMaintenanceResponse)
+
+
+def maintenance_etag(maintenance_id: int, version: Optional[int]) -> Optional[str]:
+    return etag_of(maintenance_id, version) if version is not None else None
+
 
 @router.get("/{maintenance_id}", response_model=TankMaintenanceResponse)
-def get_maintenance(maintenance_id: int, db: Session = Depends(get_db)):
-    return TankMaintenanceService(db).get_by_id(maintenance_id)
+def get_maintenance(maintenance_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    service = TankMaintenanceService(db)
+    unchanged = not_modified(
+        request, lambda: maintenance_etag(maintenance_id, service.get_version(maintenance_id)),
+        settings.CACHE_CONTROL_PRIVATE,
+    )
+    if unchanged:
+        return unchanged
+    maintenance = service.get_by_id(maintenance_id)
+    cache_headers(response, maintenance_etag(maintenance.id, maintenance.version), settings.CACHE_CONTROL_PRIVATE)
+    return maintenance
 
 
 @router.get("/layout/{layout_id}", response_model=List[TankMaintenanceResponse])
-def get_maintenance_by_layout(layout_id: int, db: Session = Depends(get_db)):
-    return TankMaintenanceService(db).get_by_layout(layout_id)
+def get_maintenance_by_layout(
+    layout_id: int, request: Request, page: PageParams = Depends(page_params), db: Session = Depends(get_db),
+):
+    service = TankMaintenanceService(db)
+
+    def load(response: Response):
+        unchanged = not_modified(request, current_etag, settings.CACHE_CONTROL_PRIVATE)
+        if unchanged:
+            return unchanged
+        result = service.get_page_by_layout(layout_id, page.cursor, page.limit)
+        layout_version = service.aquarium_service.get_version(layout_id)
+        cache_headers(response, page_etag(result, layout_version), settings.CACHE_CONTROL_PRIVATE)
+        return paged(response, result)
+
+    def current_etag():
+        # The layout's version too: a deleted layout is a 404, not an unchanged empty page
+        layout_version = service.aquarium_service.get_version(layout_id)
+        if layout_version is None:
+            return None
+        return page_etag(service.get_page_versions(layout_id, None, page.cursor, page.limit), layout_version)
+
+    return cached_json(request, MAINTENANCE_LIST, [layout_tag(layout_id)], load, current_etag)
 
 
 @router.get("/owner/{email}", response_model=List[TankMaintenanceResponse])
-def get_maintenance_by_owner(email: str, db: Session = Depends(get_db)):
-    return TankMaintenanceService(db).get_by_owner(email)
+def get_maintenance_by_owner(
+    email: str, request: Request, page: PageParams = Depends(page_params), db: Session = Depends(get_db),
+):
+    service = TankMaintenanceService(db)
+
+    def current_etag():
+        return page_etag(service.get_page_versions(None, email, page.cursor, page.limit))
+
+    def load(response: Response):
+        unchanged = not_modified(request, current_etag, settings.CACHE_CONTROL_PRIVATE)
+        if unchanged:
+            return unchanged
+        result = service.get_page_by_owner(email, page.cursor, page.limit)
+        cache_headers(response, page_etag(result), settings.CACHE_CONTROL_PRIVATE)
+        return paged(response, result)
+
+    return cached_json(request, MAINTENANCE_LIST, [owner_tag(email)], load, current_etag)
 
 
 @router.post("/", response_model=TankMaintenanceResponse)
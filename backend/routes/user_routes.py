@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from backend.db.db import get_db
 from backend.models.user_model import User, UserCreate, UserResponse, UserLogin
 from backend.security.auth import get_current_user, create_access_token
 from backend.security.oauth_google import get_google_oauth_url, get_google_user_info
+from backend.routes.pagination import PageParams, page_params, paged
 from backend.services.user_service import UserService
 from datetime import timedelta
 from typing import List
@@ -12,9 +13,9 @@ from fastapi.responses import RedirectResponse
 import urllib.parse
 import json
 from backend.config import settings
+from backend.logging_config import log_payload
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -47,7 +48,7 @@ async def google_auth_callback(code: str = None, data: str = None, db: Session =
         
         # Get user info from Google
         user_info = await get_google_user_info(code)
-        logger.debug(f"Received user info from Google: {user_info}")
+        log_payload(logger, "Received user info from Google", user_info)
         
         email = user_info.get("email")
         logger.debug(f"Extracted email: {email}")
@@ -167,9 +168,8 @@ def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.get("/users", response_model=List[UserResponse])
-def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = UserService.get_all_users(db)
-    return users[skip : skip + limit]
+def read_users(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
+    return paged(response, UserService.get_users_page(db, page.cursor, page.limit))
 
 @router.get("/users/{user_id}", response_model=UserResponse)
 def read_user(user_id: int, db: Session = Depends(get_db)):
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+layout_fish Backfill
+
+Rebuilds the layout_fish rows of every aquarium layout from its fish_data,
+in batches of --batch-size layouts, each committed on its own. Safe to
+re-run at any time: each batch replaces its layouts' rows. Run it after
+migration 0003 and whenever fish_catalog gains species that existing
+layouts already mention.
+
+Usage (from project root):
+    python backend/scripts/backfill_layout_fish.py
+    python backend/scripts/backfill_layout_fish.py --batch-size 500 --after-id 120000
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import argparse
+import time
+from backend.db.db import SessionLocal
+from backend.repositories.layout_fish_repository import LayoutFishRepository
+
+
+def backfill(batch_size: int = 1000, after_id: int = 0) -> int:
+    """Returns the number of batches processed"""
+    db = SessionLocal()
+    try:
+        repository = LayoutFishRepository(db)
+        catalog = repository.catalog_ids()
+        batches = 0
+        started = time.perf_counter()
+        while True:
+            last_id = repository.backfill_batch(after_id, batch_size, catalog)
+            if last_id is None:
+                break
+            db.commit()
+            batches += 1
+            after_id = last_id
+            print(f"✅ Batch {batches}: layouts up to id {last_id} ({time.perf_counter() - started:.1f}s)")
+        return batches
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild layout_fish from aquarium_layouts.fish_data")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--after-id", type=int, default=0, help="resume after this layout id")
+    args = parser.parse_args()
+
+    batches = backfill(args.batch_size, args.after_id)
+    print(f"🎉 Backfill complete: {batches} batch(es)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Database Stack Benchmark
+
+Runs a catalog read under high concurrency the way FastAPI runs sync routes
+(SessionLocal in a bounded threadpool) and reports throughput and latency
+percentiles. Latency is measured from when a request arrives, so time spent
+waiting for a thread or a pooled connection is included. Run it with
+different --threads and DB_POOL_SIZE / DB_MAX_OVERFLOW values to size them.
+
+--server-delay adds pg_sleep() to every query to mimic a slow database,
+which is where the threadpool runs out first.
+
+Usage (from project root):
+    python backend/scripts/benchmark_db.py --concurrency 200 --requests 2000
+    DB_POOL_SIZE=40 python backend/scripts/benchmark_db.py --concurrency 500 --threads 80 --server-delay 0.05
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import argparse
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+from sqlalchemy import text
+from backend.db.db import SessionLocal, get_engine
+from backend.repositories.fish_repository import FishRepository
+
+# FastAPI (anyio) runs sync endpoints on a threadpool of this size by default
+DEFAULT_THREADS = 40
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+def sync_request(delay: float) -> None:
+    db = SessionLocal()
+    try:
+        if delay:
+            db.execute(text("SELECT pg_sleep(:delay)"), {"delay": delay})
+        FishRepository(db).get_all()
+    finally:
+        db.close()
+
+
+async def drive(make_call: Callable, concurrency: int, requests: int) -> dict:
+    """Keep ``concurrency`` requests open until ``requests`` have completed."""
+    latencies, errors = [], 0
+    remaining = iter(range(requests))
+
+    async def client():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                await make_call()
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors += 1
+                if errors == 1:
+                    print(f"  first error: {type(e).__name__}: {e}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "completed": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+async def run_sync(args) -> dict:
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        await loop.run_in_executor(pool, sync_request, 0)  # warm up the pool
+        return await drive(lambda: loop.run_in_executor(pool, sync_request, args.server_delay),
+                           args.concurrency, args.requests)
+
+
+def print_result(name: str, result: dict) -> None:
+    print(
+        f"{name:<6} {result['completed']:>7} ok {result['errors']:>5} err "
+        f"{result['throughput']:>9.1f} req/s   "
+        f"p50 {result['p50'] * 1000:>8.1f} ms   p95 {result['p95'] * 1000:>8.1f} ms   "
+        f"p99 {result['p99'] * 1000:>8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the database stack under concurrent requests")
+    parser.add_argument("--concurrency", type=int, default=200, help="requests open at once")
+    parser.add_argument("--requests", type=int, default=2000, help="total requests")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="threadpool size")
+    parser.add_argument("--server-delay", type=float, default=0.0, help="seconds of pg_sleep per request")
+    args = parser.parse_args()
+
+    print(f"Concurrency {args.concurrency}, {args.requests} requests, threadpool {args.threads}, "
+          f"server delay {args.server_delay}s")
+    print_result("sync", asyncio.run(run_sync(args)))
+    print(f"       pool: {get_engine().pool.status()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Name Search Benchmark
+
+Seeds the configured database with a fish catalog and a large number of tank
+layouts, then times substring searches two ways:
+
+  scan     the previous query: unbounded ILIKE '%term%' ordered by name
+  indexed  the current search: pg_trgm GIN index on PostgreSQL (the in-process
+           n-gram index elsewhere), best matches first, LIMIT SEARCH_LIMIT_DEFAULT
+
+and reports p50/p95 latency per table. Seeding is skipped when the tables
+already hold at least the requested number of rows.
+
+Usage (from project root):
+    python backend/scripts/benchmark_search.py
+    python backend/scripts/benchmark_search.py --fish 10000 --layouts 100000 --repeat 50
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import argparse
+import math
+import random
+import time
+from typing import Callable, List
+from sqlalchemy import func, insert, select
+from backend.config import settings
+from backend.db.db import SessionLocal
+from backend.models import user_model, tank_maintain_model, aquarium_evaluation_model, layout_fish_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayout
+from backend.models.fish_model import Fish
+from backend.repositories.aqualayout_repository import AquaLayoutRepository
+from backend.repositories.fish_repository import FishRepository
+
+WORDS = [
+    "neon", "tetra", "cardinal", "guppy", "betta", "molly", "platy", "danio", "barb", "rasbora",
+    "gourami", "cichlid", "angel", "discus", "loach", "pleco", "corydoras", "clown", "tang", "goby",
+    "blenny", "wrasse", "damsel", "chromis", "anthias", "reef", "nano", "planted", "community", "shrimp",
+]
+TERMS = ["tetra", "reef", "cory", "angel", "gobi", "nano tank", "xyz"]
+BATCH = 10_000
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+def name(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).title()
+
+
+def seed(fish: int, layouts: int) -> None:
+    rng = random.Random(42)
+    db = SessionLocal()
+    try:
+        existing = db.scalar(select(func.count()).select_from(Fish))
+        if existing < fish:
+            print(f"🌱 Seeding {fish - existing} fish...")
+            rows = [{"name": f"{name(rng, 2)} {i}", "water_type": rng.choice(["freshwater", "saltwater"])}
+                    for i in range(existing, fish)]
+            for start in range(0, len(rows), BATCH):
+                db.execute(insert(Fish), rows[start:start + BATCH])
+            db.commit()
+
+        existing = db.scalar(select(func.count()).select_from(AquaLayout))
+        if existing < layouts:
+            print(f"🌱 Seeding {layouts - existing} layouts...")
+            for start in range(existing, layouts, BATCH):
+                db.execute(insert(AquaLayout), [
+                    {"owner_email": f"user{rng.randrange(50_000)}@example.com", "tank_name": f"{name(rng, 2)} Tank",
+                     "tank_length": 60, "tank_width": 30, "tank_height": 40,
+                     "water_type": rng.choice(["freshwater", "saltwater"]), "fish_data": []}
+                    for _ in range(start, min(start + BATCH, layouts))
+                ])
+                db.commit()
+    finally:
+        db.close()
+
+
+def time_calls(call: Callable[[str], list], repeat: int) -> List[float]:
+    latencies = []
+    for _ in range(repeat):
+        for term in TERMS:
+            started = time.perf_counter()
+            call(term)
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def print_result(label: str, latencies: List[float]) -> None:
+    print(f"{label:<16} p50 {percentile(latencies, 50) * 1000:>9.2f} ms   p95 {percentile(latencies, 95) * 1000:>9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fish and tank name search")
+    parser.add_argument("--fish", type=int, default=10_000, help="fish catalog rows to seed")
+    parser.add_argument("--layouts", type=int, default=1_000_000, help="layout rows to seed")
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the search terms")
+    args = parser.parse_args()
+
+    seed(args.fish, args.layouts)
+    db = SessionLocal()
+    try:
+        print(f"Database {db.get_bind().dialect.name}, limit {settings.SEARCH_LIMIT_DEFAULT}, "
+              f"{len(TERMS) * args.repeat} searches per row")
+        fish, layouts = FishRepository(db), AquaLayoutRepository(db)
+
+        # Build the in-process index (non-PostgreSQL) outside the timings
+        started = time.perf_counter()
+        fish.search_by_name(TERMS[0])
+        layouts.search_by_tank_name(TERMS[0])
+        print(f"warm-up          {(time.perf_counter() - started) * 1000:>9.1f} ms")
+
+        print_result("fish scan", time_calls(
+            lambda term: db.scalars(select(Fish).where(Fish.name.ilike(f"%{term}%")).order_by(Fish.name)).all(),
+            args.repeat))
+        print_result("fish indexed", time_calls(fish.search_by_name, args.repeat))
+        db.expunge_all()
+        print_result("layout scan", time_calls(
+            lambda term: db.scalars(
+                select(AquaLayout).where(AquaLayout.tank_name.ilike(f"%{term}%")).order_by(AquaLayout.tank_name)
+            ).all(),
+            max(1, args.repeat // 10)))
+        db.expunge_all()
+        print_result("layout indexed", time_calls(layouts.search_by_tank_name, args.repeat))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
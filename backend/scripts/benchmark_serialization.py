@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+List Serialization Benchmark
+
+Serves one owner's layouts from an in-memory SQLite database two ways:
+
+  before  the route returns ORM rows and FastAPI validates each one through
+          AquaLayoutResponse (from_attributes, nested fish_data included),
+          then encodes the result with the stdlib json encoder
+  after   the current route: RowSerializer encodes the rows with orjson,
+          without validating them again
+
+It reports requests per second per core (requests / CPU seconds of this
+single-threaded process) through the full ASGI stack, and the time to encode
+one page alone. The response cache is disabled so every request does the work.
+
+Usage (from project root):
+    python backend/scripts/benchmark_serialization.py
+    python backend/scripts/benchmark_serialization.py --layouts 50 --fish-per-layout 20 --requests 500
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import argparse
+import random
+import time
+from typing import Callable, Tuple
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.config import settings
+from backend.db.base import Base
+from backend.db.db import get_db
+from backend.models import user_model, tank_maintain_model, aquarium_evaluation_model, layout_fish_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayout, AquaLayoutResponse
+from backend.routes import aquarium_routes
+from backend.routes.pagination import PageParams, page_params
+from backend.services.aquarium_service import AquariumService
+from backend.services.response_cache import RESPONSE_CACHE
+
+OWNER = "benchmark@example.com"
+SPECIES = ["Neon Tetra", "Guppy", "Corydoras", "Betta", "Molly", "Platy", "Zebra Danio", "Cherry Barb", "Pleco"]
+
+
+def build_app(layouts: int, fish_per_layout: int) -> Tuple[FastAPI, sessionmaker]:
+    rng = random.Random(42)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(AquaLayout), [
+            {"owner_email": OWNER, "tank_name": f"Tank {i}", "tank_length": rng.choice([60, 90, 120]),
+             "tank_width": 30.5, "tank_height": 40, "water_type": "freshwater", "comments": "Planted community tank",
+             "fish_data": [{"name": rng.choice(SPECIES), "quantity": rng.randint(1, 12)} for _ in range(fish_per_layout)]}
+            for i in range(layouts)
+        ])
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    app = FastAPI()
+    app.include_router(aquarium_routes.router, prefix="/api")
+
+    @app.get("/before/{email}", response_model=list[AquaLayoutResponse])
+    def before(email: str, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
+        return AquariumService(db).get_page(email, page.cursor, page.limit).items
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    app.dependency_overrides[get_db] = override_db
+    return app, session_factory
+
+
+def requests_per_core_second(call: Callable[[], object], requests: int) -> float:
+    call()
+    started = time.process_time()
+    for _ in range(requests):
+        call()
+    return requests / (time.process_time() - started)
+
+
+def encode_time(call: Callable[[], bytes], repeat: int) -> float:
+    call()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of list endpoints")
+    parser.add_argument("--layouts", type=int, default=settings.PAGE_SIZE_MAX, help="layouts on the page (at most PAGE_SIZE_MAX)")
+    parser.add_argument("--fish-per-layout", type=int, default=8, help="fish_data entries per layout")
+    parser.add_argument("--requests", type=int, default=200, help="requests per variant")
+    args = parser.parse_args()
+    if not 1 <= args.layouts <= settings.PAGE_SIZE_MAX:
+        parser.error(f"--layouts must be between 1 and PAGE_SIZE_MAX ({settings.PAGE_SIZE_MAX})")
+
+    RESPONSE_CACHE.max_bytes = 0
+    app, session_factory = build_app(args.layouts, args.fish_per_layout)
+    client = TestClient(app)
+    params = {"limit": args.layouts}
+    before = client.get(f"/before/{OWNER}", params=params)
+    after = client.get(f"/api/aquariums/by-owner/{OWNER}", params=params)
+    assert before.json() == after.json(), "the two variants must return the same layouts"
+    print(f"{args.layouts} layouts x {args.fish_per_layout} fish per page, {len(after.content) / 1024:.0f} KiB")
+
+    results = {
+        "before": requests_per_core_second(lambda: client.get(f"/before/{OWNER}", params=params), args.requests),
+        "after": requests_per_core_second(
+            lambda: client.get(f"/api/aquariums/by-owner/{OWNER}", params=params), args.requests),
+    }
+    for label, rate in results.items():
+        print(f"{label:<8} {rate:>9.1f} requests/s per core")
+    print(f"speed-up {results['after'] / results['before']:>9.2f}x")
+
+    # The encoding step alone, on rows already loaded
+    with session_factory() as db:
+        rows = AquariumService(db).get_page(OWNER, None, args.layouts).items
+    adapter = TypeAdapter(list[AquaLayoutResponse])
+    repeat = max(1, args.requests // 2)
+    validate_then_dump = encode_time(lambda: adapter.dump_json(adapter.validate_python(rows, from_attributes=True)), repeat)
+    row_serializer = encode_time(lambda: aquarium_routes.LAYOUT_LIST.dumps(rows), repeat)
+    print(f"encode   validate+dump {validate_then_dump * 1000:>7.2f} ms   RowSerializer {row_serializer * 1000:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
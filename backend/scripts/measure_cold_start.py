@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Backend Cold Start Measurement
+
+Measures, in fresh interpreters, how long `import backend.main` takes, how
+long a uvicorn process takes from spawn until it answers, and how long the
+first real request (--path) takes once it does. Each run starts a new
+process, so nothing is cached between runs except the OS file cache and .pyc
+files.
+
+Usage (from project root):
+    python backend/scripts/measure_cold_start.py --runs 5
+    python backend/scripts/measure_cold_start.py --runs 5 --path /api/aquariums/
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import argparse
+import socket
+import statistics
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from typing import Tuple
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import backend.main; print(time.perf_counter() - t)"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=project_root, capture_output=True, text=True, check=True,
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def measure_server(path: str, timeout: float) -> Tuple[float, float]:
+    """Seconds from spawning uvicorn until ``/`` answers, then seconds for the first request to ``path``."""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=project_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"Server did not answer within {timeout}s")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1):
+                    break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        ready = time.perf_counter() - started
+
+        request_started = time.perf_counter()
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=timeout) as response:
+            response.read()
+        return ready, time.perf_counter() - request_started
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def summarize(label: str, samples) -> None:
+    ms = sorted(sample * 1000 for sample in samples)
+    print(f"{label:<24} median {statistics.median(ms):7.0f} ms   min {ms[0]:7.0f} ms   max {ms[-1]:7.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure backend cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/api/fish/", help="first request to time once the server is up")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    measure_import()  # compile .pyc files once so every run measures the same thing
+    summarize("import backend.main", [measure_import() for _ in range(args.runs)])
+    ready, first = zip(*(measure_server(args.path, args.timeout) for _ in range(args.runs)))
+    summarize("spawn to serving", ready)
+    summarize(f"first {args.path}", first)
+
+
+if __name__ == "__main__":
+    main()
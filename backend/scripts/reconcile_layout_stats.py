@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+layout_stats Consistency Check
+
+Recounts the layout statistics counters from aquarium_layouts and compares
+them with layout_stats. By default the counters are corrected; with --check
+nothing is written and the exit status is 1 when any counter is off, for
+use as a scheduled consistency job. Run it from one scheduler, not from
+every host; layout writes carry on while it runs.
+
+Usage (from project root):
+    python backend/scripts/reconcile_layout_stats.py
+    python backend/scripts/reconcile_layout_stats.py --check
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import argparse
+import time
+from backend.db.db import SessionLocal
+from backend.services.layout_stats_service import LayoutStatsService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recount layout_stats from aquarium_layouts")
+    parser.add_argument("--check", action="store_true", help="report drift without fixing it; exit 1 on drift")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        drift = LayoutStatsService(db).reconcile(fix=not args.check)
+    finally:
+        db.close()
+
+    for (scope, key), (stored, expected) in sorted(drift.items()):
+        print(f"⚠️  {scope}:{key or '-'} stored {stored}, counted {expected}")
+    elapsed = time.perf_counter() - started
+    if not drift:
+        print(f"✅ Counters match ({elapsed:.1f}s)")
+    elif args.check:
+        print(f"❌ {len(drift)} counter(s) off ({elapsed:.1f}s)")
+        sys.exit(1)
+    else:
+        print(f"🎉 Fixed {len(drift)} counter(s) ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
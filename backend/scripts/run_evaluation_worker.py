@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Evaluation Job Worker
+
+Drains the evaluation_jobs queue outside the API process. Start as many as
+you like, on as many hosts as you like: jobs are leased with
+SELECT ... FOR UPDATE SKIP LOCKED, so workers never pick the same job, and a
+job whose worker dies is retried once its lease expires.
+
+Usage (from project root):
+    python backend/scripts/run_evaluation_worker.py --concurrency 4
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import asyncio
+import signal
+from backend.config import settings
+from backend.db.db import SessionLocal
+from backend.logging_config import setup_logging, shutdown_logging
+from backend.services.evaluation_job_service import EvaluationWorker, default_worker_id
+from backend.services.http_client import close_http_client, start_http_client
+
+
+async def main(concurrency: int):
+    await start_http_client()
+    workers = [EvaluationWorker(SessionLocal, worker_id=f"{default_worker_id()}-{i}") for i in range(concurrency)]
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # Finish the job in hand, then exit
+        loop.add_signal_handler(sig, lambda: [worker.stop() for worker in workers])
+
+    print(f"🐟 Running {concurrency} evaluation worker(s), Ctrl+C to stop")
+    try:
+        await asyncio.gather(*(worker.run() for worker in workers))
+    finally:
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Evaluation Job Worker")
+    parser.add_argument("--concurrency", type=int, default=1, help="Jobs processed in parallel by this process")
+
+    args = parser.parse_args()
+    setup_logging(
+        level=settings.LOG_LEVEL,
+        fmt=settings.LOG_FORMAT,
+        logger_levels=settings.LOG_LEVELS,
+        debug_sample_rate=settings.LOG_DEBUG_SAMPLE_RATE,
+        log_payloads=settings.LOG_PAYLOADS,
+        logger_files=settings.LOG_FILES,
+    )
+    try:
+        asyncio.run(main(args.concurrency))
+    finally:
+        shutdown_logging()
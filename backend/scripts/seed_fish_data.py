@@ -34,9 +34,9 @@ def get_local_db_session():
     engine = create_engine(local_db_url)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     
-    # Create tables if they don't exist
-    from backend.db.base import Base
-    Base.metadata.create_all(bind=engine)
+    # Bring the schema up to date if it isn't
+    from backend.db.migrate import run_migrations
+    run_migrations(engine)
     
     return SessionLocal()
 
@@ -1,5 +1,5 @@
-import httpx
 from backend.config import settings
+from backend.services import http_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,44 +21,46 @@ def get_google_oauth_url():
 
 async def get_google_user_info(code: str):
     try:
-        async with httpx.AsyncClient() as client:
-            logger.debug(f"Requesting token with code: {code}")
-            logger.debug(f"Using client_id: {settings.GOOGLE_CLIENT_ID}")
-            logger.debug(f"Using redirect_uri: {settings.GOOGLE_REDIRECT_URI}")
-            
-            token_resp = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "code": code,
-                    "client_id": settings.GOOGLE_CLIENT_ID,
-                    "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                    "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-                    "grant_type": "authorization_code"
-                }
-            )
-            
-            if not token_resp.is_success:
-                logger.error(f"Token request failed: {token_resp.text}")
-                raise Exception(f"Token request failed: {token_resp.text}")
-                
-            token_json = token_resp.json()
-            access_token = token_json.get("access_token")
-            
-            if not access_token:
-                logger.error(f"No access token in response: {token_json}")
-                raise Exception("No access token in response")
+        logger.debug(f"Requesting token with code: {code}")
+        logger.debug(f"Using client_id: {settings.GOOGLE_CLIENT_ID}")
+        logger.debug(f"Using redirect_uri: {settings.GOOGLE_REDIRECT_URI}")
+
+        # The authorization code is single-use, so only retry if the request was never sent
+        token_resp = await http_client.request(
+            "POST",
+            GOOGLE_TOKEN_URL,
+            data={
+                "code": code,
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+                "grant_type": "authorization_code"
+            }
+        )
+
+        if not token_resp.is_success:
+            logger.error(f"Token request failed: {token_resp.text}")
+            raise Exception(f"Token request failed: {token_resp.text}")
+
+        token_json = token_resp.json()
+        access_token = token_json.get("access_token")
+
+        if not access_token:
+            logger.error(f"No access token in response: {token_json}")
+            raise Exception("No access token in response")
+
+        userinfo_resp = await http_client.request(
+            "GET",
+            GOOGLE_USERINFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+
+        if not userinfo_resp.is_success:
+            logger.error(f"Userinfo request failed: {userinfo_resp.text}")
+            raise Exception(f"Userinfo request failed: {userinfo_resp.text}")
+
+        return userinfo_resp.json()
 
-            userinfo_resp = await client.get(
-                GOOGLE_USERINFO_URL,
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
-            
-            if not userinfo_resp.is_success:
-                logger.error(f"Userinfo request failed: {userinfo_resp.text}")
-                raise Exception(f"Userinfo request failed: {userinfo_resp.text}")
-                
-            return userinfo_resp.json()
-            
     except Exception as e:
         logger.error(f"Error in get_google_user_info: {str(e)}")
         raise
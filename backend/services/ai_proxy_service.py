@@ -1,33 +1,126 @@
 import httpx
-from backend.models.aqualayout_model import AquaLayoutCreate
+import json
+from typing import AsyncIterator, Optional
+from backend.config import settings
+from backend.logging_config import log_payload
+from backend.models.aqualayout_model import AquaLayoutBatchEvaluate, AquaLayoutCreate
+from backend.services import http_client
+from backend.services.http_client import DEADLINE_HEADER, DeadlineExceededError
 import logging
 
 logger = logging.getLogger(__name__)
 
-AI_SERVICE_URL = "http://ai-service:8001/evaluate"  # docker-compose name
-
-async def evaluate_with_ai(layout: AquaLayoutCreate):
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            logger.info(f"Sending request to AI service: {AI_SERVICE_URL}")
-            logger.debug(f"Request data: {layout.dict()}")
-            
-            response = await client.post(AI_SERVICE_URL, json=layout.dict())
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.info(f"AI service response: {result}")
-            return result
-            
-        except httpx.ConnectError as e:
-            logger.error(f"Failed to connect to AI service: {e}")
-            return {"status": "error", "response": "AI service is currently unavailable. Please try again later."}
-        except httpx.TimeoutException as e:
-            logger.error(f"AI service timeout: {e}")
-            return {"status": "error", "response": "AI service timed out. Please try again with a simpler request."}
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error from AI service: {e}")
-            return {"status": "error", "response": f"AI service error: {str(e)}"}
-        except Exception as e:
-            logger.error(f"Unexpected error calling AI service: {e}")
-            return {"status": "error", "response": "An unexpected error occurred while processing your request."}
+EVALUATE_URL = f"{settings.AI_SERVICE_URL.rstrip('/')}/evaluate"
+
+# No read timeout for streams: sections can be seconds apart while the model generates
+STREAM_TIMEOUT = httpx.Timeout(settings.HTTP_CLIENT_TIMEOUT, read=None)
+
+DEADLINE_MESSAGE = "The request deadline passed before the AI service answered."
+
+
+def _deadline_headers(deadline: Optional[float]) -> dict:
+    """Forward the caller's deadline along with the request."""
+    return {DEADLINE_HEADER: f"{deadline:.3f}"} if deadline is not None else {}
+
+
+async def request_evaluation(layout: AquaLayoutCreate, deadline: Optional[float] = None) -> dict:
+    """POST one layout to the AI service; transport and HTTP status errors propagate"""
+    logger.info(f"Sending request to AI service: {EVALUATE_URL}")
+    log_payload(logger, "Request data", layout.model_dump())
+
+    # Evaluations have no side effects, so a failed attempt can be retried
+    response = await http_client.request(
+        "POST", EVALUATE_URL, json=layout.model_dump(), idempotent=True,
+        deadline=deadline, headers=_deadline_headers(deadline),
+    )
+    response.raise_for_status()
+
+    result = response.json()
+    logger.info(f"AI service responded with status {result.get('status')}")
+    log_payload(logger, "AI service response", result)
+    return result
+
+
+def error_result(error: Exception) -> dict:
+    """The error payload returned to callers for a failed ``request_evaluation``"""
+    if isinstance(error, DeadlineExceededError):
+        logger.error(f"AI service deadline exceeded: {error}")
+        return {"status": "error", "response": DEADLINE_MESSAGE}
+    if isinstance(error, httpx.ConnectError):
+        logger.error(f"Failed to connect to AI service: {error}")
+        return {"status": "error", "response": "AI service is currently unavailable. Please try again later."}
+    if isinstance(error, httpx.TimeoutException):
+        logger.error(f"AI service timeout: {error}")
+        return {"status": "error", "response": "AI service timed out. Please try again with a simpler request."}
+    if isinstance(error, httpx.HTTPError):
+        logger.error(f"HTTP error from AI service: {error}")
+        return {"status": "error", "response": f"AI service error: {str(error)}"}
+    logger.error(f"Unexpected error calling AI service: {error}")
+    return {"status": "error", "response": "An unexpected error occurred while processing your request."}
+
+
+async def evaluate_with_ai(layout: AquaLayoutCreate, deadline: Optional[float] = None):
+    try:
+        return await request_evaluation(layout, deadline)
+    except Exception as e:
+        return error_result(e)
+
+
+def _sse_error(detail: str) -> bytes:
+    return f"event: error\ndata: {json.dumps({'detail': detail})}\n\n".encode("utf-8")
+
+
+async def stream_evaluation_with_ai(layout: AquaLayoutCreate, deadline: Optional[float] = None) -> AsyncIterator[bytes]:
+    """Forward the AI service's Server-Sent Events stream chunk by chunk."""
+    stream_url = f"{EVALUATE_URL}/stream"
+    try:
+        logger.info(f"Streaming request to AI service: {stream_url}")
+        async with http_client.stream(
+            "POST", stream_url, json=layout.model_dump(), idempotent=True, timeout=STREAM_TIMEOUT,
+            deadline=deadline, headers=_deadline_headers(deadline),
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                logger.error(f"AI service stream rejected: {response.status_code} {body[:200]!r}")
+                try:
+                    detail = json.loads(body).get("detail", "AI service error")
+                except ValueError:
+                    detail = "AI service error"
+                yield _sse_error(str(detail))
+                return
+            async for chunk in response.aiter_raw():
+                yield chunk
+
+    except DeadlineExceededError as e:
+        logger.error(f"AI service deadline exceeded: {e}")
+        yield _sse_error(DEADLINE_MESSAGE)
+    except httpx.ConnectError as e:
+        logger.error(f"Failed to connect to AI service: {e}")
+        yield _sse_error("AI service is currently unavailable. Please try again later.")
+    except httpx.TimeoutException as e:
+        logger.error(f"AI service timeout: {e}")
+        yield _sse_error("AI service timed out. Please try again with a simpler request.")
+    except httpx.HTTPError as e:
+        logger.error(f"HTTP error from AI service stream: {e}")
+        yield _sse_error(f"AI service error: {str(e)}")
+
+
+async def evaluate_batch_with_ai(batch: AquaLayoutBatchEvaluate) -> AsyncIterator[bytes]:
+    """Forward a batch to the AI service and relay its NDJSON results as they complete."""
+    batch_url = f"{EVALUATE_URL}/batch"
+    try:
+        logger.info(f"Sending batch of {len(batch.layouts)} layouts to AI service: {batch_url}")
+        async with http_client.stream(
+            "POST", batch_url, json=batch.model_dump(), idempotent=True, timeout=STREAM_TIMEOUT,
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                logger.error(f"AI service batch rejected: {response.status_code} {body[:200]!r}")
+                yield (json.dumps({"status": "error", "error": f"AI service error ({response.status_code})"}) + "\n").encode("utf-8")
+                return
+            async for chunk in response.aiter_raw():
+                yield chunk
+
+    except httpx.HTTPError as e:
+        logger.error(f"Batch request to AI service failed: {e}")
+        yield (json.dumps({"status": "error", "error": "AI service is currently unavailable."}) + "\n").encode("utf-8")
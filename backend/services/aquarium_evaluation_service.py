@@ -0,0 +1,104 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Optional, Tuple
+from sqlalchemy.orm import Session
+from backend.models.aqualayout_model import AquaLayout, AquaLayoutCreate
+from backend.models.aquarium_evaluation_model import AquariumEvaluation
+from backend.repositories.aquarium_evaluation_repository import AquariumEvaluationRepository
+from backend.services.ai_proxy_service import evaluate_with_ai
+
+logger = logging.getLogger(__name__)
+
+# Bump when the hashed fields change so existing evaluations stop matching
+CONTENT_HASH_VERSION = 1
+
+
+class EvaluationFailedError(Exception):
+    """The AI service did not return an evaluation"""
+    pass
+
+
+def layout_content_hash(layout: AquaLayoutCreate) -> str:
+    """Hash the layout fields that affect its evaluation.
+
+    owner_email and tank_name are left out; fish names are normalised and
+    duplicate species merged, so reordering or renaming the tank keeps the
+    stored evaluation.
+    """
+    fish = {}
+    for entry in layout.fish_data:
+        name = " ".join(entry.name.split()).casefold()
+        fish[name] = fish.get(name, 0) + entry.quantity
+
+    content = {
+        "v": CONTENT_HASH_VERSION,
+        "water_type": layout.water_type.strip().lower(),
+        "dimensions": [layout.tank_length, layout.tank_width, layout.tank_height],
+        "fish": sorted([name, quantity] for name, quantity in fish.items() if quantity > 0),
+        "comments": " ".join((layout.comments or "").split()),
+    }
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def layout_to_request(layout: AquaLayout) -> AquaLayoutCreate:
+    """The stored layout as an evaluation request, in the stored (possibly fractional) centimetres"""
+    return AquaLayoutCreate(
+        owner_email=layout.owner_email,
+        tank_name=layout.tank_name,
+        tank_length=layout.tank_length,
+        tank_width=layout.tank_width,
+        tank_height=layout.tank_height,
+        water_type=layout.water_type,
+        fish_data=layout.fish_data,
+        comments=layout.comments,
+    )
+
+
+class AquariumEvaluationService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = AquariumEvaluationRepository(db)
+
+    def get_current(self, layout_id: int) -> Tuple[Optional[AquaLayout], Optional[AquariumEvaluation]]:
+        """Load a layout and its evaluation in one query.
+
+        The evaluation is only returned while it is not stale and its content
+        hash still matches the layout.
+        """
+        row = self.db.query(AquaLayout, AquariumEvaluation).outerjoin(
+            AquariumEvaluation, AquariumEvaluation.layout_id == AquaLayout.id
+        ).filter(AquaLayout.id == layout_id).first()
+        if row is None:
+            return None, None
+
+        layout, evaluation = row
+        if evaluation is None or evaluation.stale:
+            return layout, None
+        if evaluation.content_hash != layout_content_hash(layout_to_request(layout)):
+            return layout, None
+        return layout, evaluation
+
+    async def evaluate(self, layout: AquaLayout, deadline: Optional[float] = None) -> AquariumEvaluation:
+        """Evaluate a layout through the AI service and store the result.
+
+        Raises:
+            EvaluationFailedError: If the AI service returned an error
+        """
+        request = layout_to_request(layout)
+        content_hash = layout_content_hash(request)
+
+        started = time.perf_counter()
+        result = await evaluate_with_ai(request, deadline=deadline)
+        latency_ms = int((time.perf_counter() - started) * 1000)
+
+        if result.get("status") != "success" or not result.get("response"):
+            raise EvaluationFailedError(result.get("response") or "AI service returned no evaluation")
+
+        logger.info(f"Storing evaluation for layout {layout.id} ({latency_ms} ms, model {result.get('model')})")
+        return await asyncio.to_thread(
+            self.repository.save, layout.id, content_hash, result["response"], result.get("model"), latency_ms
+        )
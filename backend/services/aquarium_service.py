@@ -1,7 +1,13 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from backend.models.aqualayout_model import AquaLayout, AquaLayoutCreate
+from backend.models.aqualayout_model import LITERS_PER_UNIT, AquaLayout, AquaLayoutCreate, VolumeUnit
 from backend.models.tank_maintain_model import TankMaintenance
+from backend.repositories.aqualayout_repository import AquaLayoutRepository
+from backend.repositories.aquarium_evaluation_repository import AquariumEvaluationRepository
+from backend.repositories.layout_fish_repository import LayoutFishRepository
+from backend.repositories.pagination import Page
+from backend.services.response_cache import LAYOUTS_TAG, invalidate, layout_tag, owner_tag
+from typing import Optional
 
 
 class AquariumService:
@@ -17,10 +23,60 @@ class AquariumService:
     def get_by_id(self, layout_id: int):
         return self.db.query(AquaLayout).filter(AquaLayout.id == layout_id).first()
 
+    def get_page(self, email: Optional[str], cursor: Optional[str], limit: int) -> Page[AquaLayout]:
+        return AquaLayoutRepository(self.db).get_page(owner_email=email, cursor=cursor, limit=limit)
+
+    def get_page_versions(self, email: Optional[str], cursor: Optional[str], limit: int) -> Page:
+        """Ids and versions of the layouts get_page() returns, without loading them"""
+        return AquaLayoutRepository(self.db).get_page_versions(owner_email=email, cursor=cursor, limit=limit)
+
+    def get_version(self, layout_id: int) -> Optional[int]:
+        return AquaLayoutRepository(self.db).get_version(layout_id)
+
+    def get_with_fish(self, fish_name: str):
+        return AquaLayoutRepository(self.db).get_layouts_with_fish(fish_name)
+
+    def search_by_tank_name(self, search_term: str, limit: int):
+        return AquaLayoutRepository(self.db).search_by_tank_name(search_term, limit)
+
+    def get_by_volume(
+        self,
+        min_volume: Optional[float],
+        max_volume: Optional[float],
+        unit: VolumeUnit,
+        water_type: Optional[str],
+        cursor: Optional[str],
+        limit: int,
+    ) -> Page[AquaLayout]:
+        liters = LITERS_PER_UNIT[unit]
+        return AquaLayoutRepository(self.db).get_volume_page(
+            min_liters=None if min_volume is None else min_volume * liters,
+            max_liters=None if max_volume is None else max_volume * liters,
+            water_type=water_type,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    def get_volume_histogram(self, bucket_size: float, unit: VolumeUnit, water_type: Optional[str] = None):
+        rows = AquaLayoutRepository(self.db).get_volume_histogram(bucket_size * LITERS_PER_UNIT[unit], water_type)
+        return [
+            {
+                "water_type": row.water_type,
+                "min_volume": row.bucket * bucket_size,
+                "max_volume": (row.bucket + 1) * bucket_size,
+                "tank_count": row.tank_count,
+            }
+            for row in rows
+        ]
+
     def create(self, layout_data: AquaLayoutCreate):
         layout = AquaLayout(**layout_data.dict())
         self.db.add(layout)
+        # Species rows go in with the layout, in the same transaction
+        self.db.flush()
+        LayoutFishRepository(self.db).sync(layout.id, layout.fish_data)
         self.db.commit()
+        invalidate(LAYOUTS_TAG, owner_tag(layout.owner_email))
         self.db.refresh(layout)
         return layout
 
@@ -28,9 +84,14 @@ class AquariumService:
         layout = self.get_by_id(layout_id)
         if not layout:
             return None
+        previous_owner = layout.owner_email
         for field, value in layout_data.dict().items():
             setattr(layout, field, value)
+        LayoutFishRepository(self.db).sync(layout_id, layout.fish_data)
+        # The stored evaluation no longer describes this layout
+        AquariumEvaluationRepository(self.db).mark_stale(layout_id)
         self.db.commit()
+        invalidate(LAYOUTS_TAG, layout_tag(layout_id), owner_tag(previous_owner), owner_tag(layout_data.owner_email))
         self.db.refresh(layout)
         return layout
 
@@ -44,8 +105,12 @@ class AquariumService:
             self.db.query(TankMaintenance).filter(
                 TankMaintenance.layout_id == layout_id
             ).delete()
+
+            # And its stored AI evaluation and species rows
+            AquariumEvaluationRepository(self.db).delete_by_layout_id(layout_id)
+            LayoutFishRepository(self.db).delete_by_layout_id(layout_id)
             
-            # Flush to execute the maintenance deletions immediately
+            # Flush to execute the dependent deletions immediately
             self.db.flush()
             
             # Then delete the layout itself
@@ -53,6 +118,7 @@ class AquariumService:
             
             # Commit all deletions
             self.db.commit()
+            invalidate(LAYOUTS_TAG, layout_tag(layout_id), owner_tag(layout.owner_email))
             
             return layout
         except IntegrityError as e:
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+import httpx
+from typing import Callable, List, Optional
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.models.aqualayout_model import AquaLayoutCreate
+from backend.models.evaluation_job_model import EvaluationJob
+from backend.repositories.evaluation_job_repository import EvaluationJobRepository
+from backend.services.ai_proxy_service import error_result, request_evaluation
+
+logger = logging.getLogger(__name__)
+
+# Client errors worth another attempt: the AI service may answer differently later
+RETRYABLE_CLIENT_ERRORS = {408, 429}
+
+
+def is_permanent(error: Exception) -> bool:
+    """Whether retrying cannot help: the AI service rejected the request itself"""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return False
+    status = error.response.status_code
+    return 400 <= status < 500 and status not in RETRYABLE_CLIENT_ERRORS
+
+
+class EvaluationJobService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = EvaluationJobRepository(db)
+
+    def enqueue(self, layout: AquaLayoutCreate) -> EvaluationJob:
+        return self.repository.enqueue(layout.model_dump(), max_attempts=settings.EVALUATION_JOB_MAX_ATTEMPTS)
+
+    def get_by_id(self, job_id: int) -> Optional[EvaluationJob]:
+        return self.repository.get_by_id(job_id)
+
+    def get_queue_stats(self) -> dict:
+        return self.repository.count_by_status()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class EvaluationWorker:
+    """
+    Drain the evaluation_jobs queue.
+
+    Each loop leases one job (database calls run in a thread, with a session
+    per call), evaluates it through the AI service and stores the outcome.
+    Failed attempts are requeued with exponential backoff, except requests
+    the AI service rejects with a 4xx, which fail at once. A job whose worker
+    dies is picked up again once its lease expires.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        worker_id: str = None,
+        lease_seconds: float = None,
+        poll_interval: float = None,
+        retry_delay: float = None,
+    ):
+        self.session_factory = session_factory
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds or settings.EVALUATION_JOB_LEASE_SECONDS
+        self.poll_interval = poll_interval or settings.EVALUATION_JOB_POLL_INTERVAL
+        self.retry_delay = retry_delay if retry_delay is not None else settings.EVALUATION_JOB_RETRY_DELAY
+        self._stopping = asyncio.Event()
+
+    def _with_repository(self, operation):
+        db = self.session_factory()
+        try:
+            return operation(EvaluationJobRepository(db))
+        finally:
+            db.close()
+
+    def _claim(self) -> Optional[dict]:
+        def claim(repository):
+            job = repository.claim(self.worker_id, self.lease_seconds)
+            return None if job is None else {"id": job.id, "payload": job.payload, "attempts": job.attempts}
+        return self._with_repository(claim)
+
+    async def run_once(self) -> bool:
+        """Process one job; returns False if the queue was empty."""
+        job = await asyncio.to_thread(self._claim)
+        if job is None:
+            return False
+
+        logger.info(f"Worker {self.worker_id} evaluating job {job['id']} (attempt {job['attempts']})")
+        permanent = False
+        try:
+            result = await request_evaluation(AquaLayoutCreate(**job["payload"]))
+            error = result.get("response") if result.get("status") == "error" else None
+        except Exception as e:
+            result, error, permanent = None, error_result(e)["response"], is_permanent(e)
+
+        if error is None:
+            stored = await asyncio.to_thread(
+                self._with_repository, lambda repository: repository.complete(job["id"], self.worker_id, result)
+            )
+        else:
+            delay = self.retry_delay * (2 ** (job["attempts"] - 1))
+            logger.warning(f"Job {job['id']} attempt {job['attempts']} failed{' permanently' if permanent else ''}: {error}")
+            stored = await asyncio.to_thread(
+                self._with_repository,
+                lambda repository: repository.fail(job["id"], self.worker_id, error, delay, permanent=permanent),
+            )
+        if not stored:
+            logger.warning(f"Job {job['id']} lease was lost before its result could be stored")
+        return True
+
+    async def run(self) -> None:
+        """Process jobs until stop() is called, sleeping while the queue is empty."""
+        logger.info(f"Evaluation worker {self.worker_id} started")
+        while not self._stopping.is_set():
+            try:
+                if await self.run_once():
+                    continue
+            except Exception as e:
+                logger.error(f"Evaluation worker {self.worker_id} error: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        logger.info(f"Evaluation worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+
+_in_process_workers: List[EvaluationWorker] = []
+_in_process_tasks: List[asyncio.Task] = []
+
+
+async def start_in_process_workers(session_factory: Callable[[], Session]) -> None:
+    """Start EVALUATION_JOB_WORKERS worker tasks inside the API process."""
+    for _ in range(settings.EVALUATION_JOB_WORKERS):
+        worker = EvaluationWorker(session_factory)
+        _in_process_workers.append(worker)
+        _in_process_tasks.append(asyncio.create_task(worker.run()))
+
+
+async def stop_in_process_workers() -> None:
+    """Let in-process workers finish their current job, then stop them."""
+    for worker in _in_process_workers:
+        worker.stop()
+    if _in_process_tasks:
+        await asyncio.gather(*_in_process_tasks, return_exceptions=True)
+    _in_process_workers.clear()
+    _in_process_tasks.clear()
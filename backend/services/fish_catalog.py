@@ -0,0 +1,156 @@
+import hashlib
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.models.fish_model import Fish, FishResponse
+from backend.repositories.fish_repository import FISH_ORDER, FishRepository
+from backend.repositories.ngram_index import NGramIndex
+from backend.repositories.pagination import Page
+
+
+class _Node:
+    __slots__ = ("children", "start", "end")
+
+    def __init__(self, start: int, end: int):
+        self.children: Dict[str, "_Node"] = {}
+        self.start = start
+        self.end = end
+
+
+class PrefixTrie:
+    """
+    Case-insensitive prefix lookup over a fixed set of fish.
+
+    Fish are kept sorted by lower-cased name, so the names below any node form
+    one contiguous run, stored on the node as [start, end). A lookup walks one
+    node per character of the prefix and slices the run; no per-query sorting.
+    """
+
+    def __init__(self, fish: Sequence[FishResponse]):
+        self._fish = tuple(sorted(fish, key=lambda item: (item.name.lower(), item.name, item.id)))
+        self._root = _Node(0, len(self._fish))
+        for position, item in enumerate(self._fish):
+            node = self._root
+            for char in item.name.lower():
+                child = node.children.get(char)
+                if child is None:
+                    node.children[char] = child = _Node(position, position + 1)
+                else:
+                    child.end = position + 1
+                node = child
+
+    def find(self, prefix: str, limit: int) -> List[FishResponse]:
+        """Fish whose name starts with ``prefix`` (case-insensitive), alphabetically"""
+        node = self._root
+        for char in prefix.lower():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return list(self._fish[node.start:min(node.end, node.start + limit)])
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """One immutable copy of fish_catalog with its lookups, shared by every request"""
+
+    version: int
+    digest: str  # of the catalog's content, the same in every process that loaded it
+    fish: Tuple[FishResponse, ...]  # in FISH_ORDER
+    by_id: Mapping[int, FishResponse]
+    by_name: Mapping[str, FishResponse]
+    by_water_type: Mapping[str, Tuple[FishResponse, ...]]
+    names: PrefixTrie
+    name_index: NGramIndex
+
+    @classmethod
+    def load(cls, db: Session) -> "CatalogSnapshot":
+        # Version first: a write committed between the two reads then leaves
+        # rows newer than the version, and the next check loads them again.
+        # The other way round, the snapshot could keep stale rows for good.
+        version = FishRepository(db).get_catalog_version()
+        fish = tuple(sorted(
+            (FishResponse.model_validate(row) for row in db.scalars(select(Fish))), key=FISH_ORDER.key,
+        ))
+        by_water_type: Dict[str, List[FishResponse]] = {}
+        for item in fish:
+            by_water_type.setdefault(item.water_type, []).append(item)
+        name_index = NGramIndex()
+        name_index.load((item.id, item.name) for item in fish)
+        content = repr([(item.id, item.name, item.image_url, item.water_type) for item in fish]).encode()
+        return cls(
+            version=version,
+            digest=hashlib.blake2b(content, digest_size=16).hexdigest(),
+            fish=fish,
+            by_id=MappingProxyType({item.id: item for item in fish}),
+            by_name=MappingProxyType({item.name: item for item in fish}),
+            by_water_type=MappingProxyType({water_type: tuple(items) for water_type, items in by_water_type.items()}),
+            names=PrefixTrie(fish),
+            name_index=name_index,
+        )
+
+    def page(self, cursor: Optional[str], limit: int) -> Page[FishResponse]:
+        return FISH_ORDER.page_of(self.fish, cursor, limit)
+
+    def search(self, term: str, limit: int) -> List[FishResponse]:
+        return [self.by_id[fish_id] for fish_id in self.name_index.search(term, limit)]
+
+    def autocomplete(self, prefix: str, limit: int) -> List[FishResponse]:
+        return self.names.find(prefix, limit)
+
+
+class FishCatalog:
+    """
+    The current CatalogSnapshot of each engine.
+
+    Reads compare the snapshot's version with catalog_versions at most every
+    FISH_CATALOG_CHECK_SECONDS and load a new snapshot only when it changed;
+    in between they never reach the database. FishService writes load one
+    right after they commit. A new snapshot replaces the old one whole, so a
+    request sees either catalog, never a mix.
+    """
+
+    def __init__(self):
+        self._current: "weakref.WeakKeyDictionary[Engine, Tuple[CatalogSnapshot, float]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> CatalogSnapshot:
+        current = self._current.get(db.get_bind())
+        if current is None:
+            return self.reload(db)
+        snapshot, checked_at = current
+        now = time.monotonic()
+        if now - checked_at < settings.FISH_CATALOG_CHECK_SECONDS:
+            return snapshot
+        version = FishRepository(db).get_catalog_version()
+        if version == snapshot.version:
+            self._current[db.get_bind()] = (snapshot, now)
+            return snapshot
+        return self.reload(db, version)
+
+    def reload(self, db: Session, version: Optional[int] = None) -> CatalogSnapshot:
+        """Load a new snapshot, unless another thread already loaded ``version``"""
+        engine = db.get_bind()
+        with self._lock:
+            current = self._current.get(engine)
+            if current is not None and version is not None and current[0].version >= version:
+                return current[0]
+            snapshot = CatalogSnapshot.load(db)
+            # A session reading an older database snapshot must not roll the catalog back
+            if current is not None and current[0].version > snapshot.version:
+                return current[0]
+            self._current[engine] = (snapshot, time.monotonic())
+        return snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._current.clear()
+
+
+FISH_CATALOG = FishCatalog()
@@ -1,33 +1,52 @@
 from sqlalchemy.orm import Session
-from backend.models.fish_model import Fish, FishCreate
+from backend.config import settings
+from backend.models.fish_model import Fish, FishCreate, FishResponse
 from backend.repositories.fish_repository import FishRepository
+from backend.repositories.layout_fish_repository import LayoutFishRepository
+from backend.repositories.pagination import Page
+from backend.services.fish_catalog import FISH_CATALOG, CatalogSnapshot
+from backend.services.response_cache import FISH_TAG, invalidate
 from typing import List, Optional
 
 
 class FishService:
+    """Catalog reads come from the in-memory snapshot (see fish_catalog.py); writes go to the database."""
+
     def __init__(self, db: Session):
         self.db = db
         self.repository = FishRepository(db)
 
-    def get_all(self) -> List[Fish]:
+    @property
+    def catalog(self) -> CatalogSnapshot:
+        return FISH_CATALOG.get(self.db)
+
+    def get_all(self) -> List[FishResponse]:
         """Get all fish from the catalog, ordered by name"""
-        return self.repository.get_all()
+        return list(self.catalog.fish)
+
+    def get_page(self, cursor: Optional[str], limit: int) -> Page[FishResponse]:
+        """One page of the catalog, ordered by name"""
+        return self.catalog.page(cursor, limit)
 
-    def get_by_id(self, fish_id: int) -> Optional[Fish]:
+    def get_by_id(self, fish_id: int) -> Optional[FishResponse]:
         """Get a fish by ID"""
-        return self.repository.get_by_id(fish_id)
+        return self.catalog.by_id.get(fish_id)
     
-    def get_by_name(self, name: str) -> Optional[Fish]:
+    def get_by_name(self, name: str) -> Optional[FishResponse]:
         """Get a fish by exact name match"""
-        return self.repository.get_by_name(name)
+        return self.catalog.by_name.get(name)
 
-    def get_by_water_type(self, water_type: str) -> List[Fish]:
+    def get_by_water_type(self, water_type: str) -> List[FishResponse]:
         """Get fish by water type (freshwater or saltwater)"""
-        return self.repository.get_by_water_type(water_type)
+        return list(self.catalog.by_water_type.get(water_type, ()))
 
-    def search_by_name(self, search_term: str) -> List[Fish]:
-        """Search fish by name (partial match)"""
-        return self.repository.search_by_name(search_term)
+    def search_by_name(self, search_term: str, limit: int = settings.SEARCH_LIMIT_DEFAULT) -> List[FishResponse]:
+        """Search fish by name (partial match), closest names first"""
+        return self.catalog.search(search_term, limit)
+
+    def autocomplete(self, prefix: str, limit: int = settings.SEARCH_LIMIT_DEFAULT) -> List[FishResponse]:
+        """Fish whose name starts with ``prefix`` (case-insensitive), alphabetically"""
+        return self.catalog.autocomplete(prefix, limit)
 
     def create(self, fish_data: FishCreate) -> Fish:
         """Create a new fish entry"""
@@ -37,16 +56,35 @@ class FishService:
             image_filename = fish_data.name.lower().replace(" ", "_").replace("-", "_") + ".jpg"
             fish_data.image_url = f"/static/images/fish/{fish_data.water_type}/{image_filename}"
         
-        return self.repository.create(fish_data)
+        fish = self.repository.create(fish_data)
+        FISH_CATALOG.reload(self.db)
+        invalidate(FISH_TAG)
+        return fish
 
     def update(self, fish_id: int, fish_data: FishCreate) -> Optional[Fish]:
         """Update an existing fish entry"""
-        return self.repository.update(fish_id, fish_data)
+        fish = self.repository.update(fish_id, fish_data)
+        if fish:
+            FISH_CATALOG.reload(self.db)
+            invalidate(FISH_TAG)
+        return fish
 
     def delete(self, fish_id: int) -> bool:
         """Delete a fish from the catalog"""
-        return self.repository.delete(fish_id)
+        deleted = self.repository.delete(fish_id)
+        if deleted:
+            FISH_CATALOG.reload(self.db)
+            invalidate(FISH_TAG)
+        return deleted
 
     def get_count(self) -> int:
         """Get total number of fish in catalog"""
-        return self.repository.get_count()
+        return len(self.catalog.fish)
+
+    def get_popular_species(self, limit: int = 10) -> List[dict]:
+        """Species kept in the most tanks, with their total stock"""
+        return LayoutFishRepository(self.db).get_popular_species(limit)
+
+    def get_species_stock(self, fish_id: int) -> Optional[dict]:
+        """How many tanks keep a species, and how many fish in total"""
+        return LayoutFishRepository(self.db).get_species_stock(fish_id)
@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import httpx
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Absolute deadline (Unix time in seconds) for the whole request, set by the caller
+DEADLINE_HEADER = "X-Request-Deadline"
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+# Failures where the request never reached the server, safe to retry for any method
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Failures after the request may have been processed, retried only when idempotent
+TRANSIENT_ERRORS = (httpx.ReadTimeout, httpx.ReadError, httpx.RemoteProtocolError, httpx.WriteError)
+
+
+class DeadlineExceededError(Exception):
+    """The caller's deadline passed before the request could complete"""
+    pass
+
+
+class _Metrics:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.deadline_exceeded = 0
+        self.in_flight = 0
+
+
+_client: Optional[httpx.AsyncClient] = None
+_transport: Optional[httpx.AsyncHTTPTransport] = None
+metrics = _Metrics()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_client(transport: httpx.AsyncBaseTransport = None) -> httpx.AsyncClient:
+    """Create the pooled client from settings (``transport`` is for tests)."""
+    global _transport
+    http2 = settings.HTTP_CLIENT_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("HTTP_CLIENT_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+        http2 = False
+
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+            ),
+        )
+    _transport = transport if isinstance(transport, httpx.AsyncHTTPTransport) else None
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(settings.HTTP_CLIENT_TIMEOUT, connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT),
+    )
+
+
+async def start_http_client(transport: httpx.AsyncBaseTransport = None) -> None:
+    """Create the application-lifetime client (called on startup)."""
+    global _client
+    if _client is None:
+        _client = build_client(transport)
+        logger.info("Shared HTTP client started")
+
+
+async def close_http_client() -> None:
+    """Close the pooled connections (called on shutdown)."""
+    global _client, _transport
+    if _client is not None:
+        await _client.aclose()
+        _client, _transport = None, None
+        logger.info("Shared HTTP client closed")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared client; created on first use outside the app (scripts, tests)."""
+    global _client
+    if _client is None:
+        _client = build_client()
+    return _client
+
+
+def parse_deadline(value: Optional[str]) -> Optional[float]:
+    """Parse a deadline header value; invalid values are ignored."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {DEADLINE_HEADER} header: {value!r}")
+        return None
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else deadline - time.time()
+
+
+def _backoff(attempt: int) -> float:
+    """Full jitter: a random delay up to the exponential backoff for this attempt."""
+    ceiling = min(settings.HTTP_CLIENT_RETRY_BACKOFF_MAX, settings.HTTP_CLIENT_RETRY_BACKOFF * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def _attempt_timeout(timeout: Optional[httpx.Timeout], remaining: Optional[float]) -> httpx.Timeout:
+    timeout = timeout or get_http_client().timeout
+    if remaining is None:
+        return timeout
+
+    def cap(value):
+        return remaining if value is None else min(value, remaining)
+
+    return httpx.Timeout(
+        connect=cap(timeout.connect), read=cap(timeout.read), write=cap(timeout.write), pool=cap(timeout.pool)
+    )
+
+
+async def request(
+    method: str,
+    url: str,
+    *,
+    idempotent: bool = None,
+    deadline: float = None,
+    timeout: httpx.Timeout = None,
+    stream: bool = False,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send a request on the shared client with jittered retries.
+
+    Requests that never reached the server are always retried. Timeouts,
+    dropped connections and 502/503/504 answers are retried only for
+    idempotent requests (GET/HEAD/OPTIONS/PUT/DELETE by default). Nothing is
+    attempted or retried past ``deadline``, and each attempt's timeout is
+    capped to the time left.
+
+    Args:
+        method: HTTP method
+        url: Absolute URL
+        idempotent: Override the method-based idempotency guess
+        deadline: Absolute Unix time by which the request must finish
+        timeout: Per-attempt timeout (defaults to the client's)
+        stream: Return without reading the body; the caller must close it
+        **kwargs: Passed to ``httpx.AsyncClient.build_request``
+
+    Returns:
+        httpx.Response (possibly an error status after the last attempt)
+
+    Raises:
+        DeadlineExceededError: If the deadline passed
+        httpx.HTTPError: If the last attempt failed
+    """
+    client = get_http_client()
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+    attempts = settings.HTTP_CLIENT_RETRIES + 1
+
+    for attempt in range(attempts):
+        remaining = _remaining(deadline)
+        if remaining is not None and remaining <= 0:
+            metrics.deadline_exceeded += 1
+            raise DeadlineExceededError(f"Deadline exceeded before {method} {url}")
+
+        last_attempt = attempt == attempts - 1
+        metrics.requests += 1
+        metrics.in_flight += 1
+        try:
+            built = client.build_request(method, url, timeout=_attempt_timeout(timeout, remaining), **kwargs)
+            response = await client.send(built, stream=stream)
+        except NOT_SENT_ERRORS + TRANSIENT_ERRORS as e:
+            retryable = isinstance(e, NOT_SENT_ERRORS) or idempotent
+            if last_attempt or not retryable:
+                metrics.failures += 1
+                raise
+            logger.warning(f"{method} {url} failed ({type(e).__name__}), retrying")
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or not idempotent or last_attempt:
+                return response
+            await response.aclose()
+            logger.warning(f"{method} {url} returned {response.status_code}, retrying")
+        finally:
+            metrics.in_flight -= 1
+
+        delay = _backoff(attempt)
+        remaining = _remaining(deadline)
+        if remaining is not None and remaining <= delay:
+            metrics.deadline_exceeded += 1
+            raise DeadlineExceededError(f"Deadline exceeded while retrying {method} {url}")
+        metrics.retries += 1
+        await asyncio.sleep(delay)
+
+
+@asynccontextmanager
+async def stream(method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+    """``request(..., stream=True)`` as a context manager that closes the response."""
+    response = await request(method, url, stream=True, **kwargs)
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+
+def pool_stats() -> dict:
+    """Connection pool and retry counters for the shared client."""
+    stats = {
+        "started": _client is not None,
+        "http2": bool(_client is not None and settings.HTTP_CLIENT_HTTP2 and _http2_available()),
+        "max_connections": settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+        "requests": metrics.requests,
+        "retries": metrics.retries,
+        "failures": metrics.failures,
+        "deadline_exceeded": metrics.deadline_exceeded,
+        "in_flight": metrics.in_flight,
+    }
+    pool = getattr(_transport, "_pool", None)
+    if pool is not None:
+        connections = pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        stats.update(connections=len(connections), idle_connections=idle, active_connections=len(connections) - idle)
+    return stats
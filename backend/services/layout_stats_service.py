@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.models.aqualayout_model import AquaLayout
+from backend.models.layout_stats_model import LayoutStat
+from backend.repositories.layout_fish_repository import LayoutFishRepository
+from backend.repositories.layout_stats_repository import OWNERS, TOTAL, WATER_TYPE, Drift, LayoutStatsRepository
+
+logger = logging.getLogger(__name__)
+
+TOP_SPECIES = 10
+
+# (expires at, statistics), shared by every request of the process
+_cached: Optional[Tuple[float, dict]] = None
+_cache_lock = threading.Lock()
+
+
+def clear_statistics_cache() -> None:
+    global _cached
+    with _cache_lock:
+        _cached = None
+
+
+class LayoutStatsService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = LayoutStatsRepository(db)
+
+    def get_statistics(self) -> dict:
+        """Tank statistics from the counters, cached for STATS_CACHE_SECONDS"""
+        global _cached
+        now = time.monotonic()
+        cached = _cached
+        if cached and cached[0] > now:
+            return cached[1]
+        statistics = self.compute_statistics()
+        with _cache_lock:
+            _cached = (now + settings.STATS_CACHE_SECONDS, statistics)
+        return statistics
+
+    def compute_statistics(self) -> dict:
+        """Counter reads, plus the top species from layout_fish"""
+        by_water_type = self.repository.get_scope(WATER_TYPE)
+        top = LayoutFishRepository(self.db).get_popular_species(TOP_SPECIES)
+        return {
+            "total_layouts": self.repository.get(TOTAL),
+            "freshwater_tanks": by_water_type.get("freshwater", 0),
+            "saltwater_tanks": by_water_type.get("saltwater", 0),
+            "unique_users": self.repository.get(OWNERS),
+            "by_water_type": by_water_type,
+            "top_species": [
+                {"name": row["name"], "tank_count": row["tank_count"], "total_quantity": row["total_quantity"]}
+                for row in top
+            ],
+        }
+
+    def needs_initial_count(self) -> bool:
+        """Layouts exist but the counters were never filled (e.g. right after the migration)"""
+        has_layouts = self.db.scalar(select(AquaLayout.id).limit(1)) is not None
+        return has_layouts and self.db.scalar(select(LayoutStat.scope).limit(1)) is None
+
+    def reconcile(self, fix: bool = True) -> Drift:
+        """Recount and (with ``fix``) correct the counters; returns what was off
+
+        Runs its own transactions, so anything pending on the session is
+        committed first: a read-only one for the recount, then a short one
+        that writes only the counters that were off.
+        """
+        self.db.commit()
+        try:
+            drift, generation = self.repository.drift()
+        finally:
+            self.db.rollback()
+        if not drift:
+            return drift
+
+        applied = False
+        if fix:
+            try:
+                applied = self.repository.correct(drift, generation)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+        sample = ", ".join(f"{scope}:{key} {stored}->{expected}" for (scope, key), (stored, expected) in list(drift.items())[:5])
+        outcome = "; fixed" if applied else "; already fixed by another reconcile" if fix else ""
+        logger.warning(f"Layout statistics drifted on {len(drift)} counters ({sample}){outcome}")
+        return drift
+
+
+class StatsReconciler:
+    """Fill empty layout counters, then recount them every ``interval`` seconds (0: never), in a thread."""
+
+    def __init__(self, session_factory: Callable[[], Session], interval: float = None):
+        self.session_factory = session_factory
+        self.interval = settings.STATS_RECONCILE_INTERVAL if interval is None else interval
+        self._stopping = asyncio.Event()
+
+    def _run(self, initial: bool) -> None:
+        db = self.session_factory()
+        try:
+            service = LayoutStatsService(db)
+            if not initial or service.needs_initial_count():
+                service.reconcile()
+        finally:
+            db.close()
+
+    async def run(self) -> None:
+        initial = True
+        while not self._stopping.is_set():
+            try:
+                await asyncio.to_thread(self._run, initial)
+            except SQLAlchemyError as e:
+                logger.error(f"Layout statistics reconcile failed: {e}")
+            if self.interval <= 0:
+                return
+            initial = False
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+
+_reconciler: Optional[StatsReconciler] = None
+_reconciler_task: Optional[asyncio.Task] = None
+
+
+async def start_stats_reconciler(session_factory: Callable[[], Session]) -> None:
+    """Fill the counters if they are empty; recount them every STATS_RECONCILE_INTERVAL seconds if that is set."""
+    global _reconciler, _reconciler_task
+    _reconciler = StatsReconciler(session_factory)
+    _reconciler_task = asyncio.create_task(_reconciler.run())
+
+
+async def stop_stats_reconciler() -> None:
+    global _reconciler, _reconciler_task
+    if _reconciler:
+        _reconciler.stop()
+        await asyncio.gather(_reconciler_task, return_exceptions=True)
+    _reconciler, _reconciler_task = None, None
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, Mapping, Optional
+from backend.config import settings
+
+# Tags of cached responses; write paths invalidate the ones they affect
+LAYOUTS_TAG = "layouts"  # the global layout list
+FISH_TAG = "fish"
+
+
+def owner_tag(owner_email: str) -> str:
+    """Everything listed per owner: their layouts and maintenance entries"""
+    return f"owner:{owner_email}"
+
+
+def layout_tag(layout_id: int) -> str:
+    """One layout and the entries listed under it (maintenance)"""
+    return f"layout:{layout_id}"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    headers: Mapping[str, str]
+    tags: FrozenSet[str]
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Serialized GET responses of this process, keyed by URL and tagged with
+    the entities they were built from.
+
+    Writes call invalidate() with the tags they touch, after they commit. A
+    response whose tags were invalidated while it was being built is not
+    stored (see token()), so a slow read cannot put back what a write just
+    removed. Hits cost no query, so writes made by other processes are seen
+    once the entry expires after RESPONSE_CACHE_TTL_SECONDS, or at once by a
+    client revalidating (see get()'s ``current_etag``). Entries are evicted
+    least recently used once their bodies add up to RESPONSE_CACHE_MAX_BYTES.
+    """
+
+    # Invalidation times kept per tag; older ones are folded into one floor
+    MAX_TRACKED_TAGS = 10_000
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._keys_by_tag: Dict[str, set] = {}
+        self._bytes = 0
+        self._clock = 0
+        self._invalidated_at: "OrderedDict[str, int]" = OrderedDict()
+        self._floor = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._evictions = 0
+
+    def _count(self, route: str, event: str) -> None:
+        stats = self._stats.setdefault(route, {"hits": 0, "misses": 0, "stale": 0, "stores": 0})
+        stats[event] += 1
+
+    def get(
+        self, route: str, key: str, current_etag: Optional[Callable[[], Optional[str]]] = None,
+    ) -> Optional[CachedResponse]:
+        """The stored response, unless it expired or ``current_etag()`` no longer matches its ETag
+
+        ``current_etag`` reads row versions (see routes/conditional.py); pass
+        it only for requests that carry If-None-Match. It is called without
+        the lock held. A mismatch drops the entry and counts as a miss, and
+        as ``stale``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                entry = None
+        stale = entry is not None and current_etag is not None and current_etag() != entry.headers.get("etag")
+        with self._lock:
+            if stale:
+                # Changed since it was stored, by a write this process did not see
+                if self._entries.get(key) is entry:
+                    self._remove(key)
+                self._count(route, "stale")
+                entry = None
+            if entry is None:
+                self._count(route, "misses")
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._count(route, "hits")
+            return entry
+
+    def token(self) -> int:
+        """Take before reading the database; pass to put()"""
+        with self._lock:
+            return self._clock
+
+    def put(self, route: str, key: str, body: bytes, headers: Mapping[str, str], tags: Iterable[str], token: int) -> bool:
+        """Store a response built from reads that started at ``token``, unless its tags changed since"""
+        tags = frozenset(tags)
+        if len(body) > self.max_bytes:  # also when the cache is disabled (0 bytes)
+            return False
+        with self._lock:
+            if any(self._invalidated_at.get(tag, self._floor) > token for tag in tags):
+                return False
+            self._remove(key)
+            self._entries[key] = CachedResponse(body, dict(headers), tags, time.monotonic() + self.ttl)
+            self._bytes += len(body)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+            self._count(route, "stores")
+        return True
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every response tagged with any of ``tags``; called after the write commits"""
+        with self._lock:
+            self._clock += 1
+            for tag in tags:
+                self._invalidated_at[tag] = self._clock
+                self._invalidated_at.move_to_end(tag)
+                for key in self._keys_by_tag.pop(tag, ()):
+                    self._remove(key)
+            while len(self._invalidated_at) > self.MAX_TRACKED_TAGS:
+                _, self._floor = self._invalidated_at.popitem(last=False)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._bytes = 0
+            self._stats.clear()
+            self._evictions = 0
+
+    def summary(self) -> dict:
+        """Size of the cache and hits, misses (stale ones too) and hit ratio per route since startup"""
+        with self._lock:
+            routes = {}
+            for route, stats in sorted(self._stats.items()):
+                lookups = stats["hits"] + stats["misses"]
+                routes[route] = {**stats, "hit_ratio": round(stats["hits"] / lookups, 3) if lookups else 0.0}
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "routes": routes,
+            }
+
+
+RESPONSE_CACHE = ResponseCache(settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+def invalidate(*tags: str) -> None:
+    RESPONSE_CACHE.invalidate(*tags)
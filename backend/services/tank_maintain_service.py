@@ -2,7 +2,10 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from backend.models.tank_maintain_model import TankMaintenanceCreate
 from backend.repositories.tank_maintain_repository import TankMaintenanceRepository
+from backend.repositories.pagination import Page
 from backend.services.aquarium_service import AquariumService
+from backend.services.response_cache import invalidate, layout_tag, owner_tag
+from typing import Optional
 
 MAINTENANCE_NOT_FOUND = "Maintenance entry not found"
 LAYOUT_NOT_FOUND = "Aquarium layout not found"
@@ -29,6 +32,25 @@ class TankMaintenanceService:
     def get_by_owner(self, owner_email: str):
         return self.repository.get_by_owner(owner_email)
 
+    def get_page_by_layout(self, layout_id: int, cursor: Optional[str], limit: int) -> Page:
+        # Verify layout exists
+        layout = self.aquarium_service.get_by_id(layout_id)
+        if not layout:
+            raise HTTPException(status_code=404, detail=LAYOUT_NOT_FOUND)
+        return self.repository.get_page(layout_id=layout_id, cursor=cursor, limit=limit)
+
+    def get_page_by_owner(self, owner_email: str, cursor: Optional[str], limit: int) -> Page:
+        return self.repository.get_page(owner_email=owner_email, cursor=cursor, limit=limit)
+
+    def get_version(self, maintenance_id: int) -> Optional[int]:
+        return self.repository.get_version(maintenance_id)
+
+    def get_page_versions(
+        self, layout_id: Optional[int], owner_email: Optional[str], cursor: Optional[str], limit: int
+    ) -> Page:
+        """Ids and versions of the entries a get_page_by_* call returns, without loading them"""
+        return self.repository.get_page_versions(layout_id=layout_id, owner_email=owner_email, cursor=cursor, limit=limit)
+
     def create(self, maintenance_data: TankMaintenanceCreate):
         # Verify layout exists
         layout = self.aquarium_service.get_by_id(maintenance_data.layout_id)
@@ -39,7 +61,9 @@ class TankMaintenanceService:
         if layout.owner_email != maintenance_data.owner_email:
             raise HTTPException(status_code=403, detail="You can only create maintenance entries for your own aquariums")
         
-        return self.repository.create(maintenance_data.dict())
+        maintenance = self.repository.create(maintenance_data.dict())
+        invalidate(layout_tag(maintenance_data.layout_id), owner_tag(maintenance_data.owner_email))
+        return maintenance
 
     def update(self, maintenance_id: int, maintenance_data: TankMaintenanceCreate):
         maintenance = self.get_by_id(maintenance_id)
@@ -54,7 +78,10 @@ class TankMaintenanceService:
             if not layout:
                 raise HTTPException(status_code=404, detail=LAYOUT_NOT_FOUND)
         
-        return self.repository.update(maintenance_id, maintenance_data.dict())
+        previous_layout_id = maintenance.layout_id
+        updated = self.repository.update(maintenance_id, maintenance_data.dict())
+        invalidate(layout_tag(previous_layout_id), layout_tag(maintenance_data.layout_id), owner_tag(maintenance_data.owner_email))
+        return updated
 
     def delete(self, maintenance_id: int, owner_email: str):
         maintenance = self.get_by_id(maintenance_id)
@@ -63,4 +90,7 @@ class TankMaintenanceService:
         if maintenance.owner_email != owner_email:
             raise HTTPException(status_code=403, detail="You can only delete your own maintenance entries")
         
-        return self.repository.delete(maintenance_id) 
\ No newline at end of file
+        layout_id = maintenance.layout_id
+        deleted = self.repository.delete(maintenance_id)
+        invalidate(layout_tag(layout_id), owner_tag(owner_email))
+        return deleted
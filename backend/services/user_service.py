@@ -3,18 +3,21 @@ from backend.models.user_model import User
 from backend.security.hashing import hash_password, verify_password
 from backend.security.auth import create_access_token
 from fastapi import HTTPException
-from typing import List
+from typing import List, Optional
+from backend.repositories.pagination import Keyset, Page
 
 # Constant for "User not found" message
 USER_NOT_FOUND = "User not found"
 
+USER_ORDER = Keyset(User.id)
+
 class UserService:
 
     # Create User 
     @staticmethod
     def create_user(user_in, db: Session):
         # Check if email already exists
-        if db.query(User).filter(User.email == user_in.email).first():
+        if db.query(User).filter(User.email_matches(user_in.email)).first():
             raise HTTPException(status_code=400, detail="Email already exists")
 
         # Just use the role as a string directly
@@ -49,13 +52,18 @@ class UserService:
     # Get User by Email
     @staticmethod
     def get_user_by_email(email: str, db: Session) -> User:
-        return db.query(User).filter(User.email == email).first()
+        return db.query(User).filter(User.email_matches(email)).first()
 
     # Get all users
     @staticmethod
     def get_all_users(db: Session) -> List[User]:
         return db.query(User).all()
 
+    # Get one page of users, by id
+    @staticmethod
+    def get_users_page(db: Session, cursor: Optional[str], limit: int) -> Page[User]:
+        return USER_ORDER.page(db.query(User), cursor, limit)
+
     # Verify User
     @staticmethod
     def verify_user_password(plain_password: str, hashed_password: str) -> bool:
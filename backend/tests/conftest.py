@@ -0,0 +1,18 @@
+import os
+import pytest
+
+# backend.config reads these at import time; tests never touch a real database or Google
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test-client-id")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test-client-secret")
+os.environ.setdefault("GOOGLE_REDIRECT_URI", "http://localhost/api/auth/google/callback")
+
+
+@pytest.fixture(autouse=True)
+def fresh_response_cache():
+    # Cached bodies are keyed by URL; every test has its own database behind the same URLs
+    from backend.services.response_cache import RESPONSE_CACHE
+    RESPONSE_CACHE.clear()
+    yield
+    RESPONSE_CACHE.clear()
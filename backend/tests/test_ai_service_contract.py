@@ -0,0 +1,92 @@
+import os
+import httpx
+import pytest
+from fastapi import FastAPI
+from unittest.mock import AsyncMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from backend.db.base import Base
+from backend.models import user_model, tank_maintain_model, aquarium_evaluation_model, layout_fish_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayoutCreate
+from backend.services import http_client
+from backend.services.ai_proxy_service import evaluate_with_ai
+from backend.services.aquarium_evaluation_service import AquariumEvaluationService
+from backend.services.aquarium_service import AquariumService
+
+AI_SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "ai_service")
+
+INCH_LAYOUT = {
+    "owner_email": "test@example.com",
+    "tank_name": "Test Tank",
+    "tank_length": 24,
+    "tank_width": 12,
+    "tank_height": 16,
+    "unit": "inch",
+    "water_type": "freshwater",
+    "fish_data": [{"name": "Neon Tetra", "quantity": 6}],
+}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def ai_service(monkeypatch):
+    """
+    Start the shared client on the AI service's own routes, run in-process.
+
+    Requests go through the AI service's request models and prompt builder;
+    only the model call is replaced. ``start()`` returns that mock.
+    """
+    # The AI service uses top-level imports, as it does inside its container
+    monkeypatch.syspath_prepend(AI_SERVICE_DIR)
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+
+    async def start() -> AsyncMock:
+        from routes import ai_routes
+        from services.evaluation_cache import evaluation_cache
+        from services.model_router import model_router
+        from services.section_stream import SECTION_HEADERS
+
+        evaluation_cache.clear()
+        answer = "\n\n".join(f"{header}\nDetailed assessment text for this section." for header in SECTION_HEADERS)
+        complete = AsyncMock(return_value=(answer, "test-model"))
+        monkeypatch.setattr(model_router, "complete", complete)
+
+        app = FastAPI()
+        app.include_router(ai_routes.router)
+        await http_client.start_http_client(transport=httpx.ASGITransport(app=app))
+        return complete
+
+    yield start
+    http_client._client = None
+
+
+@pytest.mark.asyncio
+class TestAIServiceContract:
+    async def test_inch_layouts_are_accepted_by_the_ai_service(self, ai_service):
+        complete = await ai_service()
+        layout = AquaLayoutCreate(**INCH_LAYOUT)
+
+        result = await evaluate_with_ai(layout)
+
+        assert result["status"] == "success"
+        prompt = complete.call_args.args[0]["messages"][-1]["content"]
+        assert "Size: 60.96cm x 30.48cm x 40.64cm" in prompt
+
+    async def test_stored_layouts_are_evaluated_with_their_centimetre_dimensions(self, ai_service, db):
+        complete = await ai_service()
+        layout = AquariumService(db).create(AquaLayoutCreate(**INCH_LAYOUT))
+        assert layout.tank_length == 60.96
+
+        evaluation = await AquariumEvaluationService(db).evaluate(layout)
+
+        assert evaluation.model == "test-model"
+        assert AquariumEvaluationService(db).get_current(layout.id)[1] is not None
+        assert "Size: 60.96cm x 30.48cm x 40.64cm" in complete.call_args.args[0]["messages"][-1]["content"]
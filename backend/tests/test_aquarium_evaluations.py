@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.db.base import Base
+from backend.models import user_model, tank_maintain_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayoutCreate
+from backend.models.aquarium_evaluation_model import AquariumEvaluation
+from backend.repositories.aqualayout_repository import AquaLayoutRepository
+from backend.services.aquarium_evaluation_service import (
+    AquariumEvaluationService, EvaluationFailedError, layout_content_hash,
+)
+from backend.services.aquarium_service import AquariumService
+
+SAMPLE_LAYOUT = {
+    "owner_email": "test@example.com",
+    "tank_name": "Test Tank",
+    "tank_length": 60,
+    "tank_width": 30,
+    "tank_height": 40,
+    "water_type": "freshwater",
+    "fish_data": [{"name": "Neon Tetra", "quantity": 6}, {"name": "Corydoras", "quantity": 4}],
+    "comments": None,
+}
+
+AI_RESULT = {"status": "success", "response": "Overall Assessment: great tank", "model": "model-a"}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def layout(db):
+    return AquariumService(db).create(AquaLayoutCreate(**SAMPLE_LAYOUT))
+
+
+def evaluate(db, layout, result=AI_RESULT):
+    with patch("backend.services.aquarium_evaluation_service.evaluate_with_ai", new=AsyncMock(return_value=result)):
+        return asyncio.run(AquariumEvaluationService(db).evaluate(layout))
+
+
+class TestContentHash:
+    def test_ignores_owner_name_and_fish_order(self):
+        moved = dict(
+            SAMPLE_LAYOUT,
+            owner_email="other@example.com",
+            tank_name="Renamed",
+            fish_data=[{"name": "corydoras ", "quantity": 4}, {"name": "Neon  Tetra", "quantity": 6}],
+        )
+        assert layout_content_hash(AquaLayoutCreate(**moved)) == layout_content_hash(AquaLayoutCreate(**SAMPLE_LAYOUT))
+
+    def test_changes_with_stock_and_dimensions(self):
+        base = layout_content_hash(AquaLayoutCreate(**SAMPLE_LAYOUT))
+        more_fish = dict(SAMPLE_LAYOUT, fish_data=[{"name": "Neon Tetra", "quantity": 12}])
+        taller = dict(SAMPLE_LAYOUT, tank_height=50)
+        assert layout_content_hash(AquaLayoutCreate(**more_fish)) != base
+        assert layout_content_hash(AquaLayoutCreate(**taller)) != base
+
+
+class TestStoredEvaluations:
+    def test_stored_evaluation_is_returned_while_current(self, db, layout):
+        stored = evaluate(db, layout)
+        assert (stored.model, stored.response, stored.stale) == ("model-a", AI_RESULT["response"], False)
+
+        found_layout, evaluation = AquariumEvaluationService(db).get_current(layout.id)
+        assert found_layout.id == layout.id
+        assert evaluation.id == stored.id
+
+    def test_update_marks_evaluation_stale(self, db, layout):
+        evaluate(db, layout)
+        AquariumService(db).update(layout.id, AquaLayoutCreate(**dict(SAMPLE_LAYOUT, comments="new plants")))
+
+        _, evaluation = AquariumEvaluationService(db).get_current(layout.id)
+        assert evaluation is None
+        assert db.query(AquariumEvaluation).one().stale
+
+    def test_reevaluating_replaces_the_stale_entry(self, db, layout):
+        evaluate(db, layout)
+        AquariumService(db).update(layout.id, AquaLayoutCreate(**dict(SAMPLE_LAYOUT, tank_length=80)))
+        evaluate(db, layout, dict(AI_RESULT, response="Overall Assessment: roomier"))
+
+        _, evaluation = AquariumEvaluationService(db).get_current(layout.id)
+        assert evaluation.response == "Overall Assessment: roomier"
+        assert db.query(AquariumEvaluation).count() == 1
+
+    def test_hash_mismatch_is_not_served(self, db, layout):
+        evaluate(db, layout)
+        # A change that bypassed AquariumService.update still invalidates by hash
+        layout.fish_data = [{"name": "Goldfish", "quantity": 3}]
+        db.commit()
+
+        _, evaluation = AquariumEvaluationService(db).get_current(layout.id)
+        assert evaluation is None
+
+    def test_delete_removes_evaluation(self, db, layout):
+        evaluate(db, layout)
+        AquariumService(db).delete(layout.id)
+
+        assert db.query(AquariumEvaluation).count() == 0
+        assert AquariumEvaluationService(db).get_current(layout.id) == (None, None)
+
+    def test_deleting_by_owner_and_tank_removes_evaluation(self, db, layout):
+        evaluate(db, layout)
+        # Enforce the foreign keys, as PostgreSQL does
+        db.execute(text("PRAGMA foreign_keys=ON"))
+
+        assert AquaLayoutRepository(db).delete_by_user_and_tank(layout.owner_email, layout.tank_name)
+        assert db.query(AquariumEvaluation).count() == 0
+
+    def test_failed_evaluation_is_not_stored(self, db, layout):
+        with pytest.raises(EvaluationFailedError, match="unavailable"):
+            evaluate(db, layout, {"status": "error", "response": "AI service is currently unavailable."})
+
+        assert db.query(AquariumEvaluation).count() == 0
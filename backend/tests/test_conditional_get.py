@@ -0,0 +1,193 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.config import settings
+from backend.db.base import Base
+from backend.db.db import get_db
+from backend.models import user_model, aquarium_evaluation_model, layout_fish_model  # noqa: F401
+from backend.routes import aquarium_routes, fish_routes, tank_maintain_routes
+from backend.routes.conditional import etag_matches
+from backend.services.fish_catalog import FISH_CATALOG
+from backend.services.response_cache import RESPONSE_CACHE
+
+OWNER = "test@example.com"
+LAYOUT = {
+    "owner_email": OWNER,
+    "tank_name": "Test Tank",
+    "tank_length": 60,
+    "tank_width": 30,
+    "tank_height": 40,
+    "water_type": "freshwater",
+    "fish_data": [{"name": "Neon Tetra", "quantity": 6}],
+}
+MAINTENANCE = {
+    "owner_email": OWNER,
+    "maintenance_date": "2024-05-01T10:00:00Z",
+    "maintenance_type": "Water Change",
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalog():
+    FISH_CATALOG.clear()
+    yield
+    FISH_CATALOG.clear()
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def client(engine):
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    app = FastAPI()
+    for module in (aquarium_routes, fish_routes, tank_maintain_routes):
+        app.include_router(module.router, prefix="/api")
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    app.dependency_overrides[get_db] = override_db
+    return TestClient(app)
+
+
+def revalidate(client, url, etag, **params):
+    return client.get(url, params=params, headers={"If-None-Match": etag})
+
+
+def test_etag_matching():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"b", "a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+def test_layout_revalidation(client):
+    layout = client.post("/api/aquariums/", json=LAYOUT).json()
+    url = f"/api/aquariums/{layout['id']}"
+
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == settings.CACHE_CONTROL_PRIVATE
+
+    unchanged = revalidate(client, url, etag)
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+
+    client.put(url, json=dict(LAYOUT, tank_name="Renamed"))
+    changed = revalidate(client, url, etag)
+    assert changed.status_code == 200
+    assert changed.json()["tank_name"] == "Renamed"
+    assert changed.headers["ETag"] != etag
+
+    client.delete(url, params={"owner_email": OWNER})
+    assert revalidate(client, url, changed.headers["ETag"]).status_code == 404
+
+
+def test_revalidation_reads_versions_not_rows(client, engine):
+    layout = client.post("/api/aquariums/", json=LAYOUT).json()
+    item_etag = client.get(f"/api/aquariums/{layout['id']}").headers["ETag"]
+    list_etag = client.get(f"/api/aquariums/by-owner/{OWNER}").headers["ETag"]
+    RESPONSE_CACHE.clear()  # revalidate against the database, not the cached list
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert revalidate(client, f"/api/aquariums/{layout['id']}", item_etag).status_code == 304
+        assert revalidate(client, f"/api/aquariums/by-owner/{OWNER}", list_etag).status_code == 304
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 2
+    assert not any("tank_name" in statement or "fish_data" in statement for statement in statements)
+
+
+def test_layout_list_etag_follows_the_page(client):
+    first = client.post("/api/aquariums/", json=LAYOUT).json()
+    client.post("/api/aquariums/", json=dict(LAYOUT, tank_name="Second"))
+    url = f"/api/aquariums/by-owner/{OWNER}"
+
+    page = client.get(url, params={"limit": 1})
+    etag = page.headers["ETag"]
+    assert revalidate(client, url, etag, limit=1).status_code == 304
+    # Same rows, but no next page: a different representation
+    assert revalidate(client, url, etag, limit=2).status_code == 200
+
+    full = client.get(url).headers["ETag"]
+    client.put(f"/api/aquariums/{first['id']}", json=dict(LAYOUT, comments="edited"))
+    assert revalidate(client, url, full).status_code == 200
+    full = client.get(url).headers["ETag"]
+    client.post("/api/aquariums/", json=dict(LAYOUT, tank_name="Third"))
+    assert revalidate(client, url, full).status_code == 200
+    assert revalidate(client, "/api/aquariums/", client.get("/api/aquariums/").headers["ETag"]).status_code == 304
+
+
+def test_maintenance_revalidation(client):
+    layout = client.post("/api/aquariums/", json=LAYOUT).json()
+    entry = client.post("/api/maintenance/", json=dict(MAINTENANCE, layout_id=layout["id"])).json()
+
+    item_url = f"/api/maintenance/{entry['id']}"
+    item_etag = client.get(item_url).headers["ETag"]
+    layout_url = f"/api/maintenance/layout/{layout['id']}"
+    layout_etag = client.get(layout_url).headers["ETag"]
+    owner_url = f"/api/maintenance/owner/{OWNER}"
+    owner_etag = client.get(owner_url).headers["ETag"]
+    for url, etag in ((item_url, item_etag), (layout_url, layout_etag), (owner_url, owner_etag)):
+        assert revalidate(client, url, etag).status_code == 304
+
+    client.put(item_url, json=dict(MAINTENANCE, layout_id=layout["id"], completed=1))
+    for url, etag in ((item_url, item_etag), (layout_url, layout_etag), (owner_url, owner_etag)):
+        response = revalidate(client, url, etag)
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+
+def test_fish_catalog_revalidation(client):
+    client.post("/api/fish/", json={"name": "Neon Tetra", "water_type": "freshwater"})
+    first = client.get("/api/fish/")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == settings.CACHE_CONTROL_CATALOG
+
+    assert revalidate(client, "/api/fish/", etag).status_code == 304
+    assert revalidate(client, "/api/fish/autocomplete", etag, q="neon").status_code == 304
+
+    created = client.post("/api/fish/", json={"name": "Guppy", "water_type": "freshwater"}).json()
+    changed = revalidate(client, "/api/fish/", etag)
+    assert changed.status_code == 200 and len(changed.json()) == 2
+
+    client.delete(f"/api/fish/{created['id']}")
+    assert revalidate(client, f"/api/fish/{created['id']}", changed.headers["ETag"]).status_code == 404
+
+
+def test_fish_revalidation_is_per_item(client):
+    neon = client.post("/api/fish/", json={"name": "Neon Tetra", "water_type": "freshwater"}).json()
+    first = client.get(f"/api/fish/{neon['id']}")
+    etag = first.headers["ETag"]
+    assert client.get("/api/fish/name/Neon Tetra").headers["ETag"] == etag
+
+    # Another species changes the catalog, not this fish
+    guppy = client.post("/api/fish/", json={"name": "Guppy", "water_type": "freshwater"}).json()
+    assert revalidate(client, f"/api/fish/{neon['id']}", etag).status_code == 304
+
+    client.put(f"/api/fish/{neon['id']}", json={"name": "Neon Tetra", "water_type": "saltwater"})
+    changed = revalidate(client, f"/api/fish/{neon['id']}", etag)
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+    # A missing fish is a 404, whatever ETag the client sends
+    client.delete(f"/api/fish/{guppy['id']}")
+    assert revalidate(client, f"/api/fish/{guppy['id']}", etag).status_code == 404
+    assert revalidate(client, "/api/fish/name/Guppy", "*").status_code == 404
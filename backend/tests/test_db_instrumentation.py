@@ -0,0 +1,147 @@
+import copy
+import logging
+import pytest
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.config import settings
+from backend.db import instrumentation
+from backend.db.base import Base
+from backend.db.db import get_db
+from backend.db.instrumentation import (
+    QueryBudgetExceeded, QueryStatsMiddleware, instrument_engine, parameter_shape, query_budget, route_summary,
+)
+from backend.models import user_model, fish_model, aquarium_evaluation_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayoutCreate
+from backend.models.tank_maintain_model import TankMaintenanceCreate
+from backend.routes import aquarium_routes
+from backend.services.aquarium_service import AquariumService
+from backend.services.tank_maintain_service import TankMaintenanceService
+
+SAMPLE_LAYOUT = {
+    "owner_email": "test@example.com",
+    "tank_name": "Test Tank",
+    "tank_length": 60,
+    "tank_width": 30,
+    "tank_height": 40,
+    "water_type": "freshwater",
+    "fish_data": [{"name": "Neon Tetra", "quantity": 6}],
+    "comments": None,
+}
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    instrument_engine(engine)
+    Base.metadata.create_all(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def layout(db):
+    return AquariumService(db).create(AquaLayoutCreate(**SAMPLE_LAYOUT))
+
+
+def test_maintenance_create_stays_within_budget(db, layout):
+    entry = TankMaintenanceCreate(
+        layout_id=layout.id,
+        owner_email="test@example.com",
+        maintenance_date=datetime(2024, 1, 1, 10, 0),
+        maintenance_type="Water Change",
+    )
+    # Layout lookup, insert, refresh
+    with query_budget(3, "TankMaintenanceService.create") as stats:
+        TankMaintenanceService(db).create(entry)
+
+    assert stats.count == 3
+    assert stats.total_time > 0
+    assert stats.slowest_statement is not None
+
+
+def test_budget_overrun_lists_the_statements(db, layout):
+    with pytest.raises(QueryBudgetExceeded, match="issued 2 queries, budget is 1") as error:
+        with query_budget(1, "two lookups"):
+            AquariumService(db).get_by_id(layout.id)
+            AquariumService(db).get_all()
+
+    assert "FROM aquarium_layouts" in str(error.value)
+
+
+def test_repeated_statements_are_flagged_as_n_plus_one(db, layout, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 3)
+    with caplog.at_level(logging.WARNING, logger="backend.db.n_plus_one"):
+        with query_budget(10, "GET /loop") as stats:
+            for _ in range(3):
+                AquariumService(db).get_by_id(layout.id)
+        instrumentation.finish_request(stats)
+
+    assert len(stats.repeated(3)) == 1
+    assert "Possible N+1 in GET /loop: statement ran 3 times" in caplog.text
+
+
+def test_slow_queries_log_parameter_shapes_not_values(db, layout, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.0)
+    with caplog.at_level(logging.WARNING, logger="backend.db.slow_queries"):
+        AquariumService(db).get_all(email="secret@example.com")
+
+    record = caplog.records[-1]
+    assert record.name == "backend.db.slow_queries"
+    assert "secret@example.com" not in record.getMessage()
+    assert "secret@example.com" not in str(record.parameters)
+    assert "str" in str(record.parameters)
+
+
+def test_failed_statements_leave_nothing_on_the_connection(db, layout):
+    connection = db.connection()
+    info = copy.deepcopy(dict(connection.info))
+    for _ in range(3):
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM no_such_table"))
+
+    with query_budget(1) as stats:
+        connection.execute(text("SELECT 1"))
+    assert stats.count == 1
+    assert connection.info == info
+
+
+def test_parameter_shape():
+    assert parameter_shape({"email": "a@b.c", "limit": 5}) == {"email": "str", "limit": "int"}
+    assert parameter_shape(("a@b.c", 5)) == ["str", "int"]
+    assert parameter_shape([{"id": 1}, {"id": 2}]) == {"rows": 2, "row": {"id": "int"}}
+
+
+def test_middleware_reports_queries_per_route(session_factory, layout):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+    app.include_router(aquarium_routes.router, prefix="/api")
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    app.dependency_overrides[get_db] = override_db
+
+    response = TestClient(app).get(f"/api/aquariums/{layout.id}")
+
+    assert response.status_code == 200
+    assert response.headers["X-DB-Query-Count"] == "1"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    # Route templates, not raw paths (the router prefix is included depending on the FastAPI version)
+    summary = next(totals for route, totals in route_summary().items() if route.endswith("/aquariums/{layout_id}"))
+    assert f"/aquariums/{layout.id}" not in " ".join(route_summary())
+    assert summary["requests"] >= 1
+    assert summary["max_queries"] >= 1
@@ -0,0 +1,28 @@
+from sqlalchemy.pool import NullPool
+from backend.config import settings
+from backend.db.engine_options import engine_options
+
+POSTGRES_URL = "postgresql://user:secret@db:5432/aqualife"
+
+
+class TestEngineOptions:
+    def test_pool_settings_are_applied(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+        monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+        monkeypatch.setattr(settings, "DB_PGBOUNCER", False)
+
+        options = engine_options(POSTGRES_URL)
+        assert options["pool_size"] == 7
+        assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    def test_pgbouncer_mode_disables_pooling_and_the_startup_timeout(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+        monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+        options = engine_options(POSTGRES_URL)
+        assert options["poolclass"] is NullPool
+        assert "pool_size" not in options
+        assert "connect_args" not in options
+
+    def test_sqlite_gets_no_pool_sizing(self):
+        assert "pool_size" not in engine_options("sqlite:///./app.db")
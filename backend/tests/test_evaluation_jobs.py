@@ -0,0 +1,128 @@
+import httpx
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.models.evaluation_job_model import EvaluationJob, JOB_FAILED, JOB_QUEUED, JOB_SUCCEEDED
+from backend.repositories.evaluation_job_repository import EvaluationJobRepository
+from backend.services.evaluation_job_service import EvaluationWorker
+
+SAMPLE_LAYOUT = {
+    "owner_email": "test@example.com",
+    "tank_name": "Test Tank",
+    "tank_length": 60,
+    "tank_width": 30,
+    "tank_height": 40,
+    "water_type": "freshwater",
+    "fish_data": [{"name": "Neon Tetra", "quantity": 6}],
+    "comments": None,
+}
+
+
+@pytest.fixture
+def session_factory():
+    # SQLite ignores FOR UPDATE SKIP LOCKED; the queue logic is the same
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    EvaluationJob.__table__.create(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def repository(session_factory):
+    db = session_factory()
+    yield EvaluationJobRepository(db)
+    db.close()
+
+
+class TestEvaluationJobRepository:
+    def test_jobs_are_claimed_once_in_order(self, repository):
+        first = repository.enqueue(SAMPLE_LAYOUT)
+        second = repository.enqueue(SAMPLE_LAYOUT)
+
+        assert repository.claim("worker-a", lease_seconds=60).id == first.id
+        assert repository.claim("worker-b", lease_seconds=60).id == second.id
+        assert repository.claim("worker-c", lease_seconds=60) is None
+
+    def test_failed_attempts_are_retried_until_exhausted(self, repository):
+        job = repository.enqueue(SAMPLE_LAYOUT, max_attempts=2)
+
+        repository.claim("worker", lease_seconds=60)
+        assert repository.fail(job.id, "worker", "timeout", retry_delay=0)
+        assert repository.get_by_id(job.id).status == JOB_QUEUED
+
+        repository.claim("worker", lease_seconds=60)
+        repository.fail(job.id, "worker", "timeout", retry_delay=0)
+        job = repository.get_by_id(job.id)
+        assert (job.status, job.attempts, job.error) == (JOB_FAILED, 2, "timeout")
+
+    def test_retry_waits_for_the_backoff(self, repository):
+        job = repository.enqueue(SAMPLE_LAYOUT)
+        repository.claim("worker", lease_seconds=60)
+        repository.fail(job.id, "worker", "timeout", retry_delay=60)
+
+        assert repository.claim("worker", lease_seconds=60) is None
+
+    def test_expired_lease_is_reclaimed_and_the_old_worker_cannot_finish(self, repository):
+        job = repository.enqueue(SAMPLE_LAYOUT)
+        repository.claim("crashed", lease_seconds=60)
+        stored = repository.get_by_id(job.id)
+        stored.locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+        repository.db.commit()
+
+        reclaimed = repository.claim("healthy", lease_seconds=60)
+
+        assert (reclaimed.id, reclaimed.attempts, reclaimed.locked_by) == (job.id, 2, "healthy")
+        assert not repository.complete(job.id, "crashed", {"status": "success"})
+        assert repository.complete(job.id, "healthy", {"status": "success"})
+        assert repository.count_by_status() == {JOB_SUCCEEDED: 1}
+
+
+@pytest.mark.asyncio
+class TestEvaluationWorker:
+    async def test_worker_stores_the_result(self, session_factory, repository):
+        job = repository.enqueue(SAMPLE_LAYOUT)
+        worker = EvaluationWorker(session_factory, worker_id="worker")
+        answer = {"status": "success", "response": "🔵 Tank Volume Assessment ..."}
+
+        with patch("backend.services.evaluation_job_service.request_evaluation", new=AsyncMock(return_value=answer)):
+            assert await worker.run_once()
+            assert not await worker.run_once()
+
+        repository.db.expire_all()
+        job = repository.get_by_id(job.id)
+        assert (job.status, job.result, job.attempts) == (JOB_SUCCEEDED, answer, 1)
+        assert job.finished_at is not None
+
+    async def test_ai_service_errors_requeue_the_job(self, session_factory, repository):
+        job = repository.enqueue(SAMPLE_LAYOUT)
+        worker = EvaluationWorker(session_factory, worker_id="worker", retry_delay=60)
+        unavailable = {"status": "error", "response": "AI service is currently unavailable."}
+
+        with patch("backend.services.evaluation_job_service.request_evaluation", new=AsyncMock(return_value=unavailable)):
+            await worker.run_once()
+
+        repository.db.expire_all()
+        job = repository.get_by_id(job.id)
+        assert (job.status, job.error) == (JOB_QUEUED, "AI service is currently unavailable.")
+
+    async def test_rejected_requests_fail_without_retrying(self, session_factory, repository):
+        rejected, busy = repository.enqueue(SAMPLE_LAYOUT), repository.enqueue(SAMPLE_LAYOUT)
+        worker = EvaluationWorker(session_factory, worker_id="worker", retry_delay=60)
+
+        def status_error(status):
+            request = httpx.Request("POST", "http://ai/evaluate")
+            response = httpx.Response(status, request=request)
+            return httpx.HTTPStatusError(f"{status}", request=request, response=response)
+
+        errors = AsyncMock(side_effect=[status_error(422), status_error(503)])
+        with patch("backend.services.evaluation_job_service.request_evaluation", new=errors):
+            await worker.run_once()
+            await worker.run_once()
+
+        repository.db.expire_all()
+        rejected, busy = repository.get_by_id(rejected.id), repository.get_by_id(busy.id)
+        assert (rejected.status, rejected.attempts) == (JOB_FAILED, 1)
+        assert rejected.error.startswith("AI service error")
+        assert busy.status == JOB_QUEUED
@@ -0,0 +1,156 @@
+import pytest
+from pydantic import ValidationError
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.config import settings
+from backend.db.base import Base
+from backend.db.db import get_db
+from backend.models import user_model, tank_maintain_model, aquarium_evaluation_model, layout_fish_model  # noqa: F401
+from backend.models.fish_model import Fish, FishCreate, FishResponse
+from backend.repositories.fish_repository import FishRepository
+from backend.routes import fish_routes
+from backend.services.fish_catalog import FISH_CATALOG, PrefixTrie
+from backend.services.fish_service import FishService
+
+CATALOG = [
+    ("Neon Tetra", "freshwater"), ("Cardinal Tetra", "freshwater"), ("Neolamprologus", "freshwater"),
+    ("Guppy", "freshwater"), ("Clownfish", "saltwater"), ("Clown Loach", "freshwater"), ("Blue Tang", "saltwater"),
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalog(monkeypatch):
+    monkeypatch.setattr(settings, "FISH_CATALOG_CHECK_SECONDS", 60)
+    FISH_CATALOG.clear()
+    yield
+    FISH_CATALOG.clear()
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Fish), [{"name": name, "water_type": water_type} for name, water_type in CATALOG])
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def count_statements(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+def test_prefix_trie_is_case_insensitive_and_alphabetical():
+    trie = PrefixTrie([FishResponse(id=i, name=name, water_type=water_type) for i, (name, water_type) in enumerate(CATALOG)])
+
+    assert [fish.name for fish in trie.find("clown", 10)] == ["Clown Loach", "Clownfish"]
+    assert [fish.name for fish in trie.find("NEO", 10)] == ["Neolamprologus", "Neon Tetra"]
+    assert [fish.name for fish in trie.find("neo", 1)] == ["Neolamprologus"]
+    assert [fish.name for fish in trie.find("neon t", 10)] == ["Neon Tetra"]
+    assert trie.find("tetra", 10) == []
+    assert trie.find("neon tetras", 10) == []
+
+
+def test_reads_do_not_touch_the_database_in_steady_state(db):
+    service = FishService(db)
+    assert service.get_count() == len(CATALOG)
+
+    statements = count_statements(db)
+    assert [fish.name for fish in service.get_by_water_type("saltwater")] == ["Blue Tang", "Clownfish"]
+    assert service.get_by_name("Guppy").water_type == "freshwater"
+    assert service.get_by_name("guppy") is None
+    assert service.get_by_id(service.get_by_name("Guppy").id).name == "Guppy"
+    assert [fish.name for fish in service.search_by_name("tetra")] == ["Neon Tetra", "Cardinal Tetra"]
+    assert [fish.name for fish in service.autocomplete("clo")] == ["Clown Loach", "Clownfish"]
+    assert len(FishService(db).get_all()) == len(CATALOG)
+    assert statements == []
+
+
+def test_version_is_checked_once_per_interval(db, monkeypatch):
+    service = FishService(db)
+    service.get_all()
+    monkeypatch.setattr(settings, "FISH_CATALOG_CHECK_SECONDS", 0)
+
+    statements = count_statements(db)
+    service.get_all()
+    assert len(statements) == 1 and "catalog_versions" in statements[0]
+
+
+def test_service_writes_swap_in_a_new_snapshot(db):
+    service = FishService(db)
+    before = service.catalog
+
+    created = service.create(FishCreate(name="Neon Goby", water_type="saltwater"))
+    assert [fish.name for fish in service.autocomplete("neon")] == ["Neon Goby", "Neon Tetra"]
+    service.update(created.id, FishCreate(name="Sleeper Goby", water_type="saltwater", image_url=None))
+    assert service.get_by_id(created.id).name == "Sleeper Goby"
+    service.delete(created.id)
+    assert service.get_by_id(created.id) is None
+
+    # Requests holding the old snapshot still see the catalog as it was
+    assert service.catalog is not before
+    assert len(before.fish) == len(CATALOG) and "Neon Goby" not in before.by_name
+    with pytest.raises(ValidationError):
+        before.fish[0].name = "changed"
+
+
+def test_other_writers_are_picked_up_when_the_version_changes(db, session_factory, monkeypatch):
+    service = FishService(db)
+    service.get_all()
+
+    # Another process: an ORM write bumps the version but does not touch this process's snapshot
+    with session_factory() as other:
+        FishRepository(other).create(FishCreate(name="Betta", water_type="freshwater"))
+    assert service.get_by_name("Betta") is None
+
+    monkeypatch.setattr(settings, "FISH_CATALOG_CHECK_SECONDS", 0)
+    assert service.get_by_name("Betta") is not None
+
+    # Core writes don't bump the version on their own
+    db.execute(insert(Fish), [{"name": "Molly", "water_type": "freshwater"}])
+    db.commit()
+    assert service.get_by_name("Molly") is None
+    FishRepository(db).bump_catalog_version()
+    db.commit()
+    assert service.get_by_name("Molly") is not None
+
+
+def test_catalog_endpoints(session_factory):
+    app = FastAPI()
+    app.include_router(fish_routes.router, prefix="/api")
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    response = client.get("/api/fish/autocomplete", params={"q": "Clown"})
+    assert [fish["name"] for fish in response.json()] == ["Clown Loach", "Clownfish"]
+    assert client.get("/api/fish/autocomplete", params={"q": ""}).status_code == 422
+
+    names, cursor = [], None
+    while True:
+        response = client.get("/api/fish/", params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+        names += [fish["name"] for fish in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert names == sorted(name for name, _ in CATALOG)
+    assert client.get("/api/fish/", params={"cursor": "bm90IGpzb24"}).status_code == 400
+
+    assert client.get("/api/fish/name/Nemo").status_code == 404
@@ -0,0 +1,97 @@
+import time
+import httpx
+import pytest
+from backend.config import settings
+from backend.models.aqualayout_model import AquaLayoutCreate
+from backend.services import http_client
+from backend.services.ai_proxy_service import evaluate_with_ai, DEADLINE_MESSAGE
+from backend.services.http_client import DEADLINE_HEADER, DeadlineExceededError, parse_deadline
+
+SAMPLE_LAYOUT = {
+    "owner_email": "test@example.com",
+    "tank_name": "Test Tank",
+    "tank_length": 60,
+    "tank_width": 30,
+    "tank_height": 40,
+    "water_type": "freshwater",
+    "fish_data": [{"name": "Neon Tetra", "quantity": 6}],
+}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Start the shared client on a mock transport that replays scripted answers."""
+    monkeypatch.setattr(settings, "HTTP_CLIENT_RETRY_BACKOFF", 0.001)
+    seen, script = [], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        outcome = script.pop(0) if script else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"status": "success", "response": "ok"})
+
+    async def start(*outcomes):
+        script.extend(outcomes)
+        await http_client.start_http_client(transport=httpx.MockTransport(handler))
+        return seen
+
+    yield start
+    http_client._client = None
+
+
+@pytest.mark.asyncio
+class TestSharedHttpClient:
+    async def test_idempotent_requests_are_retried(self, upstream):
+        seen = await upstream(503, 200)
+
+        response = await http_client.request("GET", "http://ai-service/evaluate")
+
+        assert response.status_code == 200
+        assert len(seen) == 2
+
+    async def test_non_idempotent_requests_are_not_retried_after_sending(self, upstream):
+        seen = await upstream(503, 200)
+
+        response = await http_client.request("POST", "http://accounts.example/token")
+
+        assert response.status_code == 503
+        assert len(seen) == 1
+
+    async def test_requests_that_never_connected_are_always_retried(self, upstream):
+        seen = await upstream(httpx.ConnectError("refused"), 200)
+
+        response = await http_client.request("POST", "http://accounts.example/token")
+
+        assert response.status_code == 200
+        assert len(seen) == 2
+
+    async def test_expired_deadline_skips_the_call(self, upstream):
+        seen = await upstream()
+
+        with pytest.raises(DeadlineExceededError):
+            await http_client.request("GET", "http://ai-service/evaluate", deadline=time.time() - 1)
+        assert seen == []
+
+    async def test_evaluation_uses_the_shared_client_and_forwards_the_deadline(self, upstream):
+        seen = await upstream(200)
+        deadline = time.time() + 10
+
+        result = await evaluate_with_ai(AquaLayoutCreate(**SAMPLE_LAYOUT), deadline=deadline)
+
+        assert result == {"status": "success", "response": "ok"}
+        assert str(seen[0].url) == f"{settings.AI_SERVICE_URL}/evaluate"
+        assert float(seen[0].headers[DEADLINE_HEADER]) == pytest.approx(deadline, abs=0.001)
+
+    async def test_evaluation_past_its_deadline_reports_an_error(self, upstream):
+        await upstream()
+
+        result = await evaluate_with_ai(AquaLayoutCreate(**SAMPLE_LAYOUT), deadline=time.time() - 1)
+
+        assert result == {"status": "error", "response": DEADLINE_MESSAGE}
+
+
+def test_parse_deadline():
+    assert parse_deadline("1700000000.5") == 1700000000.5
+    assert parse_deadline("soon") is None
+    assert parse_deadline(None) is None
@@ -0,0 +1,152 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.db.base import Base
+from backend.db.db import get_db
+from backend.models import user_model, tank_maintain_model, aquarium_evaluation_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayout, AquaLayoutCreate
+from backend.models.fish_model import Fish
+from backend.models.layout_fish_model import LayoutFish
+from backend.repositories.layout_fish_repository import LayoutFishRepository
+from backend.routes import fish_routes
+from backend.services.aquarium_service import AquariumService
+from backend.services.fish_service import FishService
+
+SAMPLE_LAYOUT = {
+    "owner_email": "test@example.com",
+    "tank_name": "Test Tank",
+    "tank_length": 60,
+    "tank_width": 30,
+    "tank_height": 40,
+    "water_type": "freshwater",
+    "fish_data": [
+        {"name": "Neon Tetra", "quantity": 6},
+        {"name": "neon tetra ", "quantity": 4},
+        {"name": "Mystery Pleco", "quantity": 1},
+    ],
+    "comments": None,
+}
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add_all([
+            Fish(id=1, name="Neon Tetra", water_type="freshwater"),
+            Fish(id=2, name="Guppy", water_type="freshwater"),
+            Fish(id=3, name="Clownfish", water_type="saltwater"),
+        ])
+        db.commit()
+    return factory
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def stock(db, layout_id):
+    return {
+        row.fish_id: row.quantity
+        for row in db.execute(select(LayoutFish).where(LayoutFish.layout_id == layout_id)).scalars()
+    }
+
+
+def test_create_links_catalog_species(db):
+    layout = AquariumService(db).create(AquaLayoutCreate(**SAMPLE_LAYOUT))
+
+    # Names match case-insensitively and repeats add up; names outside the catalog are left in fish_data only
+    assert stock(db, layout.id) == {1: 10}
+
+
+def test_update_replaces_and_delete_removes_rows(db):
+    service = AquariumService(db)
+    layout = service.create(AquaLayoutCreate(**SAMPLE_LAYOUT))
+
+    service.update(layout.id, AquaLayoutCreate(**dict(SAMPLE_LAYOUT, fish_data=[{"name": "Guppy", "quantity": 3}])))
+    assert stock(db, layout.id) == {2: 3}
+
+    service.delete(layout.id)
+    assert stock(db, layout.id) == {}
+
+
+def test_species_queries(db):
+    service = AquariumService(db)
+    first = service.create(AquaLayoutCreate(**SAMPLE_LAYOUT))
+    second = service.create(AquaLayoutCreate(**dict(SAMPLE_LAYOUT, tank_name="Second", fish_data=[
+        {"name": "Neon Tetra", "quantity": 2}, {"name": "Guppy", "quantity": 5},
+    ])))
+
+    assert {layout.id for layout in service.get_with_fish("Neon Tetra")} == {first.id, second.id}
+    assert [layout.id for layout in service.get_with_fish("Guppy")] == [second.id]
+    # Names outside the catalog are still found in fish_data
+    assert [layout.id for layout in service.get_with_fish("Mystery Pleco")] == [first.id]
+
+    popular = FishService(db).get_popular_species()
+    assert [(row["name"], row["tank_count"], row["total_quantity"]) for row in popular] == [
+        ("Neon Tetra", 2, 12), ("Guppy", 1, 5),
+    ]
+    assert FishService(db).get_species_stock(3)["tank_count"] == 0
+    assert FishService(db).get_species_stock(99) is None
+
+
+def test_species_lookup_uses_the_fish_index(db):
+    plan = db.connection().exec_driver_sql(
+        "EXPLAIN QUERY PLAN SELECT layout_id FROM layout_fish WHERE fish_id = 1"
+    ).all()
+
+    assert "ix_layout_fish_fish_id_layout_id" in " ".join(row[-1] for row in plan)
+
+
+def test_backfill_builds_rows_for_existing_layouts(db):
+    # Layouts written before layout_fish existed
+    db.execute(insert(AquaLayout), [
+        dict(SAMPLE_LAYOUT, tank_name=f"Tank {i}", fish_data=[{"name": "Guppy", "quantity": i + 1}])
+        for i in range(5)
+    ])
+    db.commit()
+
+    repository = LayoutFishRepository(db)
+    catalog, after_id, batches = repository.catalog_ids(), 0, 0
+    while (after_id := repository.backfill_batch(after_id, 2, catalog)) is not None:
+        db.commit()
+        batches += 1
+
+    assert batches == 3
+    assert FishService(db).get_species_stock(2)["total_quantity"] == 15
+    # Re-running replaces rather than duplicates
+    repository.backfill_batch(0, 10, catalog)
+    db.commit()
+    assert FishService(db).get_species_stock(2)["tank_count"] == 5
+
+
+def test_popular_species_endpoint(session_factory):
+    with session_factory() as db:
+        AquariumService(db).create(AquaLayoutCreate(**SAMPLE_LAYOUT))
+
+    app = FastAPI()
+    app.include_router(fish_routes.router, prefix="/api")
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    assert client.get("/api/fish/popular").json()[0] == {
+        "fish_id": 1, "name": "Neon Tetra", "water_type": "freshwater", "image_url": None,
+        "tank_count": 1, "total_quantity": 10,
+    }
+    assert client.get("/api/fish/1/stock").json()["total_quantity"] == 10
+    assert client.get("/api/fish/99/stock").status_code == 404
@@ -0,0 +1,192 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.config import settings
+from backend.db.base import Base
+from backend.db.db import get_db
+from backend.models import user_model, tank_maintain_model, aquarium_evaluation_model, layout_fish_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayout, AquaLayoutCreate
+from backend.models.fish_model import Fish
+from backend.repositories.aqualayout_repository import AquaLayoutRepository
+from backend.repositories.layout_stats_repository import LayoutStatsRepository
+from backend.routes import aquarium_routes
+from backend.services.aquarium_service import AquariumService
+from backend.services.layout_stats_service import LayoutStatsService, StatsReconciler, clear_statistics_cache
+
+SAMPLE_LAYOUT = {
+    "owner_email": "test@example.com",
+    "tank_name": "Test Tank",
+    "tank_length": 60,
+    "tank_width": 30,
+    "tank_height": 40,
+    "water_type": "freshwater",
+    "fish_data": [{"name": "Neon Tetra", "quantity": 6}, {"name": "Guppy", "quantity": 2}],
+}
+
+
+def layout(**changes) -> AquaLayoutCreate:
+    return AquaLayoutCreate(**dict(SAMPLE_LAYOUT, **changes))
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_statistics_cache()
+    yield
+    clear_statistics_cache()
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add_all([
+            Fish(id=1, name="Neon Tetra", water_type="freshwater"),
+            Fish(id=2, name="Guppy", water_type="freshwater"),
+            Fish(id=3, name="Clownfish", water_type="saltwater"),
+        ])
+        db.commit()
+    return factory
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def test_counters_follow_create_update_and_delete(db):
+    service = AquariumService(db)
+    first = service.create(layout())
+    second = service.create(layout(tank_name="Reef", water_type="Saltwater", fish_data=[{"name": "Clownfish", "quantity": 2}]))
+    service.create(layout(owner_email="other@example.com", fish_data=[{"name": "guppy ", "quantity": 5}]))
+
+    assert AquaLayoutRepository(db).get_tank_statistics() == {
+        "total_layouts": 3, "freshwater_tanks": 2, "saltwater_tanks": 1, "unique_users": 2,
+    }
+    statistics = LayoutStatsService(db).compute_statistics()
+    assert statistics["top_species"][0] == {"name": "Guppy", "tank_count": 2, "total_quantity": 7}
+
+    service.update(second.id, layout(tank_name="Reef", owner_email="third@example.com"))
+    service.delete(first.id)
+
+    statistics = LayoutStatsService(db).compute_statistics()
+    assert statistics["by_water_type"] == {"freshwater": 2}
+    assert statistics["unique_users"] == 2
+    assert {row["name"]: row["total_quantity"] for row in statistics["top_species"]} == {"Guppy": 7, "Neon Tetra": 6}
+    # Nothing for the reconciler to correct
+    assert LayoutStatsService(db).reconcile(fix=False) == {}
+
+
+def test_unchanged_fields_and_other_tables_leave_counters_alone(db):
+    service = AquariumService(db)
+    created = service.create(layout())
+    before = LayoutStatsRepository(db).stored()
+
+    service.update(created.id, layout(tank_name="Renamed", comments="only the name changed"))
+
+    assert LayoutStatsRepository(db).stored() == before
+
+
+def test_reconcile_catches_writes_that_bypass_the_orm(db):
+    AquariumService(db).create(layout())
+    db.execute(insert(AquaLayout), [dict(SAMPLE_LAYOUT, tank_name=f"Bulk {i}", owner_email="bulk@example.com") for i in range(3)])
+    db.commit()
+
+    service = LayoutStatsService(db)
+    drift = service.reconcile(fix=False)
+    assert drift[("layouts", "")] == (1, 4)
+    assert drift[("owners", "")] == (1, 2)
+
+    service.reconcile()
+    assert service.reconcile(fix=False) == {}
+    assert service.compute_statistics()["total_layouts"] == 4
+
+
+def test_corrections_keep_writes_made_during_the_recount(session_factory):
+    with session_factory() as db:
+        db.execute(insert(AquaLayout), [SAMPLE_LAYOUT])
+        db.commit()
+        drift, generation = LayoutStatsRepository(db).drift()
+        db.rollback()
+
+    # Committed after the recount, before its corrections
+    with session_factory() as db:
+        AquariumService(db).create(layout(owner_email="other@example.com"))
+
+    with session_factory() as first, session_factory() as second:
+        assert LayoutStatsRepository(first).correct(drift, generation)
+        first.commit()
+        # An overlapping reconcile that read the same counters applies nothing
+        assert not LayoutStatsRepository(second).correct(drift, generation)
+        second.commit()
+
+    with session_factory() as db:
+        assert LayoutStatsService(db).reconcile(fix=False) == {}
+        assert LayoutStatsRepository(db).get("layouts") == 2
+
+
+def test_reconciler_fills_empty_counters_on_start(session_factory):
+    with session_factory() as db:
+        db.execute(insert(AquaLayout), [SAMPLE_LAYOUT])
+        db.commit()
+        assert LayoutStatsService(db).needs_initial_count()
+
+    # Periodic recounts are off by default; the initial fill still runs
+    asyncio.run(StatsReconciler(session_factory, interval=0).run())
+
+    with session_factory() as db:
+        assert not LayoutStatsService(db).needs_initial_count()
+        assert LayoutStatsRepository(db).get("layouts") == 1
+
+
+def test_statistics_cost_does_not_grow_with_the_table(db):
+    db.execute(insert(AquaLayout), [dict(SAMPLE_LAYOUT, tank_name=f"Tank {i}") for i in range(500)])
+    db.commit()
+    LayoutStatsService(db).reconcile()
+
+    statements = []
+    engine = db.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        statistics = LayoutStatsService(db).compute_statistics()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert statistics["total_layouts"] == 500
+    assert len(statements) == 4
+    assert not any("aquarium_layouts" in statement for statement in statements)
+
+
+def test_stats_endpoint_is_cached(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "STATS_CACHE_SECONDS", 60)
+    with session_factory() as db:
+        AquariumService(db).create(layout())
+
+    app = FastAPI()
+    app.include_router(aquarium_routes.router, prefix="/api")
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    first = client.get("/api/aquariums/stats").json()
+    assert first["total_layouts"] == 1 and first["unique_users"] == 1
+    with session_factory() as db:
+        AquariumService(db).create(layout(tank_name="Second"))
+
+    assert client.get("/api/aquariums/stats").json() == first
+    clear_statistics_cache()
+    assert client.get("/api/aquariums/stats").json()["total_layouts"] == 2
@@ -0,0 +1,161 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.db.base import Base
+from backend.db.db import get_db
+from backend.db.migrate import run_migrations
+from backend.models import user_model, tank_maintain_model, aquarium_evaluation_model, layout_fish_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayout, AquaLayoutCreate
+from backend.repositories.aqualayout_repository import AquaLayoutRepository
+from backend.routes import aquarium_routes
+from backend.services.aquarium_service import AquariumService
+
+SAMPLE_LAYOUT = {
+    "owner_email": "test@example.com",
+    "tank_name": "Test Tank",
+    "tank_length": 60,
+    "tank_width": 30,
+    "tank_height": 40,
+    "water_type": "freshwater",
+    "fish_data": [],
+}
+
+# (length, width, height) in cm -> 54, 72, 112.5, 240 and 450 litres
+SIZES = [(60, 30, 30), (60, 30, 40), (75, 30, 50), (100, 40, 60), (150, 50, 60)]
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(AquaLayout), [
+            dict(SAMPLE_LAYOUT, tank_name=f"Tank {i}", tank_length=length, tank_width=width, tank_height=height,
+                 water_type="Saltwater" if i % 2 else "freshwater")
+            for i, (length, width, height) in enumerate(SIZES)
+        ])
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(aquarium_routes.router, prefix="/api")
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    app.dependency_overrides[get_db] = override_db
+    return TestClient(app)
+
+
+def test_dimensions_in_inches_are_stored_in_cm(db):
+    layout_data = AquaLayoutCreate(**dict(SAMPLE_LAYOUT, tank_length=24, tank_width=12, tank_height=16, unit="inch"))
+    assert "unit" not in layout_data.model_dump()
+
+    layout = AquariumService(db).create(layout_data)
+
+    assert layout.tank_length == pytest.approx(60.96)
+    # 24 x 12 x 16 in = 4608 in³ = 75.5 L (~20 US gallons)
+    assert layout.volume_liters == pytest.approx(75.51, abs=0.01)
+    assert AquaLayoutRepository(db).calculate_tank_volume_gallons(layout) == 19.9
+
+
+def test_volume_follows_updates(db):
+    service = AquariumService(db)
+    layout = service.create(AquaLayoutCreate(**SAMPLE_LAYOUT))
+    assert layout.volume_liters == pytest.approx(72)
+
+    layout = service.update(layout.id, AquaLayoutCreate(**dict(SAMPLE_LAYOUT, tank_height=50)))
+    assert layout.volume_liters == pytest.approx(90)
+
+
+def test_gallon_range_uses_centimetres(db):
+    repository = AquaLayoutRepository(db)
+
+    # 72 L is 19 US gallons; treating cm as inches used to make it 311
+    assert [layout.tank_name for layout in repository.get_by_tank_size_range(15, 20)] == ["Tank 1"]
+    assert repository.get_by_tank_size_range(300, 320) == []
+
+
+def test_volume_endpoint_pages_in_volume_order(client):
+    first = client.get("/api/aquariums/by-volume", params={"min_volume": 60, "max_volume": 300, "limit": 2})
+    assert [layout["volume_liters"] for layout in first.json()] == [72, 112.5]
+
+    second = client.get("/api/aquariums/by-volume", params={
+        "min_volume": 60, "max_volume": 300, "limit": 2, "cursor": first.headers["X-Next-Cursor"],
+    })
+    assert [layout["volume_liters"] for layout in second.json()] == [240]
+    assert "X-Next-Cursor" not in second.headers
+
+    gallons = client.get("/api/aquariums/by-volume", params={"min_volume": 25, "unit": "gallons", "water_type": "FRESHWATER"})
+    assert [layout["tank_name"] for layout in gallons.json()] == ["Tank 2", "Tank 4"]
+
+
+def test_histogram_buckets_per_water_type(client):
+    response = client.get("/api/aquariums/volume-histogram", params={"bucket_size": 100})
+
+    assert response.json() == [
+        {"water_type": "freshwater", "min_volume": 0, "max_volume": 100, "tank_count": 1},
+        {"water_type": "freshwater", "min_volume": 100, "max_volume": 200, "tank_count": 1},
+        {"water_type": "freshwater", "min_volume": 400, "max_volume": 500, "tank_count": 1},
+        {"water_type": "saltwater", "min_volume": 0, "max_volume": 100, "tank_count": 1},
+        {"water_type": "saltwater", "min_volume": 200, "max_volume": 300, "tank_count": 1},
+    ]
+    saltwater = client.get("/api/aquariums/volume-histogram", params={
+        "bucket_size": 50, "unit": "gallons", "water_type": "saltwater",
+    })
+    assert saltwater.json() == [
+        {"water_type": "saltwater", "min_volume": 0, "max_volume": 50, "tank_count": 1},
+        {"water_type": "saltwater", "min_volume": 50, "max_volume": 100, "tank_count": 1},
+    ]
+    assert client.get("/api/aquariums/volume-histogram", params={"bucket_size": 0}).status_code == 422
+
+
+def test_volume_queries_read_the_volume_index(db):
+    statements = []
+    engine = db.get_bind()
+    listener = lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters))  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        AquaLayoutRepository(db).get_volume_page(min_liters=50, max_liters=100)
+        AquaLayoutRepository(db).get_volume_histogram(50)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    page_plan, histogram_plan = (
+        " ".join(row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+        for statement, parameters in statements
+    )
+    assert "ix_aquarium_layouts_volume_liters_water_type (volume_liters>? AND volume_liters<?)" in page_plan
+    assert "TEMP B-TREE FOR ORDER BY" not in page_plan
+    assert "ix_aquarium_layouts_volume_liters_water_type (volume_liters>?)" in histogram_plan
+
+
+def test_migration_computes_volume_for_existing_layouts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    run_migrations(engine, target=3)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO aquarium_layouts (owner_email, tank_name, tank_length, tank_width, tank_height, "
+            "water_type, fish_data) VALUES ('a@example.com', 'Old', 60, 30, 40, 'freshwater', '[]')"
+        ))
+
+    run_migrations(engine)
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT volume_liters FROM aquarium_layouts")).scalar() == pytest.approx(72)
+    engine.dispose()
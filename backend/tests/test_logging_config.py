@@ -0,0 +1,102 @@
+import json
+import logging
+import pytest
+from backend.logging_config import (
+    DebugSampler, log_payload, parse_logger_files, parse_logger_levels, setup_logging, shutdown_logging,
+)
+
+
+@pytest.fixture
+def configure(capsys):
+    """Run setup_logging against captured stdout and restore the root logger afterwards."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+
+    def configure(**kwargs):
+        setup_logging(**kwargs)
+
+        def lines():
+            shutdown_logging()  # drains the queue
+            return [line for line in capsys.readouterr().out.splitlines() if line]
+        return lines
+
+    yield configure
+    shutdown_logging()
+    root.handlers, root.level = saved_handlers, saved_level
+    logging.getLogger("backend.test").setLevel(logging.NOTSET)
+
+
+def test_json_lines_include_extras(configure):
+    lines = configure(level="INFO")
+    logging.getLogger("backend.test").info("evaluated %s", "tank", extra={"job_id": 7})
+
+    entry = json.loads(lines()[-1])
+    assert entry["message"] == "evaluated tank"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "backend.test"
+    assert entry["job_id"] == 7
+
+
+def test_message_is_resolved_when_logged(configure):
+    lines = configure(level="INFO")
+    payload = {"state": "before"}
+    logging.getLogger("backend.test").info("payload %s", payload)
+    payload["state"] = "after"
+
+    assert "before" in json.loads(lines()[-1])["message"]
+
+
+def test_payloads_are_off_by_default(configure):
+    lines = configure(level="DEBUG", debug_sample_rate=1.0)
+    log_payload(logging.getLogger("backend.test"), "AI service response", {"secret": "body"})
+
+    assert not any("secret" in line for line in lines())
+
+
+def test_payloads_bypass_sampling_when_enabled(configure):
+    lines = configure(level="DEBUG", debug_sample_rate=0.0, log_payloads=True)
+    logger = logging.getLogger("backend.test")
+    logger.debug("sampled away")
+    log_payload(logger, "AI service response", {"status": "success"})
+
+    messages = [json.loads(line)["message"] for line in lines()]
+    assert "sampled away" not in messages
+    assert "AI service response: {'status': 'success'}" in messages
+
+
+def test_noisy_libraries_default_to_warning(configure):
+    configure(level="DEBUG", logger_levels="httpx=INFO")
+
+    assert logging.getLogger("sqlalchemy.engine").level == logging.WARNING
+    assert logging.getLogger("httpx").level == logging.INFO
+
+
+def test_logger_files_receive_only_their_logger(configure, tmp_path):
+    path = tmp_path / "slow_queries.log"
+    lines = configure(level="INFO", logger_files=f"backend.db.slow_queries={path}")
+    logging.getLogger("backend.db.slow_queries").warning("slow statement")
+    logging.getLogger("backend.test").warning("unrelated")
+    lines()
+
+    written = [json.loads(line)["message"] for line in path.read_text().splitlines()]
+    assert written == ["slow statement"]
+
+
+def test_parse_logger_files():
+    assert parse_logger_files("backend.db.slow_queries=/var/log/slow.log") == {
+        "backend.db.slow_queries": "/var/log/slow.log",
+    }
+
+
+def test_debug_sampler_passes_info_and_above():
+    sampler = DebugSampler(0.0)
+    assert sampler.filter(logging.makeLogRecord({"levelno": logging.INFO}))
+    assert not sampler.filter(logging.makeLogRecord({"levelno": logging.DEBUG}))
+
+
+def test_parse_logger_levels():
+    assert parse_logger_levels("httpx=info, backend.services = DEBUG,bad") == {
+        "httpx": "INFO",
+        "backend.services": "DEBUG",
+    }
+    assert parse_logger_levels("") == {}
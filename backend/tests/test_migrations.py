@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import create_engine, inspect
+from backend.db import migrate
+from backend.db.base import Base
+from backend.db.migrate import applied_versions, discover, pending_migrations, run_migrations
+from backend.models import (  # noqa: F401
+    user_model, fish_model, aqualayout_model, tank_maintain_model, evaluation_job_model, aquarium_evaluation_model,
+    layout_fish_model, layout_stats_model,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    yield engine
+    engine.dispose()
+
+
+def describe(engine):
+    """Columns, indexes, unique constraints and foreign keys of every table except schema_migrations."""
+    inspector = inspect(engine)
+    return {
+        table: (
+            [(column["name"], str(column["type"]), column["nullable"]) for column in inspector.get_columns(table)],
+            inspector.get_indexes(table),
+            inspector.get_unique_constraints(table),
+            inspector.get_foreign_keys(table),
+        )
+        for table in inspector.get_table_names() if table != "schema_migrations"
+    }
+
+
+def test_migrations_are_ordered_and_start_at_one():
+    versions = [migration.version for migration in discover()]
+    assert versions[0] == 1
+    assert versions == sorted(versions)
+
+
+def test_fresh_database_is_migrated_once(engine):
+    applied = run_migrations(engine)
+
+    assert [migration.version for migration in applied] == [migration.version for migration in discover()]
+    assert applied_versions(engine) == {migration.version for migration in discover()}
+    assert run_migrations(engine) == []
+    assert pending_migrations(engine) == []
+
+
+def test_migrated_schema_matches_the_models(engine):
+    run_migrations(engine)
+    from_models = create_engine("sqlite://")
+    Base.metadata.create_all(from_models)
+
+    assert describe(engine) == describe(from_models)
+
+
+def test_database_created_before_migrations_is_adopted(engine):
+    # Deployments that predate migrations already have the tables create_all made
+    Base.metadata.create_all(engine)
+
+    assert [migration.version for migration in run_migrations(engine)][0] == 1
+    assert pending_migrations(engine) == []
+
+
+def test_target_stops_early(engine, monkeypatch):
+    monkeypatch.setattr(migrate, "discover", lambda: [
+        migrate.Migration(1, "initial_schema", "backend.db.migrations.0001_initial_schema"),
+        migrate.Migration(2, "never_applied", "backend.db.migrations.does_not_exist"),
+    ])
+
+    assert [migration.version for migration in run_migrations(engine, target=1)] == [1]
+    assert [migration.version for migration in pending_migrations(engine)] == [2]
+
+
+def test_failed_migration_is_not_recorded(engine, monkeypatch):
+    monkeypatch.setattr(migrate, "discover", lambda: [
+        migrate.Migration(1, "broken", "backend.db.migrations.does_not_exist"),
+    ])
+
+    with pytest.raises(ModuleNotFoundError):
+        run_migrations(engine)
+    assert applied_versions(engine) == set()
@@ -0,0 +1,188 @@
+import base64
+import json
+from datetime import datetime, timedelta
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.config import settings
+from backend.db.base import Base
+from backend.db.db import get_db
+from backend.models import aquarium_evaluation_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayout
+from backend.models.fish_model import Fish
+from backend.models.tank_maintain_model import TankMaintenance
+from backend.models.user_model import User
+from backend.repositories.aqualayout_repository import LAYOUT_ORDER, VOLUME_ORDER, AquaLayoutRepository
+from backend.repositories.pagination import InvalidCursorError
+from backend.routes import aquarium_routes, fish_routes, tank_maintain_routes, user_routes
+
+OWNER = "owner@example.com"
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"first_name": "F", "last_name": "L", "email": f"user{i}@example.com", "password": "x", "role": "user"}
+            for i in range(7)
+        ])
+        # Pairs of layouts share a created_at, so the id tie-break matters
+        connection.execute(insert(AquaLayout), [
+            {
+                "owner_email": OWNER if i % 3 else "other@example.com",
+                "created_at": START + timedelta(hours=i // 2),
+                "tank_name": f"Tank {i}",
+                "tank_length": 60, "tank_width": 30, "tank_height": 40,
+                "water_type": "freshwater",
+                "fish_data": [],
+            }
+            for i in range(25)
+        ])
+        connection.execute(insert(TankMaintenance), [
+            {"layout_id": 2, "owner_email": OWNER, "maintenance_date": START + timedelta(days=i % 4),
+             "maintenance_type": "Water Change", "completed": 0}
+            for i in range(9)
+        ])
+        connection.execute(insert(Fish), [
+            {"name": name, "water_type": "freshwater"} for name in ["Guppy", "Angelfish", "Molly", "Betta", "Platy"]
+        ])
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    for router in (aquarium_routes, fish_routes, tank_maintain_routes):
+        app.include_router(router.router, prefix="/api")
+    app.include_router(user_routes.router, prefix="/api")
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    app.dependency_overrides[get_db] = override_db
+    return TestClient(app)
+
+
+def walk(client, url, limit):
+    """Follow X-Next-Cursor to the end; returns the pages' bodies"""
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+
+
+def test_layouts_by_owner_walk_every_row_once_newest_first(client, session_factory):
+    pages = walk(client, f"/api/aquariums/by-owner/{OWNER}", limit=4)
+    items = [item for page in pages for item in page]
+
+    with session_factory() as db:
+        expected = [layout.id for layout in AquaLayoutRepository(db).get_by_user_email(OWNER)]
+    assert len(expected) == 16
+    assert sorted(item["id"] for item in items) == sorted(expected)
+    assert [len(page) for page in pages] == [4, 4, 4, 4]
+    keys = [(item["created_at"], item["id"]) for item in items]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_other_list_endpoints_page_in_their_own_order(client):
+    fish = [item["name"] for page in walk(client, "/api/fish/", limit=2) for item in page]
+    assert fish == ["Angelfish", "Betta", "Guppy", "Molly", "Platy"]
+
+    entries = [item for page in walk(client, "/api/maintenance/layout/2", limit=4) for item in page]
+    assert len(entries) == 9
+    keys = [(item["maintenance_date"], item["id"]) for item in entries]
+    assert keys == sorted(keys)
+
+    owner_entries = [item for page in walk(client, f"/api/maintenance/owner/{OWNER}", limit=5) for item in page]
+    assert len(owner_entries) == 9
+
+    users = [item["id"] for page in walk(client, "/api/users", limit=3) for item in page]
+    assert users == sorted(users) and len(users) == 7
+
+
+def test_last_page_has_no_cursor(client):
+    response = client.get("/api/fish/", params={"limit": 5})
+
+    assert len(response.json()) == 5
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_bad_cursor_and_oversized_limit_are_rejected(client):
+    assert client.get("/api/aquariums/", params={"cursor": "not-a-cursor"}).status_code == 400
+    # A cursor from another endpoint has the wrong shape
+    fish_cursor = client.get("/api/fish/", params={"limit": 1}).headers["X-Next-Cursor"]
+    assert client.get("/api/users", params={"cursor": fish_cursor}).status_code == 400
+    assert client.get("/api/fish/", params={"limit": settings.PAGE_SIZE_MAX + 1}).status_code == 422
+
+
+def test_page_size_is_capped_and_pushed_into_sql(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "PAGE_SIZE_MAX", 3)
+    statements = []
+    with session_factory() as db:
+        engine = db.get_bind()
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            first = AquaLayoutRepository(db).get_page(cursor=None, limit=1000)
+            second = AquaLayoutRepository(db).get_page(cursor=first.next_cursor, limit=1000)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(first.items) == len(second.items) == 3
+    assert first.items[-1].id != second.items[0].id
+    assert all("LIMIT" in statement for statement in statements)
+    assert "(aquarium_layouts.created_at, aquarium_layouts.id) <" in statements[1]
+
+
+def test_deep_owner_page_reads_the_owner_index_without_sorting(session_factory):
+    with session_factory() as db:
+        cursor = AquaLayoutRepository(db).get_page(owner_email=OWNER, cursor=None, limit=10).next_cursor
+        query = db.query(AquaLayout).filter(AquaLayout.owner_email == OWNER)
+        compiled = LAYOUT_ORDER._bounded(query, cursor, 10).statement.compile(
+            db.get_bind(), compile_kwargs={"literal_binds": True}
+        )
+        plan = " ".join(row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all())
+
+    assert "ix_aquarium_layouts_owner_email_created_at" in plan
+    # At most the id tie-break within one created_at is sorted, never the whole result
+    assert "TEMP B-TREE FOR ORDER BY" not in plan
+
+
+def test_decode_rejects_garbage():
+    with pytest.raises(InvalidCursorError):
+        LAYOUT_ORDER.decode("!!!")
+
+
+@pytest.mark.parametrize("values", [
+    ["2024-01-01T00:00:00", "7"],
+    ["2024-01-01T00:00:00", 7.5],
+    ["2024-01-01T00:00:00", True],
+    [1704067200, 7],
+    [None, 7],
+    [["2024-01-01T00:00:00"], 7],
+])
+def test_decode_rejects_keys_of_the_wrong_type(values):
+    cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+    with pytest.raises(InvalidCursorError):
+        LAYOUT_ORDER.decode(cursor)
+
+
+def test_decode_returns_each_key_as_its_column_type():
+    cursor = base64.urlsafe_b64encode(json.dumps([30, 7]).encode()).decode()
+
+    assert VOLUME_ORDER.decode(cursor) == [30.0, 7]
+    assert isinstance(VOLUME_ORDER.decode(cursor)[0], float)
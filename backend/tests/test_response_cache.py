@@ -0,0 +1,213 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, event, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.db.base import Base
+from backend.db.db import get_db
+from backend.models import user_model, aquarium_evaluation_model, layout_fish_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayout
+from backend.models.tank_maintain_model import TankMaintenance
+from backend.routes import aquarium_routes, fish_routes, tank_maintain_routes
+from backend.services.fish_catalog import FISH_CATALOG
+from backend.services.response_cache import RESPONSE_CACHE, ResponseCache
+
+OWNER = "test@example.com"
+OTHER = "other@example.com"
+LAYOUT = {
+    "owner_email": OWNER,
+    "tank_name": "Test Tank",
+    "tank_length": 60,
+    "tank_width": 30,
+    "tank_height": 40,
+    "water_type": "freshwater",
+    "fish_data": [{"name": "Neon Tetra", "quantity": 6}],
+}
+MAINTENANCE = {
+    "owner_email": OWNER,
+    "maintenance_date": "2024-05-01T10:00:00Z",
+    "maintenance_type": "Water Change",
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalog():
+    FISH_CATALOG.clear()
+    yield
+    FISH_CATALOG.clear()
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def client(engine):
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    app = FastAPI()
+    for module in (aquarium_routes, fish_routes, tank_maintain_routes):
+        app.include_router(module.router, prefix="/api")
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    app.dependency_overrides[get_db] = override_db
+    return TestClient(app)
+
+
+def count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+def test_eviction_is_least_recently_used_and_bounded_by_bytes():
+    cache = ResponseCache(max_bytes=10, ttl=60)
+    token = cache.token()
+    cache.put("r", "a", b"aaaa", {}, ["x"], token)
+    cache.put("r", "b", b"bbbb", {}, ["y"], token)
+    cache.get("r", "a")
+    cache.put("r", "c", b"cccc", {}, ["y"], token)
+
+    assert cache.get("r", "b") is None
+    assert cache.get("r", "a").body == b"aaaa"
+    assert not cache.put("r", "d", b"d" * 11, {}, [], token)
+    assert cache.summary()["bytes"] == 8 and cache.summary()["evictions"] == 1
+
+    cache.invalidate("y")
+    assert cache.get("r", "c") is None
+    assert cache.get("r", "a") is not None
+    assert cache.summary()["routes"]["r"] == {"hits": 3, "misses": 2, "stale": 0, "stores": 3, "hit_ratio": 0.6}
+
+
+def test_reads_overtaken_by_a_write_are_not_stored():
+    cache = ResponseCache(max_bytes=1024, ttl=60)
+    token = cache.token()
+    cache.invalidate("owner:a")  # committed while the read was in flight
+    assert not cache.put("r", "k", b"stale", {}, ["owner:a"], token)
+    assert cache.put("r", "k2", b"fine", {}, ["owner:b"], token)
+    assert cache.put("r", "k", b"fresh", {}, ["owner:a"], cache.token())
+
+    # Tags no longer tracked count as invalidated at the oldest time forgotten
+    cache.MAX_TRACKED_TAGS = 1
+    token = cache.token()
+    cache.invalidate("owner:c")
+    cache.invalidate("owner:d")
+    assert not cache.put("r", "k3", b"stale", {}, ["owner:c"], token)
+
+
+def test_expired_entries_are_misses():
+    cache = ResponseCache(max_bytes=1024, ttl=0)
+    cache.put("r", "k", b"body", {}, [], cache.token())
+    assert cache.get("r", "k") is None
+    assert cache.summary()["entries"] == 0
+
+
+def test_repeat_reads_run_no_queries(client, engine):
+    client.post("/api/aquariums/", json=LAYOUT)
+    client.post("/api/aquariums/", json=dict(LAYOUT, tank_name="Second"))
+    url = f"/api/aquariums/by-owner/{OWNER}"
+    first = client.get(url, params={"limit": 1})
+
+    statements = count_statements(engine)
+    again = client.get(url, params={"limit": 1})
+    assert statements == []
+    # Revalidation reads ids and versions only, never the rows themselves
+    unchanged = client.get(url, params={"limit": 1}, headers={"If-None-Match": first.headers["ETag"]})
+    assert len(statements) == 1
+    assert "fish_data" not in statements[0]
+
+    assert again.content == first.content
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert again.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    assert again.headers["Content-Type"] == "application/json"
+    assert unchanged.status_code == 304
+    assert RESPONSE_CACHE.summary()["routes"]["GET /aquariums/by-owner/{email}"]["hits"] == 2
+
+
+def test_revalidation_sees_writes_from_other_processes(client, engine):
+    layout = client.post("/api/aquariums/", json=LAYOUT).json()
+    entry = client.post("/api/maintenance/", json=dict(MAINTENANCE, layout_id=layout["id"])).json()
+    by_owner, by_layout = f"/api/aquariums/by-owner/{OWNER}", f"/api/maintenance/layout/{layout['id']}"
+    by_maintenance_owner = f"/api/maintenance/owner/{OWNER}"
+    cached = {url: client.get(url) for url in (by_owner, by_layout, by_maintenance_owner)}
+
+    # Another process writes: nothing is invalidated in this one
+    with engine.begin() as connection:
+        connection.execute(update(AquaLayout).where(AquaLayout.id == layout["id"]).values(tank_name="Renamed"))
+        connection.execute(update(TankMaintenance).where(TankMaintenance.id == entry["id"]).values(completed=1))
+
+    # Plain reads keep the stored body until it expires
+    assert client.get(by_owner).content == cached[by_owner].content
+
+    def revalidate(url):
+        return client.get(url, headers={"If-None-Match": cached[url].headers["ETag"]})
+
+    fresh = revalidate(by_owner)
+    assert fresh.status_code == 200 and fresh.json()[0]["tank_name"] == "Renamed"
+    assert fresh.headers["ETag"] != cached[by_owner].headers["ETag"]
+    assert revalidate(by_layout).json()[0]["completed"] == 1
+    assert revalidate(by_maintenance_owner).json()[0]["completed"] == 1
+    assert RESPONSE_CACHE.summary()["routes"]["GET /aquariums/by-owner/{email}"]["stale"] == 1
+    # The fresh response replaced the stale one
+    assert client.get(by_owner).json()[0]["tank_name"] == "Renamed"
+
+    with engine.begin() as connection:
+        connection.execute(delete(TankMaintenance))
+        connection.execute(delete(AquaLayout))
+    assert revalidate(by_layout).status_code == 404
+
+
+def test_layout_writes_invalidate_their_owner(client):
+    layout = client.post("/api/aquariums/", json=LAYOUT).json()
+    client.post("/api/aquariums/", json=dict(LAYOUT, owner_email=OTHER))
+    mine, theirs = f"/api/aquariums/by-owner/{OWNER}", f"/api/aquariums/by-owner/{OTHER}"
+    client.get(mine), client.get(theirs), client.get("/api/aquariums/")
+
+    client.put(f"/api/aquariums/{layout['id']}", json=dict(LAYOUT, tank_name="Renamed"))
+    assert client.get(mine).json()[0]["tank_name"] == "Renamed"
+    assert client.get("/api/aquariums/").json()[-1]["tank_name"] == "Renamed"
+    assert RESPONSE_CACHE.summary()["routes"]["GET /aquariums/by-owner/{email}"]["hits"] == 0
+
+    # Moving a layout to another owner changes both lists
+    client.get(mine)
+    client.put(f"/api/aquariums/{layout['id']}", json=dict(LAYOUT, owner_email=OTHER))
+    assert client.get(mine).json() == []
+    assert len(client.get(theirs).json()) == 2
+
+
+def test_maintenance_lists_follow_writes(client):
+    layout = client.post("/api/aquariums/", json=LAYOUT).json()
+    by_layout, by_owner = f"/api/maintenance/layout/{layout['id']}", f"/api/maintenance/owner/{OWNER}"
+    assert client.get(by_layout).json() == [] and client.get(by_owner).json() == []
+
+    entry = client.post("/api/maintenance/", json=dict(MAINTENANCE, layout_id=layout["id"])).json()
+    assert [item["id"] for item in client.get(by_layout).json()] == [entry["id"]]
+    assert [item["id"] for item in client.get(by_owner).json()] == [entry["id"]]
+
+    client.put(f"/api/maintenance/{entry['id']}", json=dict(MAINTENANCE, layout_id=layout["id"], completed=1))
+    assert client.get(by_layout).json()[0]["completed"] == 1
+
+    # Deleting the layout takes its maintenance entries with it
+    client.delete(f"/api/aquariums/{layout['id']}")
+    assert client.get(by_layout).status_code == 404
+    assert client.get(by_owner).json() == []
+
+
+def test_fish_writes_invalidate_the_catalog(client):
+    client.post("/api/fish/", json={"name": "Neon Tetra", "water_type": "freshwater"})
+    assert len(client.get("/api/fish/").json()) == 1
+    assert len(client.get("/api/fish/").json()) == 1
+
+    created = client.post("/api/fish/", json={"name": "Guppy", "water_type": "freshwater"}).json()
+    assert len(client.get("/api/fish/").json()) == 2
+    client.delete(f"/api/fish/{created['id']}")
+    assert len(client.get("/api/fish/").json()) == 1
+    assert RESPONSE_CACHE.summary()["routes"]["GET /fish/"]["hits"] == 1
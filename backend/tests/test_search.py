@@ -0,0 +1,127 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.db.base import Base
+from backend.db.db import get_db
+from backend.models import user_model, tank_maintain_model, aquarium_evaluation_model, layout_fish_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayout
+from backend.models.fish_model import Fish, FishCreate
+from backend.repositories.fish_repository import FISH_NAME_SEARCH, FishRepository
+from backend.repositories.ngram_index import NGramIndex, similarity
+from backend.repositories.search import like_pattern
+from backend.routes import aquarium_routes, fish_routes
+
+CATALOG = ["Neon Tetra", "Cardinal Tetra", "Black Skirt Tetra", "Tetra", "Guppy", "Betta", "Clown Loach", "100% Pleco"]
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Fish), [{"name": name, "water_type": "freshwater"} for name in CATALOG])
+        connection.execute(insert(AquaLayout), [
+            {"owner_email": "a@example.com", "tank_name": name, "tank_length": 60, "tank_width": 30,
+             "tank_height": 40, "water_type": "freshwater", "fish_data": []}
+            for name in ["Reef Tank", "Living Room Reef", "Nano Reef", "Reef Tank", "Shrimp Tank"]
+        ])
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def test_similarity_matches_pg_trgm():
+    # The example from the pg_trgm documentation
+    assert similarity("word", "two words") == pytest.approx(0.363636, abs=1e-6)
+
+
+def test_ngram_index_finds_substrings_ranked_by_similarity():
+    index = NGramIndex()
+    index.load(enumerate(CATALOG, start=1))
+
+    assert index.search("tetra", 10) == [4, 1, 2, 3]  # exact name first, then by similarity and name
+    assert index.search("TETRA", 2) == [4, 1]
+    assert index.search("etr", 10) == [4, 1, 2, 3]
+    assert index.search("tetras", 10) == []
+    # Shorter than a trigram: every distinct name is checked
+    assert set(index.search("et", 10)) == {1, 2, 3, 4, 6}
+
+
+def test_ngram_index_updates_and_shares_repeated_names():
+    index = NGramIndex()
+    index.load([(1, "Reef Tank"), (2, "reef tank"), (3, "Nano")])
+
+    assert index.search("reef", 10) == [1, 2]
+    index.apply([(1, "Shrimp Tank"), (3, None)])
+    assert index.search("reef", 10) == [2]
+    assert index.search("tank", 10) == [2, 1]
+    assert index.search("nano", 10) == []
+    assert len(index) == 2
+
+
+def test_like_pattern_escapes_wildcards():
+    assert like_pattern("100%_a\\b") == "%100\\%\\_a\\\\b%"
+
+
+def test_fish_search_follows_committed_writes(db):
+    repository = FishRepository(db)
+    assert [fish.name for fish in repository.search_by_name("tetra")] == [
+        "Tetra", "Neon Tetra", "Cardinal Tetra", "Black Skirt Tetra",
+    ]
+    # Wildcards are matched literally
+    assert [fish.name for fish in repository.search_by_name("100%")] == ["100% Pleco"]
+    assert repository.search_by_name("%") == repository.search_by_name("100%")
+
+    created = repository.create(FishCreate(name="Rummynose Tetra", water_type="freshwater"))
+    assert "Rummynose Tetra" in [fish.name for fish in repository.search_by_name("tetra")]
+
+    db.add(Fish(name="Diamond Tetra", water_type="freshwater"))
+    db.flush()
+    db.rollback()
+    assert "Diamond Tetra" not in [fish.name for fish in repository.search_by_name("tetra")]
+
+    repository.update(created.id, FishCreate(name="Rummy-nose Tetra", water_type="freshwater"))
+    assert [fish.name for fish in repository.search_by_name("rummy")] == ["Rummy-nose Tetra"]
+    repository.delete(created.id)
+    assert repository.search_by_name("rummy") == []
+
+
+def test_fallback_index_is_built_once_per_database(db, session_factory):
+    FishRepository(db).search_by_name("guppy")
+    index = FISH_NAME_SEARCH.fallback.built(db.get_bind())
+
+    with session_factory() as other:
+        FishRepository(other).search_by_name("betta")
+    assert FISH_NAME_SEARCH.fallback.built(db.get_bind()) is index
+    assert len(index) == len(CATALOG)
+
+
+def test_search_endpoints(session_factory):
+    app = FastAPI()
+    app.include_router(fish_routes.router, prefix="/api")
+    app.include_router(aquarium_routes.router, prefix="/api")
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    assert [fish["name"] for fish in client.get("/api/fish/search", params={"q": "tetra", "limit": 2}).json()] == [
+        "Tetra", "Neon Tetra",
+    ]
+    assert [layout["tank_name"] for layout in client.get("/api/aquariums/search", params={"q": "reef"}).json()] == [
+        "Nano Reef", "Reef Tank", "Reef Tank", "Living Room Reef",
+    ]
+    assert client.get("/api/fish/search", params={"q": "tetra", "limit": 1000}).status_code == 422
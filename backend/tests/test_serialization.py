@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+import pytest
+from pydantic import BaseModel, TypeAdapter, computed_field
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from backend.db.base import Base
+from backend.models import user_model, tank_maintain_model, aquarium_evaluation_model, layout_fish_model  # noqa: F401
+from backend.models.aqualayout_model import AquaLayout, AquaLayoutResponse
+from backend.models.fish_model import FishResponse
+from backend.models.tank_maintain_model import TankMaintenanceResponse
+from backend.routes.serialization import RowSerializer
+
+
+def pydantic_json(model, rows) -> bytes:
+    """What FastAPI does with a response_model: validate the rows, then serialize them"""
+    adapter = TypeAdapter(list[model])
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_layout_rows_match_the_response_model(db):
+    db.execute(insert(AquaLayout), [
+        {"owner_email": "a@example.com", "tank_name": "Reef", "tank_length": 60, "tank_width": 30.5,
+         "tank_height": 40, "water_type": "saltwater", "comments": "Ünïcode \"quoted\" </script>",
+         "fish_data": [{"name": "Clownfish", "quantity": 2}, {"name": "Blue Tang", "quantity": 1, "note": "extra"}],
+         "created_at": datetime(2024, 5, 1, 10, 0, 0, 123456)},
+        {"owner_email": "b@example.com", "tank_name": "Nano", "tank_length": 20, "tank_width": 20,
+         "tank_height": 20, "water_type": "freshwater", "fish_data": []},
+    ])
+    rows = db.scalars(select(AquaLayout).order_by(AquaLayout.id)).all()
+
+    assert RowSerializer(AquaLayoutResponse).dumps(rows) == pydantic_json(AquaLayoutResponse, rows)
+
+
+def test_datetimes_and_optional_fields_match():
+    rows = [
+        {"id": i, "layout_id": 1, "owner_email": "a@example.com", "created_at": created_at,
+         "maintenance_date": created_at, "maintenance_type": "Water Change", "description": None,
+         "notes": "ok", "completed": 0}
+        for i, created_at in enumerate([
+            datetime(2024, 5, 1, 10, 0),
+            datetime(2024, 5, 1, 10, 0, 0, 5, tzinfo=timezone.utc),
+            datetime(2024, 5, 1, tzinfo=timezone(timedelta(hours=-5, minutes=-30))),
+        ])
+    ]
+    assert RowSerializer(TankMaintenanceResponse).dumps(rows) == pydantic_json(TankMaintenanceResponse, rows)
+
+    fish = [FishResponse(id=1, name="Guppy", water_type="freshwater"),
+            FishResponse(id=2, name="Tang", image_url="/static/tang.jpg", water_type="saltwater")]
+    assert RowSerializer(FishResponse).dumps(fish) == TypeAdapter(list[FishResponse]).dump_json(fish)
+
+
+def test_schemas_it_cannot_reproduce_are_refused():
+    class Tagged(BaseModel):
+        tags: Dict[str, int]
+
+    class Computed(BaseModel):
+        width: float
+
+        @computed_field
+        @property
+        def area(self) -> float:
+            return self.width ** 2
+
+    for model in (Tagged, Computed):
+        with pytest.raises(TypeError):
+            RowSerializer(model)
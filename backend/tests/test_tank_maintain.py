@@ -98,7 +98,7 @@ class TestTankMaintenance:
         mock_aquarium_service.get_by_id.return_value = Mock(id=1)
         
         # Mock the repository to return a list of maintenance entries
-        mock_db.query.return_value.filter.return_value.all.return_value = [
+        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = [
             Mock(
                 id=1,
                 layout_id=1,
@@ -117,7 +117,7 @@ class TestTankMaintenance:
 
     def test_get_maintenance_by_owner(self, mock_db, sample_maintenance):
         # Mock the repository to return a list of maintenance entries
-        mock_db.query.return_value.filter.return_value.all.return_value = [
+        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = [
             Mock(
                 id=1,
                 layout_id=1,
@@ -1,17 +1,14 @@
 import { API_BASE_URL, API_URL } from '../config';
+import { fetchAllPages } from './pagination';
 
 export class AquariumService {
   static async getLayoutsByOwner(ownerEmail: string) {
-    const response = await fetch(`${API_BASE_URL}${API_URL}/aquariums/by-owner/${ownerEmail}`, {
+    return fetchAllPages(`${API_BASE_URL}${API_URL}/aquariums/by-owner/${ownerEmail}`, {
       cache: 'no-cache',
       headers: {
         'Cache-Control': 'no-cache',
       }
-    });
-    if (!response.ok) {
-      throw new Error('Failed to fetch aquarium layouts');
-    }
-    return response.json();
+    }, 'Failed to fetch aquarium layouts');
   }
 
   static async getLayout(id: number) {
@@ -1,16 +1,13 @@
 import { Fish } from '../types/fish';
 import { API_BASE_URL } from '../config';
+import { fetchAllPages } from './pagination';
 
 const API_URL = '/api/fish';
 
 export class FishService {
   static async getAllFish(): Promise<Fish[]> {
     try {
-      const response = await fetch(`${API_BASE_URL}${API_URL}`);
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-      return await response.json();
+      return await fetchAllPages<Fish>(`${API_BASE_URL}${API_URL}`);
     } catch (error) {
       console.error('Error fetching fish:', error);
       return [];
@@ -56,6 +53,19 @@ export class FishService {
     }
   }
 
+  static async autocompleteFish(prefix: string, limit = 10): Promise<Fish[]> {
+    try {
+      const response = await fetch(`${API_BASE_URL}${API_URL}/autocomplete?q=${encodeURIComponent(prefix)}&limit=${limit}`);
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      return await response.json();
+    } catch (error) {
+      console.error('Error autocompleting fish:', error);
+      return [];
+    }
+  }
+
   static async createFish(fish: Omit<Fish, 'id'>): Promise<Fish | null> {
     try {
       const response = await fetch(`${API_BASE_URL}${API_URL}`, {
@@ -0,0 +1,20 @@
+// List endpoints return one page at a time; the next page's cursor comes back
+// in the X-Next-Cursor header and is absent on the last page.
+const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+export async function fetchAllPages<T>(url: string, init?: RequestInit, errorMessage = 'Failed to fetch list'): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const pageUrl: string = cursor
+      ? `${url}${url.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(cursor)}`
+      : url;
+    const response: Response = await fetch(pageUrl, init);
+    if (!response.ok) {
+      throw new Error(`${errorMessage} (status ${response.status})`);
+    }
+    items.push(...(await response.json()));
+    cursor = response.headers.get(NEXT_CURSOR_HEADER);
+  } while (cursor);
+  return items;
+}
@@ -1,5 +1,6 @@
 import { TankMaintenanceCreate } from '../types/tankMaintenance';
 import { API_BASE_URL, API_URL } from '../config';
+import { fetchAllPages } from './pagination';
 
 export class TankMaintenanceService {
   static async create(maintenance: TankMaintenanceCreate) {
@@ -17,29 +18,21 @@ export class TankMaintenanceService {
   }
 
   static async getByOwner(ownerEmail: string) {
-    const response = await fetch(`${API_BASE_URL}${API_URL}/maintenance/owner/${ownerEmail}`, {
+    return fetchAllPages(`${API_BASE_URL}${API_URL}/maintenance/owner/${ownerEmail}`, {
       cache: 'no-cache',
       headers: {
         'Cache-Control': 'no-cache',
       }
-    });
-    if (!response.ok) {
-      throw new Error('Failed to fetch maintenance entries');
-    }
-    return response.json();
+    }, 'Failed to fetch maintenance entries');
   }
 
   static async getByLayout(layoutId: number) {
-    const response = await fetch(`${API_BASE_URL}${API_URL}/maintenance/layout/${layoutId}`, {
+    return fetchAllPages(`${API_BASE_URL}${API_URL}/maintenance/layout/${layoutId}`, {
       cache: 'no-cache',
       headers: {
         'Cache-Control': 'no-cache',
       }
-    });
-    if (!response.ok) {
-      throw new Error('Failed to fetch maintenance entries');
-    }
-    return response.json();
+    }, 'Failed to fetch maintenance entries');
   }
 
   static async update(id: number, maintenance: Partial<TankMaintenanceCreate>) {
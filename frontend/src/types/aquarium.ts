@@ -12,9 +12,11 @@ export interface AquaLayoutCreate {
   water_type: string;
   fish_data: FishEntry[];
   comments?: string;
+  unit?: 'cm' | 'inch';  // of the dimensions; stored in cm
 }
 
 export interface AquaLayout extends AquaLayoutCreate {
   id: number;
   created_at: string;
+  volume_liters: number;
 } 
\ No newline at end of file
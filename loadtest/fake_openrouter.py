@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Fake OpenRouter
+
+An OpenAI-compatible chat-completions server for load testing the AI path
+without spending tokens or hitting rate limits. Latency, token rate, error
+rate and the share of malformed answers are configurable on the command line,
+through FAKE_* environment variables, or at runtime with POST /config.
+
+Point the AI service at it with:
+    OPENROUTER_API_BASE=http://localhost:8080/api/v1
+    OPENROUTER_API_KEY=fake
+
+Usage:
+    python loadtest/fake_openrouter.py --latency lognormal:1.5,0.5 --tokens-per-second 60 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass, fields
+from typing import AsyncIterator, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Must match SECTION_HEADERS in ai_service/services/section_stream.py
+SECTION_HEADERS = [
+    "🔵 Tank Volume Assessment",
+    "🟡 Bioload Assessment",
+    "🟣 Fish Compatibility & Behavior",
+    "🟢 Schooling Requirements",
+    "✅ Recommendations",
+    "⭐ Overall Rating",
+]
+
+SECTION_BODIES = [
+    "The tank volume is suitable for the listed stock, with room for decor and swimming space.",
+    "Total bioload is moderate; weekly 25% water changes and a rated filter will keep it stable.",
+    "All listed species are peaceful community fish that share similar temperature and pH ranges.",
+    "Schooling species are kept in groups of six or more, which keeps stress and hiding low.",
+    "Add dense planting, keep nitrates below 20 ppm and quarantine any new arrivals first.",
+    "8/10 - A well balanced community tank that should do well with regular maintenance.",
+]
+
+# How a malformed answer is broken; the AI service must fall back for all of them
+MALFORMED_KINDS = ("missing_section", "short", "no_headers", "truncated")
+
+
+@dataclass
+class FakeConfig:
+    latency: str = "lognormal:1.0,0.5"  # time to first token: fixed:S, uniform:A,B, lognormal:MEDIAN,SIGMA
+    tokens_per_second: float = 80.0  # 0 sends the whole answer at once
+    error_rate: float = 0.0  # share of requests answered with an HTTP error
+    error_statuses: str = "429,500,503"  # picked at random for errors
+    malformed_rate: float = 0.0  # share of answers missing or mangling sections
+    chars_per_token: int = 4
+
+    @classmethod
+    def from_env(cls) -> "FakeConfig":
+        config = cls()
+        for field in fields(cls):
+            value = os.getenv(f"FAKE_{field.name.upper()}")
+            if value is not None:
+                setattr(config, field.name, field.type(value) if field.type is not str else value)
+        return config
+
+    def update(self, values: Dict) -> None:
+        for field in fields(self):
+            if field.name in values:
+                setattr(self, field.name, type(getattr(self, field.name))(values[field.name]))
+
+
+def sample_latency(spec: str) -> float:
+    """Draw a delay in seconds from a ``kind:params`` distribution spec."""
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    if kind == "fixed":
+        return values[0]
+    if kind == "uniform":
+        return random.uniform(values[0], values[1])
+    if kind == "lognormal":
+        median, sigma = values
+        return random.lognormvariate(0, sigma) * median
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def build_answer(malformed: Optional[str] = None) -> str:
+    """A six-section evaluation, or a deliberately broken one."""
+    sections = [f"{header}\n{body}" for header, body in zip(SECTION_HEADERS, SECTION_BODIES)]
+    if malformed == "missing_section":
+        del sections[random.randrange(len(sections))]
+    elif malformed == "short":
+        return "I cannot help."
+    elif malformed == "no_headers":
+        return " ".join(SECTION_BODIES)
+    text = "\n\n".join(sections)
+    if malformed == "truncated":
+        return text[: len(text) // 2]
+    return text
+
+
+def chunk_text(text: str, chars_per_token: int) -> List[str]:
+    return [text[i:i + chars_per_token] for i in range(0, len(text), chars_per_token)]
+
+
+class Stats:
+    def __init__(self):
+        self.requests = 0
+        self.streamed = 0
+        self.errors: Dict[int, int] = {}
+        self.malformed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "streamed": self.streamed,
+            "errors": {str(status): count for status, count in self.errors.items()},
+            "malformed": self.malformed,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+
+config = FakeConfig.from_env()
+stats = Stats()
+app = FastAPI(title="Fake OpenRouter")
+
+
+def _completion_id() -> str:
+    return f"chatcmpl-{uuid.uuid4().hex[:24]}"
+
+
+def _usage(messages: List[dict], answer: str) -> dict:
+    prompt_tokens = sum(len(str(message.get("content", ""))) for message in messages) // config.chars_per_token
+    completion_tokens = max(1, len(answer) // config.chars_per_token)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+async def _stream(completion_id: str, model: str, answer: str) -> AsyncIterator[str]:
+    created = int(time.time())
+    delay = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0
+    for chunk in chunk_text(answer, config.chars_per_token):
+        event = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(event)}\n\n"
+        if delay:
+            await asyncio.sleep(delay)
+    final = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+    }
+    yield f"data: {json.dumps(final)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+@app.post("/api/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "fake/model")
+    stats.requests += 1
+    stats.in_flight += 1
+    stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+    try:
+        await asyncio.sleep(sample_latency(config.latency))
+
+        if random.random() < config.error_rate:
+            status = int(random.choice(config.error_statuses.split(",")))
+            stats.errors[status] = stats.errors.get(status, 0) + 1
+            return JSONResponse(
+                status_code=status,
+                content={"error": {"code": status, "message": f"Fake upstream error {status}"}},
+            )
+
+        malformed = None
+        if random.random() < config.malformed_rate:
+            malformed = random.choice(MALFORMED_KINDS)
+            stats.malformed += 1
+        answer = build_answer(malformed)
+        completion_id = _completion_id()
+
+        if body.get("stream"):
+            stats.streamed += 1
+            return StreamingResponse(_stream(completion_id, model, answer), media_type="text/event-stream")
+
+        if config.tokens_per_second > 0:
+            # Non-streaming callers still wait for the whole answer to be generated
+            await asyncio.sleep(len(answer) / config.chars_per_token / config.tokens_per_second)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": answer},
+                "finish_reason": "stop",
+            }],
+            "usage": _usage(body.get("messages", []), answer),
+        }
+    finally:
+        stats.in_flight -= 1
+
+
+@app.get("/stats")
+def get_stats():
+    return {"config": asdict(config), **stats.as_dict()}
+
+
+@app.post("/config")
+def set_config(values: dict):
+    """Change the behaviour between load-test runs without a restart"""
+    config.update(values)
+    return asdict(config)
+
+
+@app.post("/stats/reset")
+def reset_stats():
+    global stats
+    stats = Stats()
+    return stats.as_dict()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible fake for load testing")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", help="time to first token, e.g. fixed:0.5, uniform:0.2,2, lognormal:1.0,0.5")
+    parser.add_argument("--tokens-per-second", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--error-statuses", help="comma-separated HTTP statuses used for errors")
+    parser.add_argument("--malformed-rate", type=float)
+    parser.add_argument("--seed", type=int, help="make the random choices reproducible")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    config.update({key: value for key, value in vars(args).items() if value is not None})
+    if args.seed is not None:
+        random.seed(args.seed)
+    sample_latency(config.latency)  # fail fast on a bad spec
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Load Test Harness
+
+Sends evaluation requests at a fixed arrival rate (open loop: a slow server
+does not slow the senders down) and reports throughput, latency percentiles
+and a breakdown of errors. Run it against the backend to exercise
+backend -> ai_service -> OpenRouter, or against the AI service directly.
+
+Each request gets a distinct fish mix by default so the AI service's
+evaluation cache does not answer for the upstream; pass --repeat to measure
+cached traffic instead.
+
+Usage:
+    python loadtest/run_load.py --url http://localhost:8000/api/ai/evaluate --rps 20 --duration 60
+    python loadtest/run_load.py --url http://localhost:8001/evaluate --rps 50 --duration 30 --json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+SPECIES = [
+    "Neon Tetra", "Cardinal Tetra", "Corydoras", "Guppy", "Platy", "Molly",
+    "Zebra Danio", "Cherry Barb", "Harlequin Rasbora", "Otocinclus", "Betta", "Kuhli Loach",
+]
+
+
+@dataclass
+class Result:
+    latency: float
+    outcome: str  # "ok" or an error category
+    model: Optional[str] = None
+
+
+@dataclass
+class Report:
+    sent: int = 0
+    elapsed: float = 0.0
+    results: List[Result] = field(default_factory=list)
+    dropped: int = 0  # arrivals skipped because --max-in-flight was reached
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def build_layout(index: int, repeat: bool) -> dict:
+    rng = random.Random(0 if repeat else index)
+    fish = rng.sample(SPECIES, k=rng.randint(2, 4))
+    return {
+        "owner_email": "loadtest@example.com",
+        "tank_name": f"Load Test {index}",
+        "tank_length": 60 + rng.randint(0, 60),
+        "tank_width": 30 + rng.randint(0, 15),
+        "tank_height": 35 + rng.randint(0, 15),
+        "water_type": "freshwater",
+        "fish_data": [{"name": name, "quantity": rng.randint(1, 10)} for name in fish],
+        "comments": None,
+    }
+
+
+def classify(response: httpx.Response) -> Result:
+    """Map a response to an outcome; the services report some failures in a 200 body."""
+    if response.status_code != 200:
+        return Result(0.0, f"http_{response.status_code}")
+    try:
+        body = response.json()
+    except ValueError:
+        return Result(0.0, "invalid_json")
+    if body.get("status") != "success":
+        return Result(0.0, "app_error")
+    return Result(0.0, "ok", body.get("model"))
+
+
+async def send_one(client: httpx.AsyncClient, url: str, payload: dict, timeout: float) -> Result:
+    started = time.perf_counter()
+    headers = {"X-Request-Deadline": f"{time.time() + timeout:.3f}"}
+    try:
+        response = await client.post(url, json=payload, headers=headers)
+        result = classify(response)
+    except httpx.TimeoutException:
+        result = Result(0.0, "timeout")
+    except httpx.ConnectError:
+        result = Result(0.0, "connect_error")
+    except httpx.HTTPError as e:
+        result = Result(0.0, type(e).__name__)
+    result.latency = time.perf_counter() - started
+    return result
+
+
+async def run(args: argparse.Namespace) -> Report:
+    report = Report()
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    interval = 1 / args.rps
+    tasks = []
+    in_flight = 0
+
+    async def tracked(payload: dict):
+        nonlocal in_flight
+        try:
+            report.results.append(await send_one(client, args.url, payload, args.timeout))
+        finally:
+            in_flight -= 1
+
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+        started = time.perf_counter()
+        next_at = started
+        for index in itertools.count():
+            if next_at - started >= args.duration:
+                break
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            # Poisson arrivals by default; --constant spaces them evenly
+            next_at += interval if args.constant else random.expovariate(args.rps)
+
+            if in_flight >= args.max_in_flight:
+                report.dropped += 1
+                continue
+            in_flight += 1
+            report.sent += 1
+            tasks.append(asyncio.create_task(tracked(build_layout(index, args.repeat))))
+
+        await asyncio.gather(*tasks)
+        report.elapsed = time.perf_counter() - started
+    return report
+
+
+def summarize(report: Report) -> Dict:
+    ok = [result.latency for result in report.results if result.outcome == "ok"]
+    everything = [result.latency for result in report.results]
+    errors = Counter(result.outcome for result in report.results if result.outcome != "ok")
+    models = Counter(result.model or "unreported" for result in report.results if result.outcome == "ok")
+    return {
+        "sent": report.sent,
+        "dropped": report.dropped,
+        "completed": len(report.results),
+        "succeeded": len(ok),
+        "elapsed_seconds": round(report.elapsed, 2),
+        "throughput_rps": round(len(ok) / report.elapsed, 2) if report.elapsed else 0.0,
+        "latency_seconds": {
+            "p50": round(percentile(ok, 50), 3),
+            "p95": round(percentile(ok, 95), 3),
+            "p99": round(percentile(ok, 99), 3),
+            "max": round(max(everything, default=0.0), 3),
+        },
+        "errors": dict(errors),
+        "error_rate": round(sum(errors.values()) / len(report.results), 4) if report.results else 0.0,
+        "models": dict(models),
+    }
+
+
+def print_summary(summary: Dict) -> None:
+    latency = summary["latency_seconds"]
+    print(f"Sent:        {summary['sent']} ({summary['dropped']} dropped at the in-flight limit)")
+    print(f"Succeeded:   {summary['succeeded']}/{summary['completed']} in {summary['elapsed_seconds']}s")
+    print(f"Throughput:  {summary['throughput_rps']} req/s")
+    print(f"Latency:     p50 {latency['p50']}s  p95 {latency['p95']}s  p99 {latency['p99']}s  max {latency['max']}s")
+    print(f"Error rate:  {summary['error_rate']:.2%}")
+    for outcome, count in sorted(summary["errors"].items(), key=lambda item: -item[1]):
+        print(f"  {outcome:<16} {count}")
+    if summary["models"]:
+        print("Models:")
+        for model, count in sorted(summary["models"].items(), key=lambda item: -item[1]):
+            print(f"  {model:<40} {count}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Drive the evaluation endpoint at a target request rate")
+    parser.add_argument("--url", default="http://localhost:8000/api/ai/evaluate")
+    parser.add_argument("--rps", type=float, default=10.0, help="target arrival rate")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep sending")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout and deadline")
+    parser.add_argument("--max-in-flight", type=int, default=500, help="arrivals beyond this are dropped")
+    parser.add_argument("--constant", action="store_true", help="evenly spaced instead of Poisson arrivals")
+    parser.add_argument("--repeat", action="store_true", help="send the same layout every time (cache hits)")
+    parser.add_argument("--seed", type=int, help="make arrival times reproducible")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+    summary = summarize(asyncio.run(run(args)))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)